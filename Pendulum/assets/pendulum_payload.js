@@ -0,0 +1,36 @@
+// Decodes columnar signal payloads produced by pendulum_eeg.payload.encode_view
+// into the row objects Recharts expects.
+(function () {
+  function bytesOf(b64) {
+    const text = atob(b64 || "");
+    const out = new Uint8Array(text.length);
+    for (let i = 0; i < text.length; i++) out[i] = text.charCodeAt(i);
+    return out.buffer;
+  }
+
+  const cache = new WeakMap();
+
+  window.decodePendulumPayload = function (payload) {
+    if (!payload || !payload.n) return [];
+    if (cache.has(payload)) return cache.get(payload);
+    const n = payload.n;
+    const channels = payload.channels;
+    const xs = new Float32Array(bytesOf(payload.x));
+    const raw = bytesOf(payload.data);
+    const data = payload.format === "int16" ? new Int16Array(raw) : new Float32Array(raw);
+    const scale = payload.scale || [];
+    const offset = payload.offset || [];
+    const rows = new Array(n);
+    for (let i = 0; i < n; i++) {
+      const row = { x: Math.round((payload.x0 + xs[i]) * 1e6) / 1e6 };
+      for (let c = 0; c < channels; c++) {
+        let v = data[c * n + i];
+        if (payload.format === "int16") v = v * scale[c] + offset[c];
+        row["ch" + (c + 1) + "_uv"] = v;
+      }
+      rows[i] = row;
+    }
+    cache.set(payload, rows);
+    return rows;
+  };
+})();
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import math
-from typing import Any
+from functools import lru_cache
+from typing import Any, Iterable, Mapping
 
 import numpy as np
 
@@ -10,6 +11,14 @@ try:
 except ImportError:  # pragma: no cover - fallback for environments without scipy
     scipy_signal = None
 
+try:
+    # The in-place kernel behind scipy.signal.sosfilt. Calling it directly
+    # skips sosfilt's validation and axis shuffling, which dominate for the
+    # few-sample blocks of a live stream.
+    from scipy.signal._sosfilt import _sosfilt as _sosfilt_inplace
+except ImportError:  # pragma: no cover - private module moved or scipy missing
+    _sosfilt_inplace = None
+
 
 BANDS = {
     "delta": (1.0, 4.0),
@@ -20,6 +29,7 @@ BANDS = {
 }
 
 SIGNAL_VIEW_ORDER = ("raw", "gamma", "beta", "alpha", "theta", "delta")
+FILTERED_VIEWS = SIGNAL_VIEW_ORDER[1:]
 
 
 def _integrate_band(freqs: np.ndarray, psd: np.ndarray, low: float, high: float) -> np.ndarray:
@@ -43,6 +53,20 @@ def _fft_bandpass(window_uv: np.ndarray, sample_rate_hz: float, low: float, high
     return np.fft.irfft(fft_filtered, n=n_samples, axis=0).astype(np.float64, copy=False)
 
 
+@lru_cache(maxsize=64)
+def bandpass_sos(sample_rate_hz: float, low_hz: float, high_hz: float, order: int = 4) -> np.ndarray | None:
+    """Butterworth band-pass design (SOS), cached per (fs, band). None if the band is empty."""
+    if scipy_signal is None:
+        return None
+    nyquist = max(1e-9, float(sample_rate_hz) * 0.5)
+    low = max(0.001, float(low_hz))
+    high = min(float(high_hz), nyquist * 0.99)
+    if low >= high:
+        return None
+    # Shared between callers: treat as read-only (sosfilt needs a writable buffer).
+    return scipy_signal.butter(order, [low, high], btype="bandpass", fs=float(sample_rate_hz), output="sos")
+
+
 def bandpass_window(
     window_uv: np.ndarray,
     sample_rate_hz: float,
@@ -56,13 +80,9 @@ def bandpass_window(
     if scipy_signal is None:
         return _fft_bandpass(window_uv, sample_rate_hz, low_hz, high_hz)
 
-    nyquist = max(1e-9, float(sample_rate_hz) * 0.5)
-    low = max(0.001, float(low_hz))
-    high = min(float(high_hz), nyquist * 0.99)
-    if low >= high:
+    sos = bandpass_sos(float(sample_rate_hz), float(low_hz), float(high_hz))
+    if sos is None:
         return np.zeros_like(window_uv, dtype=np.float64)
-
-    sos = scipy_signal.butter(4, [low, high], btype="bandpass", fs=float(sample_rate_hz), output="sos")
     try:
         return scipy_signal.sosfiltfilt(sos, window_uv, axis=0).astype(np.float64, copy=False)
     except ValueError:
@@ -70,19 +90,115 @@ def bandpass_window(
         return scipy_signal.sosfilt(sos, window_uv, axis=0).astype(np.float64, copy=False)
 
 
-def build_signal_views(window_uv: np.ndarray, sample_rate_hz: float) -> dict[str, np.ndarray]:
+def normalize_views(views: Iterable[str] | None) -> tuple[str, ...]:
+    """Requested signal views in SIGNAL_VIEW_ORDER; None means all of them."""
+    if views is None:
+        return SIGNAL_VIEW_ORDER
+    views = tuple(views)
+    unknown = set(views) - set(SIGNAL_VIEW_ORDER)
+    if unknown:
+        raise ValueError(f"Unknown signal views: {sorted(unknown)}")
+    return tuple(name for name in SIGNAL_VIEW_ORDER if name in views)
+
+
+def build_signal_views(
+    window_uv: np.ndarray,
+    sample_rate_hz: float,
+    views: tuple[str, ...] | None = None,
+) -> dict[str, np.ndarray]:
     """
     Build raw + band-filtered views for plotting.
-    Returns keys: raw, gamma, beta, alpha, theta, delta.
+    Returns keys: raw, gamma, beta, alpha, theta, delta (or only `views`).
     """
+    names = SIGNAL_VIEW_ORDER if views is None else tuple(views)
     if window_uv.ndim != 2:
-        return {name: np.zeros((0, 0), dtype=np.float64) for name in SIGNAL_VIEW_ORDER}
+        return {name: np.zeros((0, 0), dtype=np.float64) for name in names}
+
+    out: dict[str, np.ndarray] = {}
+    if "raw" in names:
+        out["raw"] = window_uv.astype(np.float64, copy=False)
+    for band_name in FILTERED_VIEWS:
+        if band_name in names:
+            low, high = BANDS[band_name]
+            out[band_name] = bandpass_window(window_uv, sample_rate_hz, low, high)
+    return out
+
+
+class StreamingFilterBank:
+    """
+    Causal band-pass filters for live signal views.
+
+    Designs come from the `bandpass_sos` cache and each band keeps its own
+    per-channel `zi` state, so `process()` only touches newly arrived samples.
+    Unlike `build_signal_views` (zero-phase filtfilt over the whole window),
+    the output has the usual IIR phase delay. Output matches
+    `scipy.signal.sosfilt` over the concatenated blocks.
+    """
+
+    def __init__(
+        self,
+        sample_rate_hz: float,
+        n_channels: int,
+        bands: Mapping[str, tuple[float, float]] | None = None,
+    ) -> None:
+        self.sample_rate_hz = float(sample_rate_hz)
+        self.n_channels = int(n_channels)
+        band_map = bands if bands is not None else {name: BANDS[name] for name in FILTERED_VIEWS}
+        self._sos = {
+            name: bandpass_sos(self.sample_rate_hz, float(low), float(high))
+            for name, (low, high) in band_map.items()
+        }
+        # Unit-step initial state per band, scaled by the first sample on start.
+        self._zi_step = {
+            name: scipy_signal.sosfilt_zi(sos) if sos is not None else None
+            for name, sos in self._sos.items()
+        }
+        # Per band, (n_channels, n_sections, 2): the layout the kernel works in.
+        self._zi: dict[str, np.ndarray | None] = {name: None for name in self._sos}
+
+    @property
+    def available(self) -> bool:
+        return scipy_signal is not None
+
+    @property
+    def bands(self) -> tuple[str, ...]:
+        return tuple(self._sos)
 
-    views: dict[str, np.ndarray] = {"raw": window_uv.astype(np.float64, copy=False)}
-    for band_name in ("gamma", "beta", "alpha", "theta", "delta"):
-        low, high = BANDS[band_name]
-        views[band_name] = bandpass_window(window_uv, sample_rate_hz, low, high)
-    return views
+    def reset(self, bands: Iterable[str] | None = None) -> None:
+        for name in self._sos if bands is None else bands:
+            self._zi[name] = None
+
+    def process(
+        self,
+        block_uv: np.ndarray,
+        bands: Iterable[str] | None = None,
+    ) -> dict[str, np.ndarray]:
+        """
+        block_uv: shape (n_new_samples, n_channels). Returns one filtered block
+        per band (only `bands` if given; the others keep their state).
+        """
+        out: dict[str, np.ndarray] = {}
+        # One (n_channels, n_samples) copy; each band filters its own copy in place.
+        channels_first = np.ascontiguousarray(np.asarray(block_uv, dtype=np.float64).T)
+        for name in self._sos if bands is None else bands:
+            sos = self._sos[name]
+            if sos is None or scipy_signal is None or block_uv.shape[0] == 0:
+                out[name] = np.zeros(block_uv.shape, dtype=np.float64)
+                continue
+            zi = self._zi[name]
+            if zi is None:
+                # Start from steady state at the first sample to avoid a step transient.
+                zi = self._zi_step[name][None, :, :] * channels_first[:, :1, None]
+            if _sosfilt_inplace is not None:
+                filtered = channels_first.copy()
+                zi = np.ascontiguousarray(zi)
+                _sosfilt_inplace(sos, filtered, zi)
+            else:
+                filtered, zi = scipy_signal.sosfilt(sos, channels_first, axis=1, zi=zi.transpose(1, 0, 2))
+                zi = np.ascontiguousarray(zi.transpose(1, 0, 2))
+            out[name] = filtered.T
+            self._zi[name] = zi
+        return out
 
 
 def compute_band_metrics(window_uv: np.ndarray, sample_rate_hz: float) -> dict[str, Any]:
@@ -91,20 +207,18 @@ def compute_band_metrics(window_uv: np.ndarray, sample_rate_hz: float) -> dict[s
       shape = (n_samples, n_channels)
       unit in microvolts.
     """
-    metrics: dict[str, Any] = {
-        "delta": 0.0,
-        "theta": 0.0,
-        "alpha": 0.0,
-        "beta": 0.0,
-        "gamma": 0.0,
-        "focus_score": 0.0,
-        "relax_score": 0.0,
-        "engagement_ratio": 0.0,
-        "per_channel": {},
-    }
-
     if window_uv.ndim != 2 or window_uv.shape[0] < 16:
-        return metrics
+        return {
+            "delta": 0.0,
+            "theta": 0.0,
+            "alpha": 0.0,
+            "beta": 0.0,
+            "gamma": 0.0,
+            "focus_score": 0.0,
+            "relax_score": 0.0,
+            "engagement_ratio": 0.0,
+            "per_channel": {},
+        }
 
     n_samples = window_uv.shape[0]
     if scipy_signal is not None:
@@ -122,11 +236,23 @@ def compute_band_metrics(window_uv: np.ndarray, sample_rate_hz: float) -> dict[s
         freqs = np.fft.rfftfreq(n_samples, d=1.0 / float(sample_rate_hz))
         psd = (np.abs(fft) ** 2) / (float(sample_rate_hz) * float(n_samples))
 
+    band_power = np.array(
+        [_integrate_band(freqs, psd, low, high) for low, high in BANDS.values()],
+        dtype=np.float64,
+    )
+    return band_metrics_from_powers(band_power)
+
+
+def band_metrics_from_powers(band_power: np.ndarray) -> dict[str, Any]:
+    """
+    band_power:
+      shape = (len(BANDS), n_channels), rows in BANDS order.
+    """
+    metrics: dict[str, Any] = {}
     per_channel: dict[str, list[float]] = {}
     averages: dict[str, float] = {}
 
-    for name, (low, high) in BANDS.items():
-        channel_power = _integrate_band(freqs, psd, low, high)
+    for name, channel_power in zip(BANDS, band_power):
         per_channel[name] = [float(v) for v in channel_power]
         averages[name] = float(np.mean(channel_power))
         metrics[name] = averages[name]
@@ -147,3 +273,119 @@ def compute_band_metrics(window_uv: np.ndarray, sample_rate_hz: float) -> dict[s
     metrics["relax_score"] = relax_score
     metrics["per_channel"] = per_channel
     return metrics
+
+
+def band_weight_matrix(freqs: np.ndarray, bands: Mapping[str, tuple[float, float]] = BANDS) -> np.ndarray:
+    """
+    Trapezoid weights, shape (n_bands, n_freqs), such that ``weights @ psd``
+    equals `_integrate_band` for every band at once.
+    """
+    weights = np.zeros((len(bands), freqs.shape[0]), dtype=np.float64)
+    for row, (low, high) in enumerate(bands.values()):
+        idx = np.flatnonzero((freqs >= low) & (freqs < high))
+        if idx.shape[0] < 2:
+            continue
+        half_widths = np.diff(freqs[idx]) * 0.5
+        weights[row, idx[:-1]] += half_widths
+        weights[row, idx[1:]] += half_widths
+    return weights
+
+
+class SlidingWelchPSD:
+    """
+    Incremental Welch PSD over the most recent `window_samples`.
+
+    Each completed segment (Hann window, constant detrend, one-sided density,
+    same scaling as ``scipy.signal.welch``) is transformed once and cached;
+    `update()` only computes segments completed by the new samples. Segments
+    overlap by half, as welch's default, independent of how often the
+    average is read, so a short metrics hop reuses the cached average until
+    the next segment completes.
+    """
+
+    def __init__(
+        self,
+        sample_rate_hz: float,
+        n_channels: int,
+        window_samples: int,
+        nperseg: int = 512,
+    ) -> None:
+        self.sample_rate_hz = float(sample_rate_hz)
+        self.n_channels = int(n_channels)
+        self.nperseg = max(2, min(int(nperseg), int(window_samples)))
+        self.step = self.nperseg - self.nperseg // 2
+        self.max_segments = max(1, (int(window_samples) - self.nperseg) // self.step + 1)
+
+        n = np.arange(self.nperseg)
+        # Periodic Hann, as scipy.signal.get_window("hann", nperseg).
+        self._taper = 0.5 - 0.5 * np.cos(2.0 * np.pi * n / self.nperseg)
+        self.freqs = np.fft.rfftfreq(self.nperseg, d=1.0 / self.sample_rate_hz)
+        scale = np.full(self.freqs.shape[0], 2.0 / (self.sample_rate_hz * np.sum(self._taper**2)))
+        scale[0] *= 0.5
+        if self.nperseg % 2 == 0:
+            scale[-1] *= 0.5
+        self._scale = scale[:, None]
+        self.band_weights = band_weight_matrix(self.freqs)
+
+        self._segments = np.zeros(
+            (self.max_segments, self.freqs.shape[0], self.n_channels), dtype=np.float64
+        )
+        self._segment_count = 0
+        self._next_slot = 0
+        self._pending = np.zeros((0, self.n_channels), dtype=np.float64)
+        self._band_powers: np.ndarray | None = None
+
+    @property
+    def segment_count(self) -> int:
+        return self._segment_count
+
+    def reset(self) -> None:
+        self._segment_count = 0
+        self._next_slot = 0
+        self._pending = np.zeros((0, self.n_channels), dtype=np.float64)
+        self._band_powers = None
+
+    def update(self, block_uv: np.ndarray) -> int:
+        """Feed new samples (n_new, n_channels); returns how many segments were added."""
+        data = np.concatenate((self._pending, np.asarray(block_uv, dtype=np.float64)), axis=0)
+        if data.shape[0] < self.nperseg:
+            self._pending = data
+            return 0
+
+        n_new = (data.shape[0] - self.nperseg) // self.step + 1
+        consumed = n_new * self.step
+        # Only the newest max_segments can still be inside the window.
+        first = max(0, n_new - self.max_segments)
+        starts = (np.arange(first, n_new) * self.step)[:, None] + np.arange(self.nperseg)[None, :]
+        segments = data[starts]
+        segments -= segments.mean(axis=1, keepdims=True)
+        segments *= self._taper[None, :, None]
+        spectrum = np.fft.rfft(segments, axis=1)
+        psd = (spectrum.real**2 + spectrum.imag**2) * self._scale[None, :, :]
+
+        for segment_psd in psd:
+            self._segments[self._next_slot] = segment_psd
+            self._next_slot = (self._next_slot + 1) % self.max_segments
+        self._segment_count = min(self.max_segments, self._segment_count + psd.shape[0])
+        self._pending = data[consumed:]
+        self._band_powers = None
+        return n_new
+
+    def psd(self) -> np.ndarray:
+        """Mean PSD over cached segments, shape (n_freqs, n_channels)."""
+        if self._segment_count == 0:
+            return np.zeros((self.freqs.shape[0], self.n_channels), dtype=np.float64)
+        if self._segment_count < self.max_segments:
+            segments = self._segments[: self._segment_count]
+        else:
+            segments = self._segments
+        return segments.mean(axis=0)
+
+    def band_powers(self) -> np.ndarray:
+        """
+        All bands x channels in one matmul, shape (len(BANDS), n_channels).
+        Cached until the next segment completes.
+        """
+        if self._band_powers is None:
+            self._band_powers = self.band_weights @ self.psd()
+        return self._band_powers
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+from .engine import EEGEngine, EngineConfig
+from .spsc_queue import SpscQueue
+from .subscription import OverflowPolicy
+
+# Bound on how long stop() waits for the loop to drop the serial reader.
+_REMOVE_READER_TIMEOUT_S = 2.0
+
+
+def _on_loop(loop: asyncio.AbstractEventLoop) -> bool:
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
+
+
+def _remove_reader(loop: asyncio.AbstractEventLoop, fd: int) -> None:
+    """
+    Unregister `fd` from `loop` and return once it is gone, so the caller can
+    close the port without a readiness callback still pending on it.
+    """
+    if _on_loop(loop) or not loop.is_running():
+        if not loop.is_closed():
+            loop.remove_reader(fd)
+        return
+
+    async def remove() -> None:
+        loop.remove_reader(fd)
+
+    try:
+        asyncio.run_coroutine_threadsafe(remove(), loop).result(timeout=_REMOVE_READER_TIMEOUT_S)
+    except (RuntimeError, concurrent.futures.TimeoutError):
+        # The loop closed or stalled meanwhile; nothing will poll the fd.
+        pass
+
+
+class AsyncEEGEngine(EEGEngine):
+    """
+    `EEGEngine` whose serial port is driven by an asyncio event loop.
+
+    `start_async` opens the port non-blocking and registers its file
+    descriptor with `loop.add_reader`: each readiness callback reads what
+    the driver has buffered and parses it on the loop, then hands the block
+    to the processing thread (history, filters, metrics) through the same
+    rx queue as the threaded reader. No thread waits in a read timeout.
+
+    The simulator, replays, and Windows (serial handles are not selectable
+    there) fall back to the threaded loops of `EEGEngine.start`.
+    """
+
+    def __init__(self, config: EngineConfig | None = None) -> None:
+        super().__init__(config)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._reader_fd: int | None = None
+        self._reader_done: threading.Event | None = None
+        self._processor: threading.Thread | None = None
+
+    async def start_async(
+        self,
+        *,
+        port: str | None = None,
+        baud: int | None = None,
+        simulate: bool = False,
+        auto_start_stream: bool = True,
+        reset_data: bool = True,
+        replay: str | Path | None = None,
+    ) -> bool:
+        if simulate or replay is not None or os.name == "nt":
+            return self.start(
+                port=port,
+                baud=baud,
+                simulate=simulate,
+                auto_start_stream=auto_start_stream,
+                reset_data=reset_data,
+                replay=replay,
+            )
+        with self._lock:
+            if self._running:
+                return True
+            self._begin_run(port=port, baud=baud, simulate=False, reset_data=reset_data)
+        self._publish_status()
+
+        # Opening the port and the firmware handshake (which sleeps) block,
+        # so they run off the loop.
+        ser = await asyncio.to_thread(self._open_serial_port, 0)
+        if ser is None:
+            return False
+        await asyncio.to_thread(self._configure_firmware, ser, auto_start_stream)
+
+        loop = asyncio.get_running_loop()
+        rx_queue, reader_done, processor = self._start_processing_thread()
+        fd = ser.fileno()
+        with self._lock:
+            self._loop = loop
+            self._reader_fd = fd
+            self._reader_done = reader_done
+            self._processor = processor
+        loop.add_reader(fd, self._on_readable, ser, rx_queue)
+        return True
+
+    async def stop_async(self) -> None:
+        with self._lock:
+            fd, self._reader_fd = self._reader_fd, None
+        if fd is not None and self._loop is not None:
+            self._loop.remove_reader(fd)
+        await asyncio.to_thread(self.stop)
+
+    def stop(self) -> None:
+        self._detach_reader()
+        super().stop()
+
+    async def get_snapshot_async(self, *args: Any, **kwargs: Any) -> dict[str, Any]:
+        """`get_snapshot` on a worker thread, so building it never stalls the loop."""
+        return await asyncio.to_thread(self.get_snapshot, *args, **kwargs)
+
+    async def get_updates_async(self, *args: Any, **kwargs: Any) -> dict[str, Any]:
+        return await asyncio.to_thread(self.get_updates, *args, **kwargs)
+
+    async def get_status_async(self, *args: Any, **kwargs: Any) -> dict[str, Any]:
+        return await asyncio.to_thread(self.get_status, *args, **kwargs)
+
+    async def send_command_async(self, command: str) -> bool:
+        return await asyncio.to_thread(self.send_command, command)
+
+    async def export_npz_async(self, path: str | Path | None = None) -> Path:
+        return await asyncio.to_thread(self.export_npz, path)
+
+    async def messages(
+        self,
+        kinds: tuple[str, ...] = ("samples", "metrics", "events"),
+        *,
+        maxsize: int = 256,
+        overflow: OverflowPolicy = "drop_oldest",
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Async generator over a subscription that is closed when iteration stops."""
+        with self.subscribe(kinds, maxsize=maxsize, overflow=overflow) as subscription:
+            async for message in subscription:
+                yield message
+
+    def _on_readable(self, ser: Any, rx_queue: SpscQueue[Any]) -> None:
+        try:
+            # With timeout=0 this returns whatever is buffered right now.
+            started = time.perf_counter_ns()
+            chunk = ser.read(max(1, ser.in_waiting))
+            self._perf["serial_read"].record_ns(time.perf_counter_ns() - started, len(chunk))
+        except Exception as exc:
+            self._reader_failed(exc)
+            return
+        if chunk:
+            self._tee_raw(chunk)
+            self._queue_rx_block(rx_queue, self._parse_rx_bytes(chunk))
+
+    def _reader_failed(self, error: Exception) -> None:
+        with self._lock:
+            fd, self._reader_fd = self._reader_fd, None
+        if fd is not None and self._loop is not None:
+            self._loop.remove_reader(fd)
+        message = f"Serial loop interrupted: {error}"
+        self._push_parse_error(message)
+
+        def close() -> None:
+            self._detach_reader()
+            self._finalize_thread(message)
+
+        asyncio.get_running_loop().run_in_executor(None, close)
+
+    def _detach_reader(self) -> None:
+        """Unregister the reader (if still registered) and join the processing thread."""
+        with self._lock:
+            fd, self._reader_fd = self._reader_fd, None
+            loop = self._loop
+            reader_done, self._reader_done = self._reader_done, None
+            processor, self._processor = self._processor, None
+        if fd is not None and loop is not None:
+            _remove_reader(loop, fd)
+        if reader_done is not None:
+            reader_done.set()
+        if processor is not None:
+            processor.join(timeout=2.0)
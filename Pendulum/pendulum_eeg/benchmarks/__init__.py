@@ -0,0 +1 @@
+"""Host-side performance benchmarks for the Pendulum EEG pipeline."""
@@ -0,0 +1,138 @@
+"""
+CRC16-CCITT implementations: bit-by-bit reference vs. table vs. NumPy batch.
+
+Cross-checks every implementation against the firmware unit-test vector
+(firmware/test/test_fw_utils: "123456789" -> 0x29B1) and against each other
+on random sample-sized messages before timing them.
+
+    python -m pendulum_eeg.benchmarks.crc [--frames N] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+
+import numpy as np
+
+from ..firmware_protocol import crc16_ccitt, crc16_ccitt_batch
+from .synthetic import ADS1299_SAMPLE_RATES
+
+
+FIRMWARE_CRC_VECTORS = ((b"123456789", 0x29B1),)
+SAMPLE_CRC_SPAN = 42  # type + ver + 40-byte payload
+
+
+def crc16_ccitt_bitwise(data: bytes) -> int:
+    """Previous bit-by-bit implementation, kept as the reference."""
+    crc = 0xFFFF
+    for value in data:
+        crc ^= value << 8
+        for _ in range(8):
+            if crc & 0x8000:
+                crc = ((crc << 1) ^ 0x1021) & 0xFFFF
+            else:
+                crc = (crc << 1) & 0xFFFF
+    return crc
+
+
+def cross_check(n_random: int = 500, seed: int = 1234) -> None:
+    for data, expected in FIRMWARE_CRC_VECTORS:
+        got = {
+            "bitwise": crc16_ccitt_bitwise(data),
+            "table": crc16_ccitt(data),
+            # Tiled so the vectorized path (not the small-batch fallback) runs.
+            "batch": int(crc16_ccitt_batch(np.tile(np.frombuffer(data, dtype=np.uint8), (64, 1)))[0]),
+        }
+        for name, value in got.items():
+            if value != expected:
+                raise AssertionError(f"{name} CRC of {data!r} = 0x{value:04X}, firmware 0x{expected:04X}")
+
+    rng = random.Random(seed)
+    messages = [bytes(rng.getrandbits(8) for _ in range(SAMPLE_CRC_SPAN)) for _ in range(n_random)]
+    batch = crc16_ccitt_batch(np.frombuffer(b"".join(messages), dtype=np.uint8).reshape(n_random, -1))
+    for message, batch_value in zip(messages, batch.tolist()):
+        reference = crc16_ccitt_bitwise(message)
+        if crc16_ccitt(message) != reference or batch_value != reference:
+            raise AssertionError(f"CRC mismatch for {message.hex()}")
+
+
+def _time_per_frame(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        frames = fn()
+        best = min(best, (time.perf_counter() - started) / frames)
+    return best
+
+
+def run(n_frames: int = 4_096, repeat: int = 3, seed: int = 1234) -> dict:
+    cross_check(seed=seed)
+    rng = np.random.default_rng(seed)
+    rows = rng.integers(0, 256, size=(n_frames, SAMPLE_CRC_SPAN), dtype=np.uint8)
+    messages = [row.tobytes() for row in rows]
+
+    def loop(fn):
+        def _run() -> int:
+            for message in messages:
+                fn(message)
+            return len(messages)
+
+        return _run
+
+    def batched(batch_size: int):
+        def _run() -> int:
+            for start in range(0, n_frames, batch_size):
+                crc16_ccitt_batch(rows[start : start + batch_size])
+            return n_frames
+
+        return _run
+
+    us_per_frame = {
+        "bitwise": _time_per_frame(loop(crc16_ccitt_bitwise), repeat) * 1e6,
+        "table": _time_per_frame(loop(crc16_ccitt), repeat) * 1e6,
+    }
+    for batch_size in (16, 256, 4_096):
+        us_per_frame[f"batch_{batch_size}"] = _time_per_frame(batched(batch_size), repeat) * 1e6
+
+    return {
+        "frames": n_frames,
+        "bytes_per_frame": SAMPLE_CRC_SPAN,
+        "us_per_frame": us_per_frame,
+        "speedup_vs_bitwise": {
+            name: us_per_frame["bitwise"] / value for name, value in us_per_frame.items()
+        },
+        # Fraction of one CPU core spent on CRC at each ADS1299 rate.
+        "cpu_fraction": {
+            name: {str(rate): rate * value * 1e-6 for rate in ADS1299_SAMPLE_RATES}
+            for name, value in us_per_frame.items()
+        },
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="CRC16-CCITT benchmark.")
+    parser.add_argument("--frames", type=int, default=4_096)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = parser.parse_args(argv)
+
+    results = run(n_frames=args.frames, repeat=args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"cross-check OK ({len(FIRMWARE_CRC_VECTORS)} firmware vector(s) + random frames)")
+    for name, value in results["us_per_frame"].items():
+        cpu_16k = results["cpu_fraction"][name]["16000"] * 100.0
+        print(
+            f"{name:>11}: {value:8.3f} us/frame  x{results['speedup_vs_bitwise'][name]:6.1f}  "
+            f"{cpu_16k:6.2f}% CPU @ 16k SPS"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
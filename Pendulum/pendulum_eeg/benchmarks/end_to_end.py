@@ -0,0 +1,329 @@
+"""
+End-to-end throughput and latency of the acquisition stack.
+
+Steps a sample rate up (doubling) until the engine falls behind. Each step
+builds a fresh `EEGEngine`, feeds it from one of three sources, polls
+`get_snapshot` like a dashboard would, and records:
+
+- delivered vs. expected samples and rx drops,
+- device-to-host latency per sample: time from when the device produced it
+  (its `t_us`) to when subscribers received it,
+- process CPU time per sample.
+
+Sources:
+
+- loopback: synthesized COBS frames written to a raw capture and replayed
+  in real time, so bytes go through `FrameParser`, batch decode, history,
+  filters, metrics and snapshots.
+- simulator: `EEGSimulator` blocks (skips the byte parser).
+- replay: an existing `.pndraw` capture, replayed at rate / capture rate.
+  Reads keep their recorded sizes, so a faster replay also means more reads
+  per second.
+
+    python -m pendulum_eeg.cli bench [--source loopback] [--max-rate 64000] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from ..engine import EEGEngine, EngineConfig
+from ..firmware_protocol import FrameParser, decode_frames_batch
+from ..raw_capture import RawCapture, RawCaptureWriter
+from .synthetic import synthetic_frames
+
+BENCH_SOURCES = ("loopback", "simulator", "replay")
+# Loopback chunks model a serial read returning every 5 ms.
+LOOPBACK_READ_S = 0.005
+# A step passes if at least this fraction of samples arrived...
+MIN_DELIVERED_FRACTION = 0.99
+# ...and the source finished within this factor of real time.
+MAX_SLOWDOWN = 1.1
+# The simulator emits on 20 ms ticks, so up to this much is in flight at stop.
+SIMULATOR_SLACK_S = 0.05
+
+
+def write_loopback_capture(
+    path: Path,
+    sample_rate_hz: int,
+    seconds: float,
+    seed: int = 1234,
+) -> int:
+    """Raw capture of `seconds` of simulator frames, stamped at device time; returns samples."""
+    n_samples = int(sample_rate_hz * seconds)
+    frames = synthetic_frames(n_samples, sample_rate_hz=sample_rate_hz, seed=seed)
+    per_read = max(1, int(sample_rate_hz * LOOPBACK_READ_S))
+    writer = RawCaptureWriter(path, sample_rate_hz=sample_rate_hz)
+    try:
+        for start in range(0, n_samples, per_read):
+            stop = min(n_samples, start + per_read)
+            # A read returns once its last frame has been sent.
+            writer.write(frames[start:stop].tobytes(), offset_ns=stop * 1_000_000_000 // sample_rate_hz)
+    finally:
+        writer.close()
+    return n_samples
+
+
+def count_capture_samples(path: Path) -> tuple[int, float]:
+    """(sample frames, duration seconds) of a raw capture."""
+    parser = FrameParser()
+    samples = 0
+    duration_s = 0.0
+    for offset_s, chunk in RawCapture(path).chunks():
+        frames = [value for kind, value in parser.feed(chunk) if kind == "frame"]
+        if frames:
+            samples += len(decode_frames_batch(frames).samples)
+        duration_s = offset_s
+    return samples, duration_s
+
+
+class _LatencyProbe:
+    """Subscriber callback recording when each sample block reached the host."""
+
+    def __init__(self) -> None:
+        self.arrivals: list[tuple[float, np.ndarray]] = []
+        self.started = 0.0
+
+    def __call__(self, message: dict[str, Any]) -> None:
+        self.arrivals.append((time.perf_counter(), message["t_us"]))
+
+    def latencies_s(self, time_scale: float = 1.0) -> np.ndarray:
+        if not self.arrivals:
+            return np.zeros(0)
+        t0 = int(self.arrivals[0][1][0]) if time_scale != 1.0 else 0
+        parts = []
+        for arrived, t_us in self.arrivals:
+            device_s = ((t_us.astype(np.int64) - t0) & 0xFFFFFFFF) / 1e6 / time_scale
+            parts.append(arrived - self.started - device_s)
+        return np.concatenate(parts)
+
+
+def _poll_snapshots(engine: EEGEngine, hz: float, done: threading.Event, timings: list[float]) -> None:
+    period = 1.0 / hz
+    while not done.wait(period):
+        started = time.perf_counter()
+        engine.get_snapshot()
+        timings.append(time.perf_counter() - started)
+
+
+def run_step(
+    source: str,
+    sample_rate_hz: int,
+    seconds: float = 3.0,
+    snapshot_hz: float = 20.0,
+    max_latency_s: float = 0.25,
+    replay_path: Path | None = None,
+    capture_rate_hz: int = 0,
+    seed: int = 1234,
+    workdir: Path | None = None,
+) -> dict[str, Any]:
+    workdir = workdir or Path(tempfile.mkdtemp(prefix="pendulum_bench_"))
+    engine = EEGEngine(EngineConfig(sample_rate_hz=sample_rate_hz, archive_dir=str(workdir / "archive")))
+    time_scale = 1.0
+    if source == "loopback":
+        replay_path = workdir / f"loopback_{sample_rate_hz}.pndraw"
+        expected = write_loopback_capture(replay_path, sample_rate_hz, seconds, seed=seed)
+        source_seconds = seconds
+    elif source == "replay":
+        if replay_path is None:
+            raise ValueError("The replay source needs a capture file.")
+        expected, capture_seconds = count_capture_samples(replay_path)
+        time_scale = sample_rate_hz / float(capture_rate_hz)
+        engine.config.replay_speed = time_scale
+        source_seconds = capture_seconds / time_scale
+    elif source == "simulator":
+        engine.config.simulate_seed = seed
+        expected = int(sample_rate_hz * seconds)
+        source_seconds = seconds
+    else:
+        raise ValueError(f"Unknown bench source: {source!r}")
+
+    probe = _LatencyProbe()
+    subscription = engine.subscribe(("samples",), callback=probe)
+    done = threading.Event()
+    snapshot_times: list[float] = []
+    poller = None
+    if snapshot_hz > 0:
+        poller = threading.Thread(
+            target=_poll_snapshots, args=(engine, snapshot_hz, done, snapshot_times), daemon=True
+        )
+
+    cpu_started = time.process_time()
+    probe.started = time.perf_counter()
+    if source == "simulator":
+        engine.start(simulate=True)
+    else:
+        engine.start(replay=replay_path)
+    if poller is not None:
+        poller.start()
+
+    # Give a slow pipeline room to show how far behind it is, but not forever.
+    deadline = probe.started + source_seconds * 2.0 + 1.0
+    if source == "simulator":
+        deadline = probe.started + source_seconds
+    while time.perf_counter() < deadline and engine.get_status()["running"]:
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - probe.started
+    engine.stop()
+    cpu_s = time.process_time() - cpu_started
+    done.set()
+    if poller is not None:
+        poller.join(timeout=2.0)
+    subscription.close()
+
+    status = engine.get_status()
+    engine.close()
+    delivered = int(status["samples_total"])
+    if source == "simulator":
+        # The simulator runs until stopped; count what was due by then.
+        expected = int(sample_rate_hz * max(0.0, elapsed - SIMULATOR_SLACK_S))
+    latencies = probe.latencies_s(time_scale)
+    p50, p99 = (np.percentile(latencies, [50, 99]) * 1e3).tolist() if len(latencies) else (0.0, 0.0)
+    delivered_fraction = min(1.0, delivered / max(1, expected))
+    sustained = (
+        delivered_fraction >= MIN_DELIVERED_FRACTION
+        and int(status.get("rx_samples_dropped", 0)) == 0
+        and p99 <= max_latency_s * 1e3
+        and (source == "simulator" or elapsed <= source_seconds * MAX_SLOWDOWN + 0.25)
+    )
+    snapshot_ms = np.asarray(snapshot_times) * 1e3
+    return {
+        "source": source,
+        "sample_rate_hz": sample_rate_hz,
+        "seconds": round(elapsed, 3),
+        "expected_samples": expected,
+        "delivered_samples": delivered,
+        "delivered_fraction": round(delivered_fraction, 4),
+        "rx_samples_dropped": int(status.get("rx_samples_dropped", 0)),
+        "parse_errors": int(status.get("parse_error_count", 0)),
+        "latency_p50_ms": p50,
+        "latency_p99_ms": p99,
+        "cpu_us_per_sample": cpu_s * 1e6 / max(1, delivered),
+        "cpu_fraction": cpu_s / max(elapsed, 1e-9),
+        "snapshots": len(snapshot_ms),
+        "snapshot_p50_ms": float(np.percentile(snapshot_ms, 50)) if len(snapshot_ms) else 0.0,
+        "sustained": sustained,
+    }
+
+
+def run(
+    source: str = "loopback",
+    start_rate_hz: int = 250,
+    max_rate_hz: int = 64_000,
+    seconds: float = 3.0,
+    snapshot_hz: float = 20.0,
+    max_latency_s: float = 0.25,
+    replay_path: str | Path | None = None,
+    seed: int = 1234,
+) -> dict[str, Any]:
+    capture_rate_hz = 0
+    if source == "replay":
+        if not replay_path:
+            raise ValueError("--source replay needs --file.")
+        replay_path = Path(replay_path)
+        capture_rate_hz = RawCapture(replay_path).sample_rate_hz or EngineConfig().sample_rate_hz
+        start_rate_hz = capture_rate_hz
+
+    steps: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="pendulum_bench_") as tmp:
+        rate = int(start_rate_hz)
+        while rate <= max_rate_hz:
+            step = run_step(
+                source,
+                rate,
+                seconds=seconds,
+                snapshot_hz=snapshot_hz,
+                max_latency_s=max_latency_s,
+                replay_path=Path(replay_path) if replay_path else None,
+                capture_rate_hz=capture_rate_hz,
+                seed=seed,
+                workdir=Path(tmp) / str(rate),
+            )
+            steps.append(step)
+            if not step["sustained"]:
+                break
+            rate *= 2
+
+    passed = [step for step in steps if step["sustained"]]
+    best = passed[-1] if passed else None
+    return {
+        "source": source,
+        "seconds_per_step": seconds,
+        "snapshot_hz": snapshot_hz,
+        "max_latency_ms": max_latency_s * 1e3,
+        "max_sustained_sps": best["sample_rate_hz"] if best else 0,
+        "latency_p50_ms": best["latency_p50_ms"] if best else None,
+        "latency_p99_ms": best["latency_p99_ms"] if best else None,
+        "cpu_us_per_sample": best["cpu_us_per_sample"] if best else None,
+        "steps": steps,
+    }
+
+
+def add_bench_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--source", choices=BENCH_SOURCES, default="loopback")
+    parser.add_argument("--file", default=None, help="Raw capture for --source replay.")
+    parser.add_argument("--start-rate", type=int, default=250, help="First sample rate (SPS).")
+    parser.add_argument("--max-rate", type=int, default=64_000, help="Stop doubling past this rate.")
+    parser.add_argument("--seconds", type=float, default=3.0, help="Stream length per step.")
+    parser.add_argument("--snapshot-hz", type=float, default=20.0, help="get_snapshot polls per second (0 = none).")
+    parser.add_argument("--max-latency-ms", type=float, default=250.0, help="p99 latency a step may reach.")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+
+
+def _print_report(results: dict[str, Any]) -> None:
+    print(
+        f"[bench] source={results['source']} {results['seconds_per_step']:g}s/step "
+        f"snapshots@{results['snapshot_hz']:g}Hz"
+    )
+    for step in results["steps"]:
+        print(
+            f"[bench] {step['sample_rate_hz']:>7} SPS  delivered={step['delivered_fraction']:7.2%}  "
+            f"p50={step['latency_p50_ms']:8.2f} ms  p99={step['latency_p99_ms']:8.2f} ms  "
+            f"cpu={step['cpu_us_per_sample']:7.2f} us/sample ({step['cpu_fraction']:6.1%})  "
+            f"snapshot={step['snapshot_p50_ms']:6.2f} ms  {'ok' if step['sustained'] else 'BEHIND'}"
+        )
+    if results["max_sustained_sps"]:
+        print(
+            f"[bench] max sustained: {results['max_sustained_sps']} SPS  "
+            f"p50={results['latency_p50_ms']:.2f} ms  p99={results['latency_p99_ms']:.2f} ms  "
+            f"cpu={results['cpu_us_per_sample']:.2f} us/sample"
+        )
+    else:
+        print("[bench] the first step already fell behind.")
+
+
+def run_bench(args: argparse.Namespace) -> int:
+    results = run(
+        source=args.source,
+        start_rate_hz=args.start_rate,
+        max_rate_hz=args.max_rate,
+        seconds=args.seconds,
+        snapshot_hz=args.snapshot_hz,
+        max_latency_s=args.max_latency_ms / 1e3,
+        replay_path=args.file,
+        seed=args.seed,
+    )
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        _print_report(results)
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="End-to-end acquisition benchmark.")
+    add_bench_arguments(parser)
+    return run_bench(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,150 @@
+"""
+Throughput of the RX frame splitter.
+
+Compares `FrameParser` with the previous bytearray find/del loop and reports
+headroom against the byte rate needed at each ADS1299 sample rate.
+
+    python -m pendulum_eeg.benchmarks.frame_parser [--samples N] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Callable
+
+from ..firmware_protocol import FrameParser
+from .synthetic import (
+    ADS1299_SAMPLE_RATES,
+    boot_banner,
+    serial_bytes_per_second,
+    split_chunks,
+    synthetic_byte_stream,
+)
+
+
+def legacy_split(rx_buffer: bytearray) -> int:
+    """Previous EEGEngine._consume_rx_bytes splitting, kept as the reference."""
+    frames = 0
+    while True:
+        delimiter_idx = rx_buffer.find(0)
+        if delimiter_idx < 0:
+            newline_idx = rx_buffer.find(b"\n")
+            if newline_idx >= 0:
+                bytes(rx_buffer[:newline_idx]).decode(errors="ignore").strip()
+                del rx_buffer[: newline_idx + 1]
+                continue
+            if len(rx_buffer) > 8192:
+                rx_buffer.clear()
+            return frames
+        encoded = bytes(rx_buffer[:delimiter_idx])
+        del rx_buffer[: delimiter_idx + 1]
+        if encoded:
+            frames += 1
+
+
+def _run_legacy(chunks: list[bytes]) -> int:
+    rx_buffer = bytearray()
+    frames = 0
+    for chunk in chunks:
+        rx_buffer.extend(chunk)
+        frames += legacy_split(rx_buffer)
+    return frames
+
+
+def _run_frame_parser(chunks: list[bytes]) -> int:
+    parser = FrameParser()
+    frames = 0
+    for chunk in chunks:
+        for kind, _ in parser.feed(chunk):
+            if kind == "frame":
+                frames += 1
+    return frames
+
+
+def _best_of(fn: Callable[[list[bytes]], int], chunks: list[bytes], repeat: int) -> tuple[float, int]:
+    best = float("inf")
+    frames = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        frames = fn(chunks)
+        best = min(best, time.perf_counter() - started)
+    return best, frames
+
+
+def run(n_samples: int = 50_000, baud: int = 921_600, repeat: int = 3) -> dict:
+    stream = synthetic_byte_stream(n_samples, boot_lines=4)
+    frame_bytes = (len(stream) - len(boot_banner(4))) / float(n_samples)
+    line_rate = serial_bytes_per_second(baud)
+
+    results: dict = {
+        "samples": n_samples,
+        "stream_bytes": len(stream),
+        "bytes_per_frame": round(frame_bytes, 2),
+        "baud": baud,
+        "baud_max_sps": int(line_rate / frame_bytes),
+        "chunks": [],
+    }
+    # 4096 is the serial read size; smaller chunks model short reads at low
+    # rates and 65536 models the backlog drained after a stalled loop.
+    for chunk_size in (64, 512, 4096, 65_536):
+        chunks = split_chunks(stream, chunk_size)
+        legacy_s, legacy_frames = _best_of(_run_legacy, chunks, repeat)
+        parser_s, parser_frames = _best_of(_run_frame_parser, chunks, repeat)
+        parser_bps = len(stream) / parser_s
+        results["chunks"].append(
+            {
+                "chunk_size": chunk_size,
+                # The legacy loop splits partial frames containing 0x0A as text,
+                # so it can report fewer frames than the parser.
+                "legacy_frames": legacy_frames,
+                "parser_frames": parser_frames,
+                "legacy_bytes_per_s": len(stream) / legacy_s,
+                "parser_bytes_per_s": parser_bps,
+                "parser_frames_per_s": parser_frames / parser_s,
+                "speedup": legacy_s / parser_s,
+                "headroom_x": {
+                    str(rate): parser_bps / (rate * frame_bytes) for rate in ADS1299_SAMPLE_RATES
+                },
+                "headroom_x_baud": parser_bps / line_rate,
+            }
+        )
+    return results
+
+
+def _print_report(results: dict) -> None:
+    print(
+        f"stream: {results['samples']} frames, {results['stream_bytes']} bytes "
+        f"({results['bytes_per_frame']} B/frame); {results['baud']} baud carries "
+        f"at most {results['baud_max_sps']} SPS"
+    )
+    for entry in results["chunks"]:
+        print(
+            f"chunk={entry['chunk_size']:>5}  legacy={entry['legacy_bytes_per_s'] / 1e6:7.2f} MB/s  "
+            f"parser={entry['parser_bytes_per_s'] / 1e6:7.2f} MB/s  "
+            f"({entry['parser_frames_per_s']:,.0f} frames/s, x{entry['speedup']:.1f})  "
+            f"baud headroom x{entry['headroom_x_baud']:.0f}"
+        )
+        headroom = "  ".join(f"{rate}:x{value:.0f}" for rate, value in entry["headroom_x"].items())
+        print(f"        SPS headroom  {headroom}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="FrameParser throughput benchmark.")
+    parser.add_argument("--samples", type=int, default=50_000)
+    parser.add_argument("--baud", type=int, default=921_600)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = parser.parse_args(argv)
+
+    results = run(n_samples=args.samples, baud=args.baud, repeat=args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        _print_report(results)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
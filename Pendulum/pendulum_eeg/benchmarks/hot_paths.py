@@ -0,0 +1,427 @@
+"""
+Micro-benchmarks of the host hot paths, with a baseline compare mode.
+
+Covers frame decoding (COBS, CRC, raw packet parsing, batch decode), engine
+ingest (`_consume_rx_bytes`, `_handle_packet`), band metrics, signal views
+and `get_snapshot`, on seeded synthetic input at several sample rates and
+window sizes. Each case reports the best and median us/op over `--repeat`
+timing rounds, ops/s, us/sample and the bytes allocated by one call
+(tracemalloc).
+
+    python -m pendulum_eeg.benchmarks.hot_paths [--json] [--save FILE]
+    python -m pendulum_eeg.benchmarks.hot_paths --compare FILE [--threshold 0.15]
+
+`--compare` runs at least `COMPARE_MIN_REPEAT` rounds and exits with status
+1 when a case's best and median us/op are both slower than the baseline by
+more than the threshold.
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import json
+import platform
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+
+from ..analysis import SIGNAL_VIEW_ORDER, build_signal_views, compute_band_metrics
+from ..engine import EEGEngine, EngineConfig
+from ..firmware_protocol import (
+    cobs_decode,
+    crc16_ccitt,
+    decode_frames_batch,
+    parse_raw_packet,
+    sample_packets_to_array,
+)
+from ..models import SamplePacket
+from .synthetic import synthetic_frames
+
+DEFAULT_RATES = (250, 1_000, 4_000)
+DEFAULT_WINDOWS_S = (2.0, 8.0)
+# One serial read's worth of samples is ~20 ms of stream at any rate.
+READ_PERIOD_S = 0.02
+# A few frames per USB transfer, as a slow host or low rate delivers them.
+SMALL_READ_SAMPLES = 5
+RESULTS_VERSION = 2
+# One round is easily disturbed by the scheduler; compare on several.
+COMPARE_MIN_REPEAT = 5
+
+
+@dataclass(slots=True)
+class BenchCase:
+    name: str
+    fn: Callable[[], Any]
+    samples_per_op: int = 1
+    params: dict[str, Any] = field(default_factory=dict)
+    # Called before each op and excluded from the timing (e.g. cache busting).
+    setup: Callable[[], None] | None = None
+    # Called once after the run (e.g. closing the case's engine).
+    teardown: Callable[[], None] | None = None
+
+    @property
+    def key(self) -> str:
+        if not self.params:
+            return self.name
+        return self.name + "[" + ",".join(f"{k}={v}" for k, v in self.params.items()) + "]"
+
+
+def _measure_allocations(case: BenchCase) -> tuple[int, int]:
+    """(peak, net) bytes allocated by one call."""
+    if case.setup is not None:
+        case.setup()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        case.fn()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - before, after - before
+
+
+def _ops_per_round(case: BenchCase, min_time_s: float) -> int:
+    started = time.perf_counter()
+    case.fn()
+    single = max(time.perf_counter() - started, 1e-7)
+    return max(1, int(min_time_s / single))
+
+
+def _time_round(case: BenchCase, ops: int) -> float:
+    """Seconds/op of one round of `ops` calls."""
+    elapsed = 0.0
+    for _ in range(ops):
+        if case.setup is not None:
+            case.setup()
+        started = time.perf_counter()
+        case.fn()
+        elapsed += time.perf_counter() - started
+    return elapsed / ops
+
+
+def _case_result(case: BenchCase, rounds: list[float], ops: int) -> dict[str, Any]:
+    seconds_per_op = min(rounds)
+    alloc_peak, alloc_net = _measure_allocations(case)
+    us_per_op = seconds_per_op * 1e6
+    return {
+        "key": case.key,
+        "name": case.name,
+        "params": case.params,
+        "ops_per_round": ops,
+        "rounds": len(rounds),
+        "us_per_op": us_per_op,
+        "us_per_op_median": float(np.median(rounds)) * 1e6,
+        "ops_per_s": 1.0 / seconds_per_op,
+        "us_per_sample": us_per_op / max(1, case.samples_per_op),
+        "alloc_peak_bytes": alloc_peak,
+        "alloc_net_bytes": alloc_net,
+    }
+
+
+def run_cases(cases: list[BenchCase], min_time_s: float = 0.2, repeat: int = 3) -> list[dict[str, Any]]:
+    """
+    Best and median of `repeat` rounds of at least `min_time_s` per case.
+    Rounds are interleaved across cases, so a slow spell on the machine
+    costs each case one round instead of all rounds of a few cases.
+    """
+    ops = [_ops_per_round(case, min_time_s) for case in cases]
+    rounds: list[list[float]] = [[] for _ in cases]
+    for _ in range(max(1, repeat)):
+        for case, case_ops, case_rounds in zip(cases, ops, rounds):
+            case_rounds.append(_time_round(case, case_ops))
+    return [_case_result(case, case_rounds, case_ops) for case, case_ops, case_rounds in zip(cases, ops, rounds)]
+
+
+def run_case(case: BenchCase, min_time_s: float = 0.2, repeat: int = 3) -> dict[str, Any]:
+    return run_cases([case], min_time_s, repeat)[0]
+
+
+def _engine(sample_rate_hz: int, archive_dir: str) -> EEGEngine:
+    # Each engine archives into its own directory under `archive_dir`.
+    config = EngineConfig(
+        sample_rate_hz=sample_rate_hz,
+        archive_dir=tempfile.mkdtemp(prefix="engine_", dir=archive_dir),
+        lazy_views=False,
+    )
+    return EEGEngine(config)
+
+
+def _fill(engine: EEGEngine, stream: bytes, read_size: int) -> None:
+    for start in range(0, len(stream), read_size):
+        engine._consume_rx_bytes(stream[start : start + read_size])
+
+
+def _bump_generation(engine: EEGEngine) -> Callable[[], None]:
+    # get_snapshot memoizes per generation; a new one forces a rebuild.
+    def _setup() -> None:
+        with engine._lock:
+            engine._generation += 1
+
+    return _setup
+
+
+def build_cases(
+    rates: tuple[int, ...] = DEFAULT_RATES,
+    windows_s: tuple[float, ...] = DEFAULT_WINDOWS_S,
+    seed: int = 1234,
+    archive_dir: str | None = None,
+) -> list[BenchCase]:
+    archive_dir = archive_dir or tempfile.mkdtemp(prefix="pendulum_bench_")
+    frames = synthetic_frames(256, seed=seed)
+    frame = bytes(frames[0, :-1])  # without the 0x00 delimiter
+    raw = cobs_decode(frame)
+    packet = parse_raw_packet(raw)
+    assert isinstance(packet, SamplePacket)
+
+    cases = [
+        BenchCase("cobs_decode", lambda: cobs_decode(frame)),
+        BenchCase("crc16_ccitt", lambda: crc16_ccitt(raw[:-2])),
+        BenchCase("parse_raw_packet", lambda: parse_raw_packet(raw)),
+        BenchCase("sample_packets_to_array", lambda: sample_packets_to_array((packet,))),
+    ]
+
+    packet_engine = _engine(DEFAULT_RATES[0], archive_dir)
+    cases.append(
+        BenchCase(
+            "engine_handle_packet",
+            lambda: packet_engine._handle_packet(packet),
+            teardown=packet_engine.close,
+        )
+    )
+
+    # Short reads (a few frames per USB transfer) are where per-block
+    # overhead, rather than per-sample work, dominates ingest.
+    small_read_bytes = synthetic_frames(SMALL_READ_SAMPLES, seed=seed).tobytes()
+    small_engine = _engine(DEFAULT_RATES[0], archive_dir)
+    cases.append(
+        BenchCase(
+            "engine_consume_rx_bytes",
+            lambda: small_engine._consume_rx_bytes(small_read_bytes),
+            samples_per_op=SMALL_READ_SAMPLES,
+            params={"rate": DEFAULT_RATES[0], "read_samples": SMALL_READ_SAMPLES},
+            teardown=small_engine.close,
+        )
+    )
+
+    rng = np.random.default_rng(seed)
+    for rate in rates:
+        read_samples = max(1, int(rate * READ_PERIOD_S))
+        read_frames = synthetic_frames(read_samples, sample_rate_hz=rate, seed=seed)
+        frame_views = [memoryview(bytes(row[:-1])) for row in read_frames]
+        read_bytes = read_frames.tobytes()
+        cases.append(
+            BenchCase(
+                "decode_frames_batch",
+                lambda views=frame_views: decode_frames_batch(views),
+                samples_per_op=read_samples,
+                params={"rate": rate},
+            )
+        )
+
+        ingest_engine = _engine(rate, archive_dir)
+        cases.append(
+            BenchCase(
+                "engine_consume_rx_bytes",
+                lambda engine=ingest_engine, chunk=read_bytes: engine._consume_rx_bytes(chunk),
+                samples_per_op=read_samples,
+                params={"rate": rate},
+                teardown=ingest_engine.close,
+            )
+        )
+
+        snapshot_engine = _engine(rate, archive_dir)
+        _fill(snapshot_engine, synthetic_frames(rate * 10, sample_rate_hz=rate, seed=seed).tobytes(), 4_096)
+        snapshot_engine._update_metrics_from_history()
+        cases.append(
+            BenchCase(
+                "get_snapshot",
+                lambda engine=snapshot_engine: engine.get_snapshot(),
+                samples_per_op=1_500,
+                params={"rate": rate},
+                setup=_bump_generation(snapshot_engine),
+                teardown=snapshot_engine.close,
+            )
+        )
+        cases.append(
+            BenchCase(
+                "get_snapshot_no_views",
+                lambda engine=snapshot_engine: engine.get_snapshot(views=()),
+                params={"rate": rate},
+                setup=_bump_generation(snapshot_engine),
+            )
+        )
+
+        for window_s in windows_s:
+            n = int(rate * window_s)
+            window_uv = rng.normal(0.0, 20.0, size=(n, 4))
+            params = {"rate": rate, "window_s": window_s}
+            cases.append(
+                BenchCase(
+                    "compute_band_metrics",
+                    lambda w=window_uv, r=rate: compute_band_metrics(w, float(r)),
+                    samples_per_op=n,
+                    params=params,
+                )
+            )
+            cases.append(
+                BenchCase(
+                    "build_signal_views",
+                    lambda w=window_uv, r=rate: build_signal_views(w, float(r), SIGNAL_VIEW_ORDER),
+                    samples_per_op=n,
+                    params=params,
+                )
+            )
+    return cases
+
+
+def run(
+    rates: tuple[int, ...] = DEFAULT_RATES,
+    windows_s: tuple[float, ...] = DEFAULT_WINDOWS_S,
+    min_time_s: float = 0.2,
+    repeat: int = 3,
+    seed: int = 1234,
+    only: str | None = None,
+) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix="pendulum_bench_") as archive_dir:
+        cases = build_cases(rates, windows_s, seed=seed, archive_dir=archive_dir)
+        try:
+            selected = [case for case in cases if not only or fnmatch.fnmatch(case.key, only)]
+            results = run_cases(selected, min_time_s=min_time_s, repeat=repeat)
+        finally:
+            for case in cases:
+                if case.teardown is not None:
+                    case.teardown()
+    return {
+        "version": RESULTS_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "machine": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+        },
+        "seed": seed,
+        "cases": results,
+    }
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], threshold: float = 0.15) -> list[dict[str, Any]]:
+    """
+    Per-case best and median us/op ratios against `baseline`; status is
+    slower/faster/same/new. A case is only slower (or faster) when both
+    ratios agree, so one disturbed round does not flag it.
+    """
+    previous = {case["key"]: case for case in baseline.get("cases", [])}
+    rows = []
+    for case in current["cases"]:
+        before = previous.get(case["key"])
+        if before is None:
+            rows.append({"key": case["key"], "status": "new", "ratio": None})
+            continue
+        ratio = case["us_per_op"] / max(before["us_per_op"], 1e-9)
+        # Version 1 baselines have no median; fall back to the best round.
+        median_ratio = case.get("us_per_op_median", case["us_per_op"]) / max(
+            before.get("us_per_op_median", before["us_per_op"]), 1e-9
+        )
+        if min(ratio, median_ratio) > 1.0 + threshold:
+            status = "slower"
+        elif max(ratio, median_ratio) < 1.0 / (1.0 + threshold):
+            status = "faster"
+        else:
+            status = "same"
+        rows.append(
+            {
+                "key": case["key"],
+                "status": status,
+                "ratio": ratio,
+                "median_ratio": median_ratio,
+                "us_per_op": case["us_per_op"],
+                "baseline_us_per_op": before["us_per_op"],
+            }
+        )
+    return rows
+
+
+def _print_report(results: dict[str, Any]) -> None:
+    machine = results["machine"]
+    print(f"python {machine['python']}, numpy {machine['numpy']}, {machine['platform']}")
+    for case in results["cases"]:
+        print(
+            f"{case['key']:<52} {case['us_per_op']:12.2f} us/op (median {case['us_per_op_median']:10.2f})  "
+            f"{case['ops_per_s']:12,.0f} ops/s  "
+            f"{case['us_per_sample']:9.3f} us/sample  {case['alloc_peak_bytes'] / 1024:9.1f} KiB"
+        )
+
+
+def _print_comparison(rows: list[dict[str, Any]], threshold: float) -> None:
+    print(f"compare (threshold {threshold:.0%}):")
+    for row in rows:
+        if row["ratio"] is None:
+            print(f"  {row['key']:<52} {'new':>8}")
+            continue
+        marker = "  <-- SLOWER" if row["status"] == "slower" else ""
+        print(
+            f"  {row['key']:<52} x{row['ratio']:6.2f} (median x{row['median_ratio']:5.2f})  "
+            f"{row['baseline_us_per_op']:10.2f} -> {row['us_per_op']:10.2f} us/op{marker}"
+        )
+
+
+def _floats(text: str) -> tuple[float, ...]:
+    return tuple(float(part) for part in text.split(",") if part.strip())
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Host hot-path micro-benchmarks.")
+    parser.add_argument("--rates", default=",".join(map(str, DEFAULT_RATES)), help="Sample rates, comma separated.")
+    parser.add_argument(
+        "--windows", default=",".join(map(str, DEFAULT_WINDOWS_S)), help="Metric window seconds, comma separated."
+    )
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds per timing round.")
+    parser.add_argument(
+        "--repeat", type=int, default=3, help=f"Timing rounds (at least {COMPARE_MIN_REPEAT} with --compare)."
+    )
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--only", default=None, help="Glob over case keys, e.g. 'get_snapshot*'.")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    parser.add_argument("--save", default=None, help="Write results JSON to this file.")
+    parser.add_argument("--compare", default=None, help="Baseline results JSON to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed slowdown before flagging.")
+    args = parser.parse_args(argv)
+
+    results = run(
+        rates=tuple(int(rate) for rate in _floats(args.rates)),
+        windows_s=_floats(args.windows),
+        min_time_s=args.min_time,
+        repeat=max(args.repeat, COMPARE_MIN_REPEAT) if args.compare else args.repeat,
+        seed=args.seed,
+        only=args.only,
+    )
+    if args.save:
+        Path(args.save).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    rows = None
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        rows = compare(results, baseline, args.threshold)
+        results["comparison"] = rows
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        _print_report(results)
+        if rows is not None:
+            _print_comparison(rows, args.threshold)
+    if rows is not None and any(row["status"] == "slower" for row in rows):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import math
+import random
+
+import numpy as np
+
+from ..firmware_protocol import (
+    ADS_STATUS_HEADER_OK,
+    FLAG_STREAMING,
+    PROTO_VER,
+    encode_packet,
+    encode_sample_frames,
+)
+from ..models import SamplePacket
+from ..simulator import EEGSimulator
+
+
+ADS1299_SAMPLE_RATES = (250, 500, 1_000, 2_000, 4_000, 8_000, 16_000)
+SERIAL_BITS_PER_BYTE = 10  # 8N1: start + 8 data + stop
+
+
+def serial_bytes_per_second(baud: int) -> float:
+    return float(baud) / SERIAL_BITS_PER_BYTE
+
+
+def synthetic_sample_packets(
+    n_samples: int,
+    sample_rate_hz: int = 250,
+    seed: int = 1234,
+) -> list[SamplePacket]:
+    """Deterministic sample packets resembling a 4-channel EEG stream."""
+    rng = random.Random(seed)
+    period_us = 1_000_000.0 / float(sample_rate_hz)
+    packets: list[SamplePacket] = []
+    for i in range(n_samples):
+        t = i / float(sample_rate_hz)
+        base = 2_000.0 * math.sin(2.0 * math.pi * 10.0 * t)
+        packets.append(
+            SamplePacket(
+                version=PROTO_VER,
+                sample_index=i & 0xFFFFFFFF,
+                t_us=int(i * period_us) & 0xFFFFFFFF,
+                status24=ADS_STATUS_HEADER_OK,
+                ch1=int(base + rng.gauss(0.0, 300.0)),
+                ch2=int(base * 0.95 + rng.gauss(0.0, 300.0)),
+                ch3=int(base * 1.05 + rng.gauss(0.0, 300.0)),
+                ch4=int(base * 1.02 + rng.gauss(0.0, 300.0)),
+                flags=FLAG_STREAMING,
+                missed_drdy_frame=0,
+                recoveries_total=0,
+            )
+        )
+    return packets
+
+
+def boot_banner(lines: int) -> bytes:
+    return b"".join(f"# boot line {i}\n".encode("ascii") for i in range(lines))
+
+
+def synthetic_byte_stream(
+    n_samples: int,
+    sample_rate_hz: int = 250,
+    seed: int = 1234,
+    boot_lines: int = 4,
+) -> bytes:
+    """COBS-framed sample stream, optionally preceded by ASCII boot lines."""
+    head = boot_banner(boot_lines)
+    body = b"".join(
+        encode_packet(p) for p in synthetic_sample_packets(n_samples, sample_rate_hz, seed)
+    )
+    return head + body
+
+
+def split_chunks(data: bytes, chunk_size: int) -> list[bytes]:
+    return [data[i : i + chunk_size] for i in range(0, len(data), max(1, chunk_size))]
+
+
+def synthetic_frames(n_samples: int, sample_rate_hz: int = 250, seed: int = 1234) -> np.ndarray:
+    """(n_samples, 46) uint8 encoded frames (delimiter included) from the seeded simulator."""
+    simulator = EEGSimulator(sample_rate_hz=sample_rate_hz, seed=seed)
+    return encode_sample_frames(simulator.next_block(n_samples))
@@ -3,6 +3,8 @@ from __future__ import annotations
 import argparse
 import time
 
+from .benchmarks.end_to_end import add_bench_arguments, run_bench
+from .firmware_emulator import add_emulator_arguments, run_emulator
 from .reflex_bridge import get_engine
 
 
@@ -15,23 +17,93 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     capture.add_argument("--baud", type=int, default=921600)
     capture.add_argument("--seconds", type=int, default=20)
     capture.add_argument("--simulate", action="store_true")
+    capture.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="Simulated seconds per second with --simulate (0 = as fast as possible).",
+    )
+    capture.add_argument("--seed", type=int, default=None, help="Simulator seed.")
     capture.add_argument("--fif", action="store_true", help="Export FIF as well.")
+    capture.add_argument(
+        "--raw",
+        action="store_true",
+        help="Also record the raw serial byte stream for `replay`.",
+    )
+
+    replay = sub.add_parser("replay", help="Feed a raw capture file back through the parser.")
+    replay.add_argument("file", help="Raw capture (.pndraw) written by `capture --raw`.")
+    replay.add_argument(
+        "--speed",
+        type=float,
+        default=0.0,
+        help="Capture seconds per second (0 = as fast as possible).",
+    )
+    replay.add_argument("--npz", action="store_true", help="Export NPZ after the replay.")
 
     sub.add_parser("snapshot", help="Show a quick snapshot of current state.")
+
+    bench = sub.add_parser("bench", help="Find the highest sample rate the pipeline sustains.")
+    add_bench_arguments(bench)
+
+    emulate = sub.add_parser("emulate", help="Run the firmware emulator on a pseudo-terminal.")
+    add_emulator_arguments(emulate)
     return parser.parse_args(argv)
 
 
+def print_perf_stats(stats: dict, prefix: str) -> None:
+    for stage, timing in stats["stages"].items():
+        if not timing["count"]:
+            continue
+        print(
+            f"[{prefix}] {stage:>11}: n={timing['count']:<7} p50={timing['p50_us']:9.1f} us  "
+            f"p99={timing['p99_us']:9.1f} us  max={timing['max_us']:9.1f} us  "
+            f"busy={timing['busy_fraction']:6.1%}"
+        )
+
+
+def print_clock_stats(stats: dict, prefix: str) -> None:
+    if not stats.get("synced"):
+        print(f"[{prefix}] clock: not enough reads to fit device time")
+        return
+    print(
+        f"[{prefix}] clock: drift={stats['drift_ppm']:+.1f} ppm jitter={stats['jitter_ms']:.2f} ms "
+        f"latency p50={stats['latency_p50_ms']:.2f} ms p99={stats['latency_p99_ms']:.2f} ms "
+        f"outliers={stats['outliers']}/{stats['points']}"
+    )
+
+
 def run_capture(args: argparse.Namespace) -> int:
     engine = get_engine()
-    engine.start(port=args.port, baud=args.baud, simulate=args.simulate)
-    print(f"[capture] collecting for {args.seconds}s...")
-    time.sleep(max(1, int(args.seconds)))
-
-    snap = engine.get_snapshot(max_points=5)
+    engine.config.simulate_speed = args.speed
+    engine.config.simulate_seed = args.seed
+    if args.raw:
+        print(f"[capture] raw:  {engine.start_raw_capture()}")
+    # Status and warnings are pushed as they happen, so a dropped port ends
+    # the capture right away instead of after the full sleep.
+    with engine.subscribe(kinds=("status", "events"), overflow="coalesce") as updates:
+        engine.start(port=args.port, baud=args.baud, simulate=args.simulate)
+        print(f"[capture] collecting for {args.seconds}s...")
+        deadline = time.monotonic() + max(1, int(args.seconds))
+        while (remaining := deadline - time.monotonic()) > 0:
+            message = updates.get(timeout=remaining)
+            if message is None:
+                continue
+            if message["kind"] == "events":
+                for event in message["events"]:
+                    if event["level"] != "INFO":
+                        print(f"[capture] {event['level']}: {event['message']}")
+            elif not message["running"]:
+                print(f"[capture] stopped early: {message['status_message']}")
+                break
+
+    snap = engine.get_snapshot(max_points=5, views=())
     print(
         f"[capture] status={snap['status_message']} samples={snap['samples_total']} "
         f"parse_errors={snap['parse_error_count']}"
     )
+    print_clock_stats(engine.get_clock_stats(), "capture")
+    print_perf_stats(engine.get_perf_stats(), "capture")
 
     csv_path = engine.export_csv()
     npz_path = engine.export_npz()
@@ -44,12 +116,34 @@ def run_capture(args: argparse.Namespace) -> int:
         fif_path = engine.export_fif()
         print(f"[capture] fif:  {fif_path}")
 
-    engine.stop()
+    engine.close()
+    return 0
+
+
+def run_replay(args: argparse.Namespace) -> int:
+    engine = get_engine()
+    engine.config.replay_speed = args.speed
+    started = time.perf_counter()
+    with engine.subscribe(kinds=("status",), overflow="coalesce") as updates:
+        engine.start(replay=args.file)
+        while engine.get_status()["running"]:
+            updates.get(timeout=1.0)
+    elapsed = time.perf_counter() - started
+
+    snap = engine.get_snapshot(max_points=5, views=())
+    print(
+        f"[replay] status={snap['status_message']} samples={snap['samples_total']} "
+        f"parse_errors={snap['parse_error_count']} elapsed={elapsed:.2f}s"
+    )
+    print_perf_stats(engine.get_perf_stats(), "replay")
+    if args.npz:
+        print(f"[replay] npz:  {engine.export_npz()}")
+    engine.close()
     return 0
 
 
 def run_snapshot() -> int:
-    snap = get_engine().get_snapshot(max_points=5)
+    snap = get_engine().get_snapshot(max_points=5, views=())
     print(f"status={snap['status_message']}")
     print(f"running={snap['running']} connected={snap['connected']} simulate={snap['simulate']}")
     print(f"samples_total={snap['samples_total']} packets_total={snap['packets_total']}")
@@ -61,8 +155,14 @@ def main(argv: list[str] | None = None) -> int:
     args = parse_args(argv)
     if args.cmd == "capture":
         return run_capture(args)
+    if args.cmd == "replay":
+        return run_replay(args)
     if args.cmd == "snapshot":
         return run_snapshot()
+    if args.cmd == "bench":
+        return run_bench(args)
+    if args.cmd == "emulate":
+        return run_emulator(args)
     return 1
 
 
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Any
+
+import numpy as np
+
+# t_us is a uint32: it wraps every ~71.6 minutes. A step of half the range or
+# more is read as the device clock restarting, not as a forward jump.
+T_US_MODULUS = 1 << 32
+_MIN_SCALE_S = 50e-6
+_SCALE_ALPHA = 0.01
+
+
+class CounterUnwrapper:
+    """
+    Extends a wrapping uint32 device counter (t_us, sample_index) to a
+    monotonic int64, one decoded block at a time, with one vectorized pass.
+
+    A backwards step of half the range or more is a device restart rather
+    than a wrap: counting resumes one past the last value, so the output
+    stays sorted and can be binary searched.
+    """
+
+    def __init__(self, modulus: int = T_US_MODULUS) -> None:
+        self._modulus = int(modulus)
+        self.reset()
+
+    def reset(self) -> None:
+        self._last_raw: int | None = None
+        self._last = 0
+        self.restarts = 0
+
+    @property
+    def last(self) -> int | None:
+        """Last unwrapped value, or None before the first block."""
+        return None if self._last_raw is None else self._last
+
+    def unwrap(self, values: np.ndarray) -> np.ndarray:
+        return self.unwrap_segments(values)[0]
+
+    def unwrap_segments(self, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """(unwrapped values, segment id per value); the id is the restart count so far."""
+        raw = np.asarray(values, dtype=np.int64)
+        if len(raw) == 0:
+            return raw, np.zeros(0, dtype=np.int64)
+        first_block = self._last_raw is None
+        previous = raw[0] if first_block else self._last_raw
+        steps = np.diff(raw, prepend=previous) % self._modulus
+        restarts = steps >= self._modulus // 2
+        segments = self.restarts + np.cumsum(restarts)
+        if restarts.any():
+            self.restarts += int(np.count_nonzero(restarts))
+            steps[restarts] = 1
+        unwrapped = (raw[0] if first_block else self._last) + np.cumsum(steps)
+        self._last_raw = int(raw[-1])
+        self._last = int(unwrapped[-1])
+        return unwrapped, segments
+
+
+class ClockSync:
+    """
+    Online map from device time (unwrapped t_us) to host time.
+
+    Each serial read contributes one point: the device time of its last
+    sample and the host time the read returned. `update` fits
+    host - device = offset + drift * device by exponentially weighted least
+    squares (half-life `half_life_points` points), and skips points whose
+    residual exceeds `outlier_sigma` times the residual scale, typically
+    reads that sat in USB/driver buffers. The scale starts from the MAD of
+    the warm-up points and tracks a winsorized running variance. After
+    `reset_after_outliers` rejections in a row (host clock step) the fit
+    starts over.
+
+    Residuals relative to the fastest recent delivery (their 1st percentile)
+    are the transport latency the device-to-host path added on top of its
+    minimum; `to_host` maps device times onto that lower edge.
+    """
+
+    def __init__(
+        self,
+        half_life_points: int = 2_000,
+        outlier_sigma: float = 4.0,
+        warmup_points: int = 16,
+        reset_after_outliers: int = 64,
+        residual_window: int = 4_096,
+    ) -> None:
+        self._decay = 0.5 ** (1.0 / max(1, half_life_points))
+        self._outlier_sigma = float(outlier_sigma)
+        self._warmup_points = max(2, int(warmup_points))
+        self._reset_after = max(1, int(reset_after_outliers))
+        self._residuals: deque[float] = deque(maxlen=max(16, int(residual_window)))
+        self.points = 0
+        self.outliers = 0
+        self.resets = 0
+        self._clear_fit()
+
+    def reset(self) -> None:
+        """Forget the fit (device clock restarted); counters are kept."""
+        self._clear_fit()
+        self.resets += 1
+
+    def _clear_fit(self) -> None:
+        self._origin: tuple[int, float] | None = None
+        self._weight = 0.0
+        self._mean_x = 0.0
+        self._mean_y = 0.0
+        self._cov_xx = 0.0
+        self._cov_xy = 0.0
+        self._var_r = 0.0
+        self._fitted = 0
+        self._consecutive_outliers = 0
+        self._warmup: list[tuple[float, float]] = []
+        self._residuals.clear()
+
+    @property
+    def synced(self) -> bool:
+        return self._fitted >= self._warmup_points and self._cov_xx > 0.0
+
+    def update(self, device_us: int, host_s: float) -> bool:
+        """Add one (device, host) point; returns False if it was rejected as an outlier."""
+        if self._origin is None:
+            self._origin = (int(device_us), float(host_s))
+        x = (int(device_us) - self._origin[0]) / 1e6
+        y = (float(host_s) - self._origin[1]) - x
+        self.points += 1
+
+        if self.synced:
+            residual = y - self._predict(x)
+            self._residuals.append(residual)
+            limit = self._outlier_sigma * max(np.sqrt(self._var_r), _MIN_SCALE_S)
+            # Winsorized, so a scale seeded too small can still grow.
+            clipped = min(abs(residual), limit)
+            self._var_r += _SCALE_ALPHA * (clipped * clipped - self._var_r)
+            if abs(residual) > limit:
+                self.outliers += 1
+                self._consecutive_outliers += 1
+                if self._consecutive_outliers >= self._reset_after:
+                    self.reset()
+                return False
+            self._consecutive_outliers = 0
+        else:
+            self._warmup.append((x, y))
+
+        # Weighted Welford update with forgetting factor.
+        self._weight = self._decay * self._weight + 1.0
+        dx = x - self._mean_x
+        self._mean_x += dx / self._weight
+        self._mean_y += (y - self._mean_y) / self._weight
+        self._cov_xx = self._decay * self._cov_xx + dx * (x - self._mean_x)
+        self._cov_xy = self._decay * self._cov_xy + dx * (y - self._mean_y)
+        self._fitted += 1
+        if self._warmup and self.synced:
+            xs, ys = np.asarray(self._warmup).T
+            residuals = ys - self._predict(xs)
+            mad = 1.4826 * float(np.median(np.abs(residuals - np.median(residuals))))
+            self._var_r = max(mad, _MIN_SCALE_S) ** 2
+            self._residuals.extend(residuals.tolist())
+            self._warmup = []
+        return True
+
+    def to_host(self, device_us: np.ndarray | int) -> np.ndarray:
+        """Host times (unix seconds) for unwrapped device times, at minimum transport delay."""
+        if self._origin is None:
+            return np.full(np.shape(device_us), np.nan)
+        x = (np.asarray(device_us, dtype=np.int64) - self._origin[0]) / 1e6
+        return self._origin[1] + x + self._predict(x) + self._floor()
+
+    def stats(self) -> dict[str, Any]:
+        residuals = np.asarray(self._residuals, dtype=np.float64)
+        latency_ms = (residuals - self._floor()) * 1e3 if len(residuals) else residuals
+        return {
+            "synced": self.synced,
+            "points": self.points,
+            "outliers": self.outliers,
+            "resets": self.resets,
+            "drift_ppm": self._drift() * 1e6,
+            "jitter_ms": float(np.sqrt(self._var_r)) * 1e3,
+            "latency_p50_ms": float(np.percentile(latency_ms, 50)) if len(latency_ms) else 0.0,
+            "latency_p99_ms": float(np.percentile(latency_ms, 99)) if len(latency_ms) else 0.0,
+            "latency_max_ms": float(latency_ms.max()) if len(latency_ms) else 0.0,
+        }
+
+    def _drift(self) -> float:
+        return self._cov_xy / self._cov_xx if self._cov_xx > 0.0 else 0.0
+
+    def _predict(self, x: np.ndarray | float) -> np.ndarray | float:
+        return self._mean_y + self._drift() * (x - self._mean_x)
+
+    def _floor(self) -> float:
+        if not self._residuals:
+            return 0.0
+        return float(np.percentile(np.asarray(self._residuals), 1))
+
+
+def _robust_line(x: np.ndarray, y: np.ndarray, sigma: float = 4.0, iterations: int = 4) -> tuple[float, float, np.ndarray]:
+    """(intercept, slope, inlier mask) of y ~ x, refitting without MAD outliers."""
+    keep = np.ones(len(x), dtype=bool)
+    slope, intercept = np.polyfit(x, y, 1)
+    for _ in range(iterations):
+        residuals = y - (intercept + slope * x)
+        center = np.median(residuals[keep])
+        mad = 1.4826 * np.median(np.abs(residuals[keep] - center)) + 1e-6
+        new_keep = np.abs(residuals - center) <= sigma * mad
+        if new_keep.sum() < 2 or np.array_equal(new_keep, keep):
+            break
+        keep = new_keep
+        slope, intercept = np.polyfit(x[keep], y[keep], 1)
+    return float(intercept), float(slope), keep
+
+
+def corrected_host_times(t_us: np.ndarray, host_s: np.ndarray) -> np.ndarray:
+    """
+    Per-sample host times from a whole-session fit of device vs. host time.
+
+    Samples sharing a host timestamp came from one serial read; its last
+    sample gives one (device, host) point. Each device clock segment gets a
+    robust line through its points, shifted down to the fastest deliveries,
+    so the result follows the device's sample spacing instead of the read
+    cadence. Segments with fewer than two reads keep their host timestamps.
+    t_us is unwrapped with the same `CounterUnwrapper` rules as the engine.
+    """
+    host = np.asarray(host_s, dtype=np.float64)
+    corrected = host.copy()
+    if len(host) < 2:
+        return corrected
+    device_us, segments = CounterUnwrapper().unwrap_segments(t_us)
+    read_ends = np.flatnonzero(np.diff(host) != 0.0)
+    read_ends = np.append(read_ends, len(host) - 1)
+
+    for segment in np.unique(segments):
+        members = np.flatnonzero(segments == segment)
+        first, last = members[0], members[-1]
+        ends = read_ends[(read_ends >= first) & (read_ends <= last)]
+        if len(ends) < 2:
+            continue
+        device0 = device_us[first]
+        host0 = host[ends[0]]
+        x = (device_us[ends] - device0) / 1e6
+        y = (host[ends] - host0) - x
+        intercept, slope, keep = _robust_line(x, y)
+        floor = float(np.percentile((y - (intercept + slope * x))[keep], 1))
+        xs = (device_us[first : last + 1] - device0) / 1e6
+        corrected[first : last + 1] = host0 + xs + intercept + slope * xs + floor
+    return corrected
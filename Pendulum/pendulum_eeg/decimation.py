@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from typing import Any, Literal, Mapping
+
+import numpy as np
+
+DecimationMethod = Literal["minmax", "lttb"]
+DECIMATION_METHODS: tuple[DecimationMethod, ...] = ("minmax", "lttb")
+
+
+def _as_matrix(y: np.ndarray) -> np.ndarray:
+    y = np.asarray(y)
+    return y[:, None] if y.ndim == 1 else y
+
+
+def minmax_indices(y: np.ndarray, target_points: int) -> np.ndarray:
+    """
+    Row indices keeping the min and max of every channel per bucket.
+
+    Channels often share extreme rows, so rather than assuming they never
+    do, the bucket count is the largest whose union over channels still fits
+    in `target_points`. Extremes are found once on the finest buckets that
+    could fit and merged in groups while bisecting on the group size, so the
+    data is scanned once. First and last rows are always kept; spikes
+    survive because every bucket extreme is drawn.
+    """
+    y = _as_matrix(y)
+    n, n_channels = y.shape
+    if n <= target_points:
+        return np.arange(n)
+    budget = max(1, int(target_points) - 2)
+    lows, low_values, highs, high_values = _bucket_extremes(y, max(1, budget // 2))
+
+    def picked(group: int) -> np.ndarray:
+        merged_lows = _merge_buckets(lows, low_values, group, np.argmin)
+        merged_highs = _merge_buckets(highs, high_values, group, np.argmax)
+        return np.unique(np.concatenate(([0, n - 1], merged_lows.ravel(), merged_highs.ravel())))
+
+    # Groups this large fit even if no two channels share an extreme.
+    smallest, largest = 1, max(1, -(-len(lows) // max(1, budget // (2 * n_channels))))
+    best = picked(largest)
+    while smallest < largest:
+        group = (smallest + largest) // 2
+        candidate = picked(group)
+        if len(candidate) <= target_points:
+            largest, best = group, candidate
+        else:
+            smallest = group + 1
+    return best
+
+
+def _bucket_extremes(y: np.ndarray, n_buckets: int) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Per bucket and channel: (argmin rows, min values, argmax rows, max values)."""
+    n, n_channels = y.shape
+    size = -(-n // n_buckets)
+    n_buckets = -(-n // size)
+    padded = np.empty((n_buckets * size, n_channels), dtype=y.dtype)
+    padded[:n] = y
+    padded[n:] = y[-1]
+    blocks = padded.reshape(n_buckets, size, n_channels)
+    offsets = (np.arange(n_buckets) * size)[:, None]
+    low_at = blocks.argmin(axis=1)
+    high_at = blocks.argmax(axis=1)
+    low_values = np.take_along_axis(blocks, low_at[:, None, :], axis=1)[:, 0, :]
+    high_values = np.take_along_axis(blocks, high_at[:, None, :], axis=1)[:, 0, :]
+    return (
+        np.minimum(low_at + offsets, n - 1),
+        low_values,
+        np.minimum(high_at + offsets, n - 1),
+        high_values,
+    )
+
+
+def _merge_buckets(rows: np.ndarray, values: np.ndarray, group: int, pick: Any) -> np.ndarray:
+    """Rows of the extreme (per `pick`) over each run of `group` buckets."""
+    if group == 1:
+        return rows
+    n_buckets, n_channels = rows.shape
+    merged = -(-n_buckets // group)
+    pad = merged * group - n_buckets
+    if pad:
+        rows = np.concatenate((rows, np.repeat(rows[-1:], pad, axis=0)))
+        values = np.concatenate((values, np.repeat(values[-1:], pad, axis=0)))
+    at = pick(values.reshape(merged, group, n_channels), axis=1)
+    return np.take_along_axis(rows.reshape(merged, group, n_channels), at[:, None, :], axis=1)[:, 0, :]
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, target_points: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets selection of `target_points` rows.
+
+    For multi-channel input the triangle areas are summed over channels, so
+    one shared set of rows represents all traces.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = _as_matrix(y).astype(np.float64, copy=False)
+    n = len(x)
+    target_points = int(target_points)
+    if n <= target_points or target_points < 3:
+        return np.arange(n) if n <= target_points else np.array([0, n - 1])
+
+    edges = np.linspace(1, n - 1, target_points - 1).astype(np.int64)
+    picked = np.empty(target_points, dtype=np.int64)
+    picked[0] = 0
+    picked[-1] = n - 1
+    previous = 0
+    for bucket in range(target_points - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            next_start, next_stop = edges[bucket + 1], edges[bucket + 2]
+        else:
+            next_start, next_stop = n - 1, n
+        avg_x = x[next_start:next_stop].mean()
+        avg_y = y[next_start:next_stop].mean(axis=0)
+        area = np.abs(
+            (x[previous] - avg_x) * (y[start:stop] - y[previous])
+            - (x[previous] - x[start:stop])[:, None] * (avg_y - y[previous])
+        ).sum(axis=1)
+        previous = start + int(area.argmax())
+        picked[bucket + 1] = previous
+    return picked
+
+
+def decimate_indices(
+    x: np.ndarray,
+    y: np.ndarray,
+    target_points: int,
+    method: DecimationMethod = "minmax",
+) -> np.ndarray:
+    if method == "minmax":
+        return minmax_indices(y, target_points)
+    if method == "lttb":
+        return lttb_indices(x, y, target_points)
+    raise ValueError(f"Unknown decimation method: {method}")
+
+
+def decimate_views(
+    x: np.ndarray,
+    views: Mapping[str, np.ndarray],
+    target_points: int | None,
+    method: DecimationMethod = "minmax",
+) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+    """
+    Reduce the signal views to at most `target_points` rows, all on one
+    shared set of rows (so every view keeps the same x grid): the extremes
+    of every view's channels for "minmax", and triangle areas summed over
+    the views, each scaled to unit range, for "lttb".
+    """
+    matrices = {name: _as_matrix(matrix) for name, matrix in views.items()}
+    if not target_points or len(x) <= target_points or not matrices:
+        return {name: (x, matrix) for name, matrix in views.items()}
+    if any(len(matrix) != len(x) for matrix in matrices.values()):
+        raise ValueError("Signal views must have one row per x value.")
+
+    if method == "lttb":
+        # Raw microvolts would otherwise outweigh the band views.
+        combined = np.hstack([_unit_range(matrix) for matrix in matrices.values()])
+    else:
+        combined = np.hstack(list(matrices.values()))
+    keep = decimate_indices(x, combined, target_points, method)
+    return {name: (x[keep], np.asarray(matrix)[keep]) for name, matrix in views.items()}
+
+
+def _unit_range(matrix: np.ndarray) -> np.ndarray:
+    matrix = matrix.astype(np.float64, copy=False)
+    span = np.ptp(matrix, axis=0)
+    return (matrix - matrix.min(axis=0)) / np.where(span > 0, span, 1.0)
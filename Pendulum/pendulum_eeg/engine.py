@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import bisect
 import csv
 import json
 import threading
@@ -7,19 +8,50 @@ import time
 from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Sequence
+from typing import Any, Callable
 
 import numpy as np
 
-from .analysis import BANDS, SIGNAL_VIEW_ORDER, build_signal_views, compute_band_metrics
+from .analysis import (
+    BANDS,
+    FILTERED_VIEWS,
+    SIGNAL_VIEW_ORDER,
+    SlidingWelchPSD,
+    StreamingFilterBank,
+    band_metrics_from_powers,
+    build_signal_views,
+    compute_band_metrics,
+    normalize_views,
+)
+from .decimation import DecimationMethod, decimate_views
 from .firmware_protocol import (
+    CHANNEL_COUNT,
     PROTO_VER,
+    SAMPLE_DTYPE,
+    DecodedBatch,
+    FrameParser,
     Packet,
-    ProtocolError,
-    counts_to_microvolts,
-    decode_frame,
+    decode_frames_batch,
+    microvolts_per_count,
+    sample_counts,
+    sample_packets_to_array,
 )
 from .models import ErrorPacket, EventPacket, SamplePacket, SampleRecord
+from .payload import PayloadFormat, encode_view, payload_nbytes
+from .pyramid import MinMaxPyramid, aggregate_blocks, envelope_series
+from .clock_sync import ClockSync, CounterUnwrapper, corrected_host_times
+from .perf_stats import StageTimer, TimedLock
+from .raw_capture import RAW_CAPTURE_SUFFIX, RawCapture, RawCaptureWriter
+from .ring_buffer import ColumnarRingBuffer
+from .spsc_queue import SpscQueue
+from .shared_ring import SharedSampleRing
+from .subscription import OverflowPolicy, Subscription
+from .session_archive import (
+    ARCHIVE_DTYPE,
+    SessionArchive,
+    archive_export_columns,
+    archive_microvolts,
+)
 from .simulator import EEGSimulator
 
 try:
@@ -49,26 +81,147 @@ class EngineConfig:
     baud: int = 921_600
     history_seconds: int = 20 * 60
     metrics_window_seconds: float = 8.0
-    metrics_update_period_seconds: float = 0.5
+    # Metrics are republished every hop; the Welch average itself changes
+    # once per half segment (nperseg // 2 samples) and is reused in between.
+    metrics_update_period_seconds: float = 0.1
+    archive_dir: str | None = None
+    archive_chunk_samples: int = 4096
+    view_history_samples: int = 20_000
+    zero_phase_views: bool = False
+    # Parsed blocks buffered between the serial reader and the DSP thread.
+    rx_queue_blocks: int = 256
+    # Band views are only filtered while some client asked for them within
+    # this many seconds (lazy_views=False filters every band all the time).
+    lazy_views: bool = True
+    view_idle_seconds: float = 5.0
+    # Simulated time per wall-clock second; 0 runs as fast as possible.
+    simulate_speed: float = 1.0
+    simulate_seed: int | None = None
+    # Capture seconds per wall-clock second for start(replay=...); 0 = unthrottled.
+    replay_speed: float = 1.0
+
+
+@dataclass(slots=True)
+class _RxBlock:
+    """One serial read, parsed on the reader thread."""
+
+    rx_bytes: int
+    lines: list[str]
+    overflows: int
+    batch: DecodedBatch | None
+    parsed_ns: int = 0
+    # Host time the serial read returned.
+    received_s: float = 0.0
+
+
+def history_columns(n_channels: int = CHANNEL_COUNT) -> dict[str, tuple[type, tuple[int, ...]]]:
+    """
+    Column layout of the in-memory sample history (36 bytes/sample at 4
+    channels). sample_index and t_us are unwrapped to int64, so they keep
+    increasing past the firmware's uint32 wrap (t_us: ~71.6 minutes).
+    Only raw counts are stored; microvolts are counts times the fixed
+    `microvolts_per_count` scale, applied on read (`EEGEngine._history_uv`).
+    """
+    return {
+        "sample_index": (np.int64, ()),
+        "t_us": (np.int64, ()),
+        "flags": (np.uint32, ()),
+        "counts": (np.int32, (n_channels,)),
+    }
+
+
+_SIMULATOR_MAX_BLOCK = 4_096
+# Newest sample-index gaps kept for get_gaps.
+_MAX_GAP_RECORDS = 100_000
+
+# serial_read includes the time spent waiting for bytes; rx_queue is how long
+# a parsed block waited for the processing thread.
+PERF_STAGES = (
+    "serial_read",
+    "decode",
+    "rx_queue",
+    "handle",
+    "metrics",
+    "snapshot",
+    "updates",
+    "lock_wait",
+    "lock_hold",
+)
+
+
+def _bands_mask(bands: tuple[str, ...]) -> int:
+    return sum(1 << i for i, name in enumerate(FILTERED_VIEWS) if name in bands)
+
+
+def _bands_from_mask(mask: int) -> tuple[str, ...]:
+    return tuple(name for i, name in enumerate(FILTERED_VIEWS) if mask >> i & 1)
+
+
+def _speed_label(speed: float) -> str:
+    return "as fast as possible" if speed == 0 else f"{speed:g}x"
 
 
 class EEGEngine:
     def __init__(self, config: EngineConfig | None = None) -> None:
         self.config = config or EngineConfig()
 
-        self._lock = threading.RLock()
+        self._perf = {stage: StageTimer() for stage in PERF_STAGES}
+        self._perf_started = time.monotonic()
+        self._lock = TimedLock(self._perf["lock_wait"], self._perf["lock_hold"])
         self._stop_event = threading.Event()
         self._thread: threading.Thread | None = None
         self._serial_port = None
 
         max_history = self.config.history_seconds * self.config.sample_rate_hz
-        self._history: deque[SampleRecord] = deque(maxlen=max_history)
-        self._archive: list[SampleRecord] = []
+        self._history = ColumnarRingBuffer(max(1, max_history), history_columns())
+        # min/max/mean buckets over the same span, for zooming out on the session.
+        self._pyramid = MinMaxPyramid(max(1, max_history), CHANNEL_COUNT)
+        # Band views are filtered as samples arrive and kept row-aligned with
+        # the tail of self._history.
+        self._filter_bank = StreamingFilterBank(self.config.sample_rate_hz, CHANNEL_COUNT)
+        sample_rate = float(self.config.sample_rate_hz)
+        self._welch = SlidingWelchPSD(
+            sample_rate,
+            CHANNEL_COUNT,
+            window_samples=max(16, int(self.config.metrics_window_seconds * sample_rate)),
+        )
+        self._view_history = ColumnarRingBuffer(
+            max(1, min(self.config.view_history_samples, max_history)),
+            {name: (np.float32, (CHANNEL_COUNT,)) for name in FILTERED_VIEWS},
+        )
+        archive_dir = (
+            Path(self.config.archive_dir)
+            if self.config.archive_dir
+            else self._export_root() / "sessions"
+        )
+        self._archive = SessionArchive(
+            archive_dir, chunk_records=self.config.archive_chunk_samples
+        )
         self._events: deque[dict[str, Any]] = deque(maxlen=2_000)
+        self._events_seq = 0
         self._parse_errors: deque[str] = deque(maxlen=300)
+        self._frame_parser = FrameParser()
+        self._rx_queue: SpscQueue[_RxBlock] = SpscQueue(max(1, self.config.rx_queue_blocks))
+        self._shared_ring: SharedSampleRing | None = None
+        self._raw_capture: RawCaptureWriter | None = None
+        # Band -> last time a snapshot/update asked for it; the processing
+        # thread keeps filtering exactly the recently requested bands.
+        self._view_requests: dict[str, float] = {}
+        self._streaming_bands: frozenset[str] = frozenset()
+        # Replaced, never mutated, so publishers can iterate it without the lock.
+        self._subscribers: tuple[Subscription, ...] = ()
 
         self._latest_metrics: dict[str, Any] = self._empty_metrics()
         self._latest_sample: SampleRecord | None = None
+        self._clock = ClockSync()
+        self._index_unwrapper = CounterUnwrapper()
+        self._t_us_unwrapper = CounterUnwrapper()
+        # Gaps in the unwrapped sample index, sorted: index of the first
+        # sample after the gap, and how many samples are missing before it.
+        self._gap_index: list[int] = []
+        self._gap_missing: list[int] = []
+        self._gaps_total = 0
+        self._samples_missing_total = 0
 
         self._running = False
         self._connected = False
@@ -76,6 +229,8 @@ class EEGEngine:
         self._port_name = ""
         self._status_message = "Idle"
         self._session_started_monotonic = 0.0
+        self._session_id = 0
+        self._session_base_index: int | None = None
 
         self._rx_bytes_total = 0
         self._packets_total = 0
@@ -83,6 +238,14 @@ class EEGEngine:
         self._events_total = 0
         self._errors_total = 0
 
+        # Bumped on every state change seen by get_snapshot; snapshots are
+        # memoized per argument tuple until it moves.
+        self._generation = 0
+        self._snapshot_cache: dict[tuple[Any, ...], dict[str, Any]] = {}
+        self._snapshot_cache_generation = -1
+        self._snapshot_cache_hits = 0
+        self._snapshot_cache_misses = 0
+
     @staticmethod
     def _empty_metrics() -> dict[str, Any]:
         return {
@@ -115,16 +278,33 @@ class EEGEngine:
     def reset_session(self) -> None:
         with self._lock:
             self._history.clear()
-            self._archive.clear()
+            self._pyramid.clear()
+            self._view_history.clear()
+            self._filter_bank.reset()
+            self._streaming_bands = frozenset()
+            self._welch.reset()
+            self._archive.reset()
+            if self._shared_ring is not None:
+                self._shared_ring.clear()
             self._events.clear()
             self._parse_errors.clear()
             self._latest_metrics = self._empty_metrics()
             self._latest_sample = None
+            self._clock = ClockSync()
+            self._index_unwrapper.reset()
+            self._t_us_unwrapper.reset()
+            self._gap_index.clear()
+            self._gap_missing.clear()
+            self._gaps_total = 0
+            self._samples_missing_total = 0
+            self._session_id += 1
+            self._session_base_index = None
             self._rx_bytes_total = 0
             self._packets_total = 0
             self._samples_total = 0
             self._events_total = 0
             self._errors_total = 0
+            self._generation += 1
 
     def start(
         self,
@@ -134,32 +314,44 @@ class EEGEngine:
         simulate: bool = False,
         auto_start_stream: bool = True,
         reset_data: bool = True,
+        replay: str | Path | None = None,
     ) -> bool:
+        """
+        Start acquisition from the serial `port`, the simulator, or (with
+        `replay`) a raw capture file fed through the same parser.
+        """
         with self._lock:
             if self._running:
                 return True
-            if reset_data:
-                self.reset_session()
-
-            self._stop_event.clear()
-            self._simulate = simulate
-            self._port_name = port or ""
-            if baud:
-                self.config.baud = int(baud)
-
-            self._running = True
-            self._connected = False
-            self._status_message = "Initializing..."
-            self._session_started_monotonic = time.monotonic()
-
-            target = (
-                self._run_simulator_loop
-                if simulate
-                else lambda: self._run_serial_loop(auto_start_stream=auto_start_stream)
-            )
+            if replay is not None:
+                port = str(replay)
+            self._begin_run(port=port, baud=baud, simulate=simulate, reset_data=reset_data)
+            if replay is not None:
+                target = lambda: self._run_replay_loop(Path(replay))
+            elif simulate:
+                target = self._run_simulator_loop
+            else:
+                target = lambda: self._run_serial_loop(auto_start_stream=auto_start_stream)
             self._thread = threading.Thread(target=target, daemon=True, name="PendulumEEGEngine")
             self._thread.start()
-            return True
+        self._publish_status()
+        return True
+
+    def _begin_run(self, *, port: str | None, baud: int | None, simulate: bool, reset_data: bool) -> None:
+        """Mark the engine as starting a new run. Caller holds the lock."""
+        if reset_data:
+            self.reset_session()
+            self.reset_perf_stats()
+        self._stop_event.clear()
+        self._simulate = simulate
+        self._port_name = port or ""
+        if baud:
+            self.config.baud = int(baud)
+        self._running = True
+        self._connected = False
+        self._status_message = "Initializing..."
+        self._session_started_monotonic = time.monotonic()
+        self._generation += 1
 
     def stop(self) -> None:
         with self._lock:
@@ -181,6 +373,17 @@ class EEGEngine:
             self._running = False
             self._connected = False
             self._status_message = "Stopped."
+            self._generation += 1
+        self.stop_raw_capture()
+        self._publish_status()
+
+    def close(self) -> None:
+        """
+        Stop acquisition, stop the session archive's writer thread and delete
+        its file. Export what you need first; exported files are kept.
+        """
+        self.stop()
+        self._archive.close(delete=True)
 
     def send_command(self, command: str) -> bool:
         cmd = command.strip()
@@ -200,61 +403,497 @@ class EEGEngine:
             self._push_parse_error(f"Failed to send command '{cmd}': {exc}")
             return False
 
-    def get_snapshot(self, max_points: int = 1_500, event_limit: int = 60) -> dict[str, Any]:
+    def start_raw_capture(self, path: str | Path | None = None) -> Path:
+        """
+        Tee every serial read (bytes plus read time) into a capture file
+        until `stop_raw_capture` or the end of the run. Replay it with
+        `start(replay=path)`.
+        """
+        target = (
+            Path(path)
+            if path
+            else self._ensure_export_dir() / "raw" / f"raw_{self._timestamp_slug()}{RAW_CAPTURE_SUFFIX}"
+        )
+        writer = RawCaptureWriter(target, sample_rate_hz=self.config.sample_rate_hz)
         with self._lock:
-            history_tail = list(self._history)[-max_points:]
-            base_index = history_tail[0].sample_index if history_tail else 0
+            previous, self._raw_capture = self._raw_capture, writer
+        if previous is not None:
+            previous.close()
+        self._push_event_line(f"Raw capture -> {target}")
+        return target
 
-            if history_tail:
-                sample_rate = float(self.config.sample_rate_hz)
-                x_values = np.array(
-                    [
-                        (sample.sample_index - base_index) / sample_rate
-                        for sample in history_tail
-                    ],
-                    dtype=np.float64,
-                )
-                matrix_uv = np.array(
-                    [[s.ch1_uv, s.ch2_uv, s.ch3_uv, s.ch4_uv] for s in history_tail],
-                    dtype=np.float64,
-                )
-                signal_views = build_signal_views(matrix_uv, sample_rate_hz=sample_rate)
+    def stop_raw_capture(self) -> Path | None:
+        with self._lock:
+            writer, self._raw_capture = self._raw_capture, None
+        if writer is None:
+            return None
+        writer.close()
+        self._push_event_line(f"Raw capture closed: {writer.bytes_written} bytes in {writer.chunks_written} reads.")
+        return writer.path
+
+    def subscribe(
+        self,
+        kinds: tuple[str, ...] = ("samples", "metrics", "events"),
+        *,
+        maxsize: int = 256,
+        overflow: OverflowPolicy = "drop_oldest",
+        callback: Callable[[dict[str, Any]], None] | None = None,
+    ) -> Subscription:
+        """
+        Push-based alternative to polling `get_snapshot`/`get_updates`.
+
+        Messages are published as data arrives: "samples" (one per block:
+        seq, sample_index, t_us, flags and uv rows), "metrics", "events"
+        and "status" (running/connected changes). Close the subscription
+        when done; with no subscribers publishing costs nothing.
+        """
+        subscription = Subscription(
+            kinds,
+            maxsize=maxsize,
+            overflow=overflow,
+            max_samples=self._history.capacity,
+            callback=callback,
+            on_close=self._unsubscribe,
+        )
+        with self._lock:
+            self._subscribers = (*self._subscribers, subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers = tuple(sub for sub in self._subscribers if sub is not subscription)
+
+    def _publish(self, kind: str, **data: Any) -> None:
+        subscribers = self._subscribers
+        if not subscribers:
+            return
+        message = {"kind": kind, "session": data.pop("session", self._session_id), **data}
+        for subscription in subscribers:
+            subscription.publish(message)
+
+    def _publish_status(self) -> None:
+        if not self._subscribers:
+            return
+        with self._lock:
+            fields = self._status_fields()
+        self._publish("status", **fields)
+
+    def attach_shared_ring(self, ring: SharedSampleRing | None) -> None:
+        """Mirror every sample block (raw + band views) into `ring`."""
+        with self._lock:
+            self._shared_ring = ring
+
+    def get_snapshot(
+        self,
+        max_points: int = 1_500,
+        event_limit: int = 60,
+        target_points: int | None = None,
+        decimation: DecimationMethod = "minmax",
+        payload_format: PayloadFormat = "rows",
+        views: tuple[str, ...] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Return the newest `max_points` rows, events and status as plain dicts.
+
+        `views` selects which of SIGNAL_VIEW_ORDER to build (default: all);
+        unrequested bands are neither filtered nor serialized and come back
+        as empty lists.
+
+        With `target_points`, each signal view is decimated to at most that
+        many rows ("minmax" keeps every bucket extreme, "lttb" keeps the
+        visually dominant points), so wide windows stay cheap to ship.
+
+        With `payload_format` "float32" or "int16", views are returned as
+        base64 columnar arrays in "signal_payloads" (see `payload.encode_view`)
+        instead of per-point dicts, and "payload_bytes" gives their size.
+
+        Plot "x" is seconds since the first sample of the session, as in
+        `get_updates` and `get_range`.
+
+        Snapshots are cached until new data arrives, so concurrent consumers
+        polling with the same arguments share one computation. The returned
+        dict is shared between callers and must be treated as read-only.
+        """
+        requested = normalize_views(views)
+        key = (int(max_points), int(event_limit), int(target_points or 0), decimation, payload_format, requested)
+        with self._lock:
+            self._note_view_request(requested)
+            if self._snapshot_cache_generation != self._generation:
+                self._snapshot_cache.clear()
+                self._snapshot_cache_generation = self._generation
+            cached = self._snapshot_cache.get(key)
+            if cached is not None:
+                self._snapshot_cache_hits += 1
+                return cached
+            self._snapshot_cache_misses += 1
+            started = time.perf_counter_ns()
+            snapshot = self._build_snapshot(*key)
+            self._perf["snapshot"].record_ns(time.perf_counter_ns() - started)
+            self._snapshot_cache[key] = snapshot
+            return snapshot
+
+    def get_range(
+        self,
+        t0: float = 0.0,
+        t1: float | None = None,
+        max_points: int = 2_000,
+        include_rows: bool = False,
+    ) -> dict[str, Any]:
+        """
+        Raw-signal envelope between session times `t0` and `t1` (seconds since
+        the first sample; None = now), with at most about `max_points` points.
+
+        Spans that fit are returned sample by sample ("level" 0); wider spans
+        come from the coarsest adequate pyramid level, one (min, max, mean)
+        bucket per 2**level samples, so the cost depends on `max_points`
+        rather than on the span. With `include_rows`, "plot_points" holds the
+        interleaved min/max envelope as chart rows.
+        """
+        sample_rate = float(self.config.sample_rate_hz)
+        max_buckets = max(1, int(max_points) // 2)
+        with self._lock:
+            total = self._history.total_written
+            oldest = total - len(self._history)
+            base = self._session_base_index or 0
+            # Times map to sample indices, and indices to ring positions by
+            # binary search, so gaps and wraps do not shift the window.
+            start = self._history.search("sample_index", base + int(np.floor(max(0.0, t0) * sample_rate)))
+            stop = (
+                total
+                if t1 is None
+                else self._history.search("sample_index", base + int(np.ceil(t1 * sample_rate)))
+            )
+            span = max(0, stop - start)
+            level = self._pyramid.level_for(span, max_buckets) if span > max_points else 0
+            group = 1 << level
+
+            if level >= self._pyramid.min_level:
+                lo, hi = self._pyramid.bucket_bounds(level)
+                first = max(lo, start // group)
+                buckets = self._pyramid.buckets(level, first, min(hi, -(-stop // group)))
+                low = buckets["min"].copy()
+                high = buckets["max"].copy()
+                mean = buckets["mean"].copy()
+                start = first * group
             else:
-                x_values = np.array([], dtype=np.float64)
-                signal_views = {
-                    key: np.zeros((0, 4), dtype=np.float64) for key in SIGNAL_VIEW_ORDER
-                }
+                # Finer than the stored levels: aggregate raw history directly.
+                start -= start % group
+                counts = self._history.rows(start, stop, ("counts",))["counts"]
+                # float32, like the pyramid levels.
+                raw = self._history_uv(counts[: len(counts) - len(counts) % group]).astype(np.float32)
+                if group > 1:
+                    low, high, mean = aggregate_blocks(raw, raw, raw, group)
+                else:
+                    low = high = mean = raw
+
+            if len(low):
+                positions = np.clip(start + np.arange(len(low)) * group, oldest, total - 1)
+                x = (self._history.at("sample_index", positions) - base) / sample_rate
+            else:
+                x = np.zeros(0, dtype=np.float64)
+
+        result: dict[str, Any] = {
+            "t0": float(x[0]) if len(x) else max(0.0, t0),
+            "t1": float(x[-1]) + group / sample_rate if len(x) else max(0.0, t0),
+            "level": level,
+            "bucket_samples": group,
+            "x": x,
+            "min": low,
+            "max": high,
+            "mean": mean,
+        }
+        if include_rows:
+            result["plot_points"] = self._matrix_to_plot_rows(
+                *envelope_series(x, low, high, group / sample_rate)
+            )
+        return result
+
+    def get_clock_stats(self) -> dict[str, Any]:
+        """
+        Device-to-host clock estimate: drift (ppm), residual jitter, and the
+        transport latency above the fastest delivery (p50/p99/max, ms).
+        """
+        with self._lock:
+            return self._clock.stats()
+
+    def get_perf_stats(self) -> dict[str, Any]:
+        """
+        Per-stage timing since the run started (or `reset_perf_stats`): count,
+        items (bytes read, frames decoded, samples handled, rows sent), total,
+        mean/p50/p90/p99/max microseconds and share of wall time.
+        """
+        elapsed_s = time.monotonic() - self._perf_started
+        return {
+            "elapsed_s": elapsed_s,
+            "stages": {stage: timer.summary(elapsed_s) for stage, timer in self._perf.items()},
+        }
+
+    def reset_perf_stats(self) -> None:
+        for timer in self._perf.values():
+            timer.reset()
+        self._perf_started = time.monotonic()
+
+    def get_gaps(self, t0: float = 0.0, t1: float | None = None, limit: int = 1_000) -> dict[str, Any]:
+        """
+        Sample-index gaps (dropped frames, missed DRDY) between session times
+        `t0` and `t1`, found by binary search: the oldest `limit` of them as
+        {"t", "sample_index", "missing"}, where "t" is the session time of
+        the first sample after the gap, plus the totals since the session began.
+        """
+        sample_rate = float(self.config.sample_rate_hz)
+        with self._lock:
+            base = self._session_base_index or 0
+            lo = bisect.bisect_left(self._gap_index, base + int(np.floor(max(0.0, t0) * sample_rate)))
+            hi = (
+                len(self._gap_index)
+                if t1 is None
+                else bisect.bisect_left(self._gap_index, base + int(np.ceil(t1 * sample_rate)))
+            )
+            shown = slice(lo, min(hi, lo + max(0, int(limit))))
+            gaps = [
+                {"t": (index - base) / sample_rate, "sample_index": index, "missing": missing}
+                for index, missing in zip(self._gap_index[shown], self._gap_missing[shown])
+            ]
+            return {
+                "gaps": gaps,
+                "in_range": max(0, hi - lo),
+                "gaps_total": self._gaps_total,
+                "samples_missing_total": self._samples_missing_total,
+            }
 
+    def get_snapshot_cache_stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "generation": self._generation,
+                "hits": self._snapshot_cache_hits,
+                "misses": self._snapshot_cache_misses,
+                "entries": len(self._snapshot_cache),
+            }
+
+    def _build_snapshot(
+        self,
+        max_points: int,
+        event_limit: int,
+        target_points: int,
+        decimation: DecimationMethod,
+        payload_format: PayloadFormat,
+        views: tuple[str, ...],
+    ) -> dict[str, Any]:
+        # Caller holds self._lock.
+        history_tail = self._history.tail(max_points, ("sample_index", "counts"))
+
+        if len(history_tail["counts"]):
+            sample_rate = float(self.config.sample_rate_hz)
+            sample_index = history_tail["sample_index"].astype(np.int64)
+            x_values = (sample_index - (self._session_base_index or 0)) / sample_rate
+            matrix_uv = self._history_uv(history_tail["counts"])
+            signal_views = self._signal_views(matrix_uv, views)
+        else:
+            x_values = np.array([], dtype=np.float64)
+            signal_views = {key: np.zeros((0, 4), dtype=np.float64) for key in views}
+
+        reduced = decimate_views(x_values, signal_views, target_points, decimation)
+        recent_events = list(self._events)[-event_limit:]
+        snapshot = self._status_fields()
+        snapshot["events"] = recent_events
+
+        if payload_format != "rows":
+            payloads = {key: encode_view(*series, payload_format) for key, series in reduced.items()}
+            snapshot["signal_payloads"] = payloads
+            snapshot["payload_bytes"] = payload_nbytes(payloads)
+            snapshot["plot_points"] = []
+            snapshot["signal_plot_points"] = {key: [] for key in SIGNAL_VIEW_ORDER}
+            return snapshot
+
+        signal_plot_points = {
+            key: self._matrix_to_plot_rows(*reduced[key]) if key in reduced else []
+            for key in SIGNAL_VIEW_ORDER
+        }
+        snapshot["plot_points"] = signal_plot_points["raw"]
+        snapshot["signal_plot_points"] = signal_plot_points
+        return snapshot
+
+    def get_updates(
+        self,
+        cursor: dict[str, int] | None = None,
+        max_points: int = 1_500,
+        event_limit: int = 60,
+        views: tuple[str, ...] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Append-only variant of `get_snapshot` (same `views` selection).
+
+        Returns only the samples (raw + band views) and events produced since
+        `cursor`, plus the current status/metrics and a new "cursor" to pass
+        on the next call. When the cursor is missing, from another session,
+        or too far behind, or a band view cannot be continued, "reset" is
+        True and the newest `max_points` rows are returned; the caller should
+        then replace its buffers instead of appending. Plot "x" is seconds
+        since the first sample of the session, as in `get_snapshot`, so rows
+        from consecutive calls line up.
+
+        A band that is not streaming yet comes with a reset. Its rows
+        are filtered over the same history span the stream's warm-up uses,
+        so they carry no start-up transient and the deltas that follow
+        continue them.
+        """
+        requested = normalize_views(views)
+        bands = tuple(name for name in requested if name != "raw")
+        started = time.perf_counter_ns()
+        with self._lock:
+            self._note_view_request(requested)
+            written = self._history.total_written
+            # Bands that have not been streamed so far cannot continue a delta,
+            # unless the caller already holds their (offline) rows and no new
+            # samples arrived since, e.g. on a stopped engine.
+            fresh_bands = tuple(name for name in bands if name not in self._streaming_bands)
+            delivered = _bands_from_mask(int(cursor.get("bands", 0))) if cursor else ()
+            reset = (
+                not cursor
+                or cursor.get("session") != self._session_id
+                or not 0 <= written - int(cursor.get("samples", -1)) <= max_points
+                or (
+                    bool(fresh_bands)
+                    and self._filter_bank.available
+                    and (
+                        written != int(cursor.get("samples", -1))
+                        or any(name not in delivered for name in fresh_bands)
+                    )
+                )
+            )
+            n_new = min(max_points, len(self._history)) if reset else written - int(cursor["samples"])
+
+            rows = self._history.tail(n_new, ("sample_index", "counts"))
+            sample_index = rows["sample_index"].astype(np.int64)
+            x_values = (sample_index - (self._session_base_index or 0)) / float(self.config.sample_rate_hz)
+            signal_views: dict[str, np.ndarray] = {}
+            if "raw" in requested:
+                signal_views["raw"] = self._history_uv(rows["counts"])
+            if self._filter_bank.available and bands:
+                streamed = tuple(
+                    name for name in bands if name not in fresh_bands and n_new <= len(self._view_history)
+                )
+                if streamed:
+                    signal_views.update(self._view_history.tail(n_new, streamed))
+                missing = tuple(name for name in bands if name not in streamed)
+                if missing and n_new:
+                    # Same causal filters as the stream, warmed up over the
+                    # span the stream's own warm-up refilters, then cut to
+                    # this window.
+                    warm = max(n_new, len(self._view_history))
+                    history_uv = self._history_uv(self._history.tail(warm, ("counts",))["counts"])
+                    bank = StreamingFilterBank(self.config.sample_rate_hz, CHANNEL_COUNT)
+                    for name, values in bank.process(history_uv, bands=missing).items():
+                        signal_views[name] = values[len(values) - n_new :]
             signal_plot_points = {
-                key: self._matrix_to_plot_rows(x_values, signal_views[key])
+                key: self._matrix_to_plot_rows(x_values, signal_views[key]) if key in signal_views else []
                 for key in SIGNAL_VIEW_ORDER
             }
-            plot_points = signal_plot_points["raw"]
 
-            latest_sample = self._latest_sample.as_export_row() if self._latest_sample else {}
-            recent_events = list(self._events)[-event_limit:]
+            events = self._events_since(None if reset else cursor, event_limit)
+
+            updates = self._status_fields()
+            updates.update(
+                {
+                    "reset": reset,
+                    "cursor": {
+                        "session": self._session_id,
+                        "samples": written,
+                        "events": self._events_seq,
+                        "bands": _bands_mask(bands),
+                    },
+                    "plot_points": signal_plot_points["raw"],
+                    "signal_plot_points": signal_plot_points,
+                    "events": events,
+                }
+            )
+        self._perf["updates"].record_ns(time.perf_counter_ns() - started, n_new)
+        return updates
 
-            return {
-                "running": self._running,
-                "connected": self._connected,
-                "simulate": self._simulate,
-                "port_name": self._port_name,
-                "status_message": self._status_message,
-                "sample_rate_hz": self.config.sample_rate_hz,
-                "proto_ver_expected": PROTO_VER,
-                "samples_total": self._samples_total,
-                "packets_total": self._packets_total,
-                "events_total": self._events_total,
-                "errors_total": self._errors_total,
-                "rx_bytes_total": self._rx_bytes_total,
-                "parse_error_count": len(self._parse_errors),
-                "parse_errors": list(self._parse_errors)[-20:],
-                "latest_sample": latest_sample,
-                "latest_metrics": dict(self._latest_metrics),
-                "plot_points": plot_points,
-                "signal_plot_points": signal_plot_points,
-                "events": recent_events,
-            }
+    def get_status(self, cursor: dict[str, int] | None = None, event_limit: int = 60) -> dict[str, Any]:
+        """Status, metrics and events since `cursor`, without any sample rows."""
+        with self._lock:
+            if cursor and cursor.get("session") != self._session_id:
+                cursor = None
+            status = self._status_fields()
+            status["events"] = self._events_since(cursor, event_limit)
+            status["cursor"] = {"session": self._session_id, "events": self._events_seq}
+            return status
+
+    def _events_since(self, cursor: dict[str, int] | None, event_limit: int) -> list[dict[str, Any]]:
+        # Caller holds self._lock. Without a cursor, the newest `event_limit`.
+        new_events = self._events_seq - int(cursor.get("events", 0)) if cursor else event_limit
+        new_events = max(0, min(new_events, event_limit, len(self._events)))
+        return list(self._events)[len(self._events) - new_events :]
+
+    def _status_fields(self) -> dict[str, Any]:
+        """Counters, status and metrics shared by snapshots and updates. Caller holds the lock."""
+        return {
+            "running": self._running,
+            "connected": self._connected,
+            "simulate": self._simulate,
+            "port_name": self._port_name,
+            "status_message": self._status_message,
+            "sample_rate_hz": self.config.sample_rate_hz,
+            "proto_ver_expected": PROTO_VER,
+            "samples_total": self._samples_total,
+            "packets_total": self._packets_total,
+            "events_total": self._events_total,
+            "errors_total": self._errors_total,
+            "rx_bytes_total": self._rx_bytes_total,
+            "parse_error_count": len(self._parse_errors),
+            "parse_errors": list(self._parse_errors)[-20:],
+            "latest_sample": self._latest_sample.as_export_row() if self._latest_sample else {},
+            "latest_metrics": dict(self._latest_metrics),
+            "rx_queue_depth": len(self._rx_queue),
+            "rx_queue_high_water": self._rx_queue.high_water,
+            "rx_queue_dropped": self._rx_queue.dropped,
+            "rx_samples_dropped": self._rx_queue.dropped_weight,
+            "subscribers": len(self._subscribers),
+            "raw_capture_path": str(self._raw_capture.path) if self._raw_capture else "",
+            "gaps_total": self._gaps_total,
+            "samples_missing_total": self._samples_missing_total,
+            "counter_restarts": self._index_unwrapper.restarts,
+        }
+
+    def _signal_views(self, matrix_uv: np.ndarray, views: tuple[str, ...]) -> dict[str, np.ndarray]:
+        """Requested views for the newest rows of history. Caller holds the lock."""
+        n_rows = matrix_uv.shape[0]
+        ring_ok = (
+            not self.config.zero_phase_views
+            and self._filter_bank.available
+            and n_rows <= len(self._view_history)
+        )
+        out: dict[str, np.ndarray] = {"raw": matrix_uv} if "raw" in views else {}
+        bands = [name for name in views if name != "raw"]
+        streamed = tuple(name for name in bands if ring_ok and name in self._streaming_bands)
+        if streamed:
+            out.update(self._view_history.tail(n_rows, streamed))
+        offline = tuple(name for name in bands if name not in streamed)
+        if offline:
+            # Offline zero-phase filtfilt over the whole window, only for these bands.
+            out.update(
+                build_signal_views(matrix_uv, sample_rate_hz=float(self.config.sample_rate_hz), views=offline)
+            )
+        return out
+
+    def _history_uv(self, counts: np.ndarray) -> np.ndarray:
+        """Microvolts (float64, a new array) for count rows read from history."""
+        return counts * microvolts_per_count(self.config.vref_uv, self.config.gain)
+
+    def _note_view_request(self, views: tuple[str, ...]) -> None:
+        # Caller holds self._lock.
+        now = time.monotonic()
+        for name in views:
+            if name != "raw":
+                self._view_requests[name] = now
+
+    def _wanted_bands(self) -> tuple[str, ...]:
+        # Caller holds self._lock.
+        if not self.config.lazy_views:
+            return FILTERED_VIEWS
+        cutoff = time.monotonic() - self.config.view_idle_seconds
+        return tuple(name for name in FILTERED_VIEWS if self._view_requests.get(name, -np.inf) >= cutoff)
 
     @staticmethod
     def _matrix_to_plot_rows(x_values: np.ndarray, matrix_uv: np.ndarray) -> list[dict[str, float]]:
@@ -279,6 +918,9 @@ class EEGEngine:
         }
         with self._lock:
             self._events.append(event)
+            self._events_seq += 1
+            self._generation += 1
+        self._publish("events", events=[event])
 
     def _push_parse_error(self, message: str) -> None:
         with self._lock:
@@ -290,94 +932,212 @@ class EEGEngine:
             self._connected = False
             self._running = False
             self._status_message = status_message
+            self._generation += 1
             if self._serial_port is not None:
                 try:
                     self._serial_port.close()
                 except Exception:
                     pass
                 self._serial_port = None
+        self.stop_raw_capture()
+        self._publish_status()
 
-    def _run_serial_loop(self, auto_start_stream: bool) -> None:
+    def _open_serial_port(self, timeout: float) -> Any | None:
+        """Open and register the configured port; finalizes and returns None on failure."""
         if serial is None:
             self._finalize_thread("pyserial is not installed.")
-            return
+            return None
         if not self._port_name:
             self._finalize_thread("Serial port was not provided.")
-            return
+            return None
 
         try:
             ser = serial.Serial(
                 port=self._port_name,
                 baudrate=self.config.baud,
-                timeout=0.05,
+                timeout=timeout,
                 write_timeout=0.5,
             )
         except Exception as exc:
             self._finalize_thread(f"Failed to open serial port {self._port_name}: {exc}")
-            return
+            return None
 
         with self._lock:
             self._serial_port = ser
             self._connected = True
             self._status_message = f"Connected to {self._port_name} @ {self.config.baud}"
-
+            self._generation += 1
+        self._publish_status()
         self._push_event_line(self._status_message)
+        return ser
+
+    def _start_processing_thread(self) -> tuple[SpscQueue[_RxBlock], threading.Event, threading.Thread]:
+        """Fresh rx queue plus the thread that drains it; set the event to stop it."""
+        self._frame_parser.reset()
+        rx_queue: SpscQueue[_RxBlock] = SpscQueue(max(1, self.config.rx_queue_blocks))
+        with self._lock:
+            self._rx_queue = rx_queue
+        reader_done = threading.Event()
+        processor = threading.Thread(
+            target=self._run_processing_loop,
+            args=(rx_queue, reader_done),
+            daemon=True,
+            name="PendulumEEGProcessing",
+        )
+        processor.start()
+        return rx_queue, reader_done, processor
+
+    def _run_serial_loop(self, auto_start_stream: bool) -> None:
+        ser = self._open_serial_port(timeout=0.05)
+        if ser is None:
+            return
         self._configure_firmware(ser, auto_start_stream=auto_start_stream)
 
-        rx_buffer = bytearray()
-        next_metrics_at = time.monotonic() + self.config.metrics_update_period_seconds
+        # This thread only reads and parses; history, archive, filters and
+        # metrics run on the processing thread so a slow DSP pass or a
+        # snapshot holding the lock cannot stall the port.
+        rx_queue, reader_done, processor = self._start_processing_thread()
 
+        error: Exception | None = None
         try:
             while not self._stop_event.is_set():
+                started = time.perf_counter_ns()
                 chunk = ser.read(4096)
-                if chunk:
-                    with self._lock:
-                        self._rx_bytes_total += len(chunk)
-                    rx_buffer.extend(chunk)
-                    self._consume_rx_bytes(rx_buffer)
-                else:
-                    time.sleep(0.002)
-
-                now = time.monotonic()
-                if now >= next_metrics_at:
-                    self._update_metrics_from_history()
-                    next_metrics_at = now + self.config.metrics_update_period_seconds
+                self._perf["serial_read"].record_ns(time.perf_counter_ns() - started, len(chunk))
+                if not chunk:
+                    continue
+                self._tee_raw(chunk)
+                self._queue_rx_block(rx_queue, self._parse_rx_bytes(chunk))
         except Exception as exc:
-            self._push_parse_error(f"Serial loop interrupted: {exc}")
-            self._finalize_thread(f"Serial loop interrupted: {exc}")
+            error = exc
+        finally:
+            reader_done.set()
+            processor.join(timeout=2.0)
+
+        if error is not None:
+            self._push_parse_error(f"Serial loop interrupted: {error}")
+            self._finalize_thread(f"Serial loop interrupted: {error}")
             return
-
         self._finalize_thread("Stopped.")
 
+    def _tee_raw(self, chunk: bytes) -> None:
+        writer = self._raw_capture
+        if writer is not None:
+            writer.write(chunk)
+
+    def _queue_rx_block(self, rx_queue: SpscQueue[_RxBlock], block: _RxBlock) -> None:
+        # Dropped samples are counted by the queue, on this (producer) thread.
+        rx_queue.put(block, weight=len(block.batch.samples) if block.batch is not None else 0)
+
+    def _run_processing_loop(self, rx_queue: SpscQueue[_RxBlock], reader_done: threading.Event) -> None:
+        next_metrics_at = time.monotonic() + self.config.metrics_update_period_seconds
+        while True:
+            block = rx_queue.get(timeout=0.05)
+            if block is not None:
+                self._perf["rx_queue"].record_ns(time.perf_counter_ns() - block.parsed_ns)
+                self._apply_rx_block(block)
+            elif reader_done.is_set():
+                return
+
+            now = time.monotonic()
+            if now >= next_metrics_at:
+                self._update_metrics_from_history()
+                next_metrics_at = now + self.config.metrics_update_period_seconds
+
     def _run_simulator_loop(self) -> None:
-        simulator = EEGSimulator(sample_rate_hz=self.config.sample_rate_hz)
+        rate = self.config.sample_rate_hz
+        simulator = EEGSimulator(
+            sample_rate_hz=rate,
+            seed=self.config.simulate_seed,
+            vref_uv=self.config.vref_uv,
+            gain=self.config.gain,
+        )
+        speed = max(0.0, float(self.config.simulate_speed))
         with self._lock:
             self._connected = True
-            self._status_message = "Simulation running."
+            self._status_message = "Simulation running." if speed == 1.0 else f"Simulation running ({_speed_label(speed)})."
+            self._generation += 1
+        self._publish_status()
         self._push_event_line("Simulator started.")
 
-        period = 1.0 / float(self.config.sample_rate_hz)
-        next_sample = time.perf_counter()
+        # Blocks are sized to a wall-clock tick, so real time costs one
+        # NumPy block per tick instead of one sleep per sample.
+        tick_s = 0.02
+        max_block = _SIMULATOR_MAX_BLOCK if speed == 0 else max(1, int(rate * speed * 0.25))
+        started = time.perf_counter()
+        produced = 0
         next_metrics_at = time.monotonic() + self.config.metrics_update_period_seconds
 
         while not self._stop_event.is_set():
-            packet = simulator.next_packet()
-            self._handle_packet(packet)
+            if speed == 0:
+                n_samples = max_block
+            else:
+                due = int((time.perf_counter() - started) * rate * speed) - produced
+                if due > max_block:
+                    # Fell behind (slow machine, debugger): skip ahead, do not burst.
+                    started = time.perf_counter() - produced / (rate * speed)
+                    due = max_block
+                n_samples = due
+            if n_samples > 0:
+                self._handle_sample_block(simulator.next_block(n_samples))
+                produced += n_samples
 
             now = time.monotonic()
             if now >= next_metrics_at:
                 self._update_metrics_from_history()
                 next_metrics_at = now + self.config.metrics_update_period_seconds
 
-            next_sample += period
-            sleep_s = next_sample - time.perf_counter()
-            if sleep_s > 0:
-                time.sleep(sleep_s)
-            else:
-                next_sample = time.perf_counter()
+            if speed > 0:
+                time.sleep(tick_s)
 
         self._finalize_thread("Simulation stopped.")
 
+    def _run_replay_loop(self, path: Path) -> None:
+        try:
+            capture = RawCapture(path)
+        except Exception as exc:
+            self._finalize_thread(f"Failed to open replay {path}: {exc}")
+            return
+        speed = max(0.0, float(self.config.replay_speed))
+        with self._lock:
+            self._connected = True
+            self._status_message = f"Replaying {path.name} ({_speed_label(speed)})."
+            self._generation += 1
+        self._publish_status()
+        self._push_event_line(f"Replay started: {path}")
+        if capture.sample_rate_hz and capture.sample_rate_hz != self.config.sample_rate_hz:
+            self._push_event_line(
+                f"Capture was recorded at {capture.sample_rate_hz} SPS, engine expects "
+                f"{self.config.sample_rate_hz} SPS.",
+                level="WARN",
+            )
+
+        # Same chunks, same parser, and host and metrics times from the
+        # capture: two replays of one file produce identical state
+        # regardless of speed.
+        self._frame_parser.reset()
+        with self._lock:
+            self._clock = ClockSync()
+        period = self.config.metrics_update_period_seconds
+        next_metrics_at = period
+        started = time.perf_counter()
+        for offset_s, chunk in capture.chunks():
+            if speed > 0:
+                wait_s = offset_s / speed - (time.perf_counter() - started)
+                if wait_s > 0 and self._stop_event.wait(wait_s):
+                    break
+            if self._stop_event.is_set():
+                break
+            self._consume_rx_bytes(chunk, capture.started_wall_s + offset_s)
+            if offset_s >= next_metrics_at:
+                self._update_metrics_from_history()
+                next_metrics_at = offset_s + period
+        else:
+            self._update_metrics_from_history()
+            self._finalize_thread("Replay finished.")
+            return
+        self._finalize_thread("Replay stopped.")
+
     def _configure_firmware(self, ser: Any, auto_start_stream: bool) -> None:
         try:
             ser.reset_input_buffer()
@@ -393,69 +1153,187 @@ class EEGEngine:
         except Exception as exc:
             self._push_parse_error(f"Failed to configure firmware: {exc}")
 
-    def _consume_rx_bytes(self, rx_buffer: bytearray) -> None:
-        # ASCII lines may appear during boot before BIN mode is enabled.
-        while True:
-            delimiter_idx = rx_buffer.find(0)
-            if delimiter_idx < 0:
-                newline_idx = rx_buffer.find(b"\n")
-                if newline_idx >= 0:
-                    line = bytes(rx_buffer[:newline_idx]).decode(errors="ignore").strip()
-                    del rx_buffer[: newline_idx + 1]
-                    if line:
-                        self._push_event_line(f"FW: {line}")
-                    continue
-                if len(rx_buffer) > 8192:
-                    self._push_parse_error("RX buffer without 0x00 delimiter. Clearing buffer.")
-                    rx_buffer.clear()
-                return
-
-            encoded = bytes(rx_buffer[:delimiter_idx])
-            del rx_buffer[: delimiter_idx + 1]
-            if not encoded:
-                continue
-
-            try:
-                packet = decode_frame(encoded)
-            except ProtocolError as exc:
-                self._push_parse_error(f"Invalid frame: {exc}")
-                continue
-            except Exception as exc:
-                self._push_parse_error(f"Unexpected error while decoding frame: {exc}")
-                continue
+    def _consume_rx_bytes(self, chunk: bytes, received_s: float | None = None) -> None:
+        """Parse and apply one chunk on the calling thread."""
+        self._apply_rx_block(self._parse_rx_bytes(chunk, received_s))
+
+    def _parse_rx_bytes(self, chunk: bytes, received_s: float | None = None) -> _RxBlock:
+        # Touches only the frame parser, never engine state or the lock.
+        if received_s is None:
+            received_s = time.time()
+        started = time.perf_counter_ns()
+        frames: list[memoryview] = []
+        lines: list[str] = []
+        overflows = 0
+        for kind, value in self._frame_parser.feed(chunk):
+            if kind == "frame":
+                frames.append(value)
+            elif kind == "line":
+                lines.append(value)
+            elif kind == "overflow":
+                overflows += 1
+        batch = decode_frames_batch(frames) if frames else None
+        parsed_ns = time.perf_counter_ns()
+        self._perf["decode"].record_ns(parsed_ns - started, len(frames))
+        return _RxBlock(
+            rx_bytes=len(chunk),
+            lines=lines,
+            overflows=overflows,
+            batch=batch,
+            parsed_ns=parsed_ns,
+            received_s=received_s,
+        )
 
+    def _apply_rx_block(self, block: _RxBlock) -> None:
+        with self._lock:
+            self._rx_bytes_total += block.rx_bytes
+            self._generation += 1
+        for line in block.lines:
+            self._push_event_line(f"FW: {line}")
+        for _ in range(block.overflows):
+            self._push_parse_error("RX buffer without 0x00 delimiter. Clearing buffer.")
+        if block.batch is not None:
+            self._handle_decoded_batch(block.batch, block.received_s)
+
+    def _handle_decoded_batch(self, batch: DecodedBatch, received_s: float | None = None) -> None:
+        for message in batch.failures:
+            self._push_parse_error(message)
+        for packet in (*batch.events, *batch.errors):
             self._handle_packet(packet)
-
-    def _handle_packet(self, packet: Packet) -> None:
-        now_s = time.time()
+        self._handle_sample_block(batch.samples, received_s)
+
+    def _handle_sample_block(self, samples: np.ndarray, received_s: float | None = None) -> None:
+        """
+        Append a SAMPLE_DTYPE block to history and archive under one lock.
+        `received_s` is when its serial read returned (default: now).
+        """
+        n_samples = len(samples)
+        if n_samples == 0:
+            return
+        started = time.perf_counter_ns()
+        now_s = received_s or time.time()
+        counts = sample_counts(samples)
+        uv = counts * microvolts_per_count(self.config.vref_uv, self.config.gain)
+        previous_index = self._index_unwrapper.last
+        sample_index = self._index_unwrapper.unwrap(samples["sample_index"])
+        t_us_restarts = self._t_us_unwrapper.restarts
+        t_us = self._t_us_unwrapper.unwrap(samples["t_us"])
+        steps = np.diff(sample_index, prepend=sample_index[0] - 1 if previous_index is None else previous_index)
+        gap_at = np.flatnonzero(steps > 1)
+        block = {
+            "sample_index": sample_index,
+            "t_us": t_us,
+            "flags": samples["flags"],
+            "counts": counts,
+        }
+        records = np.empty(n_samples, dtype=ARCHIVE_DTYPE)
+        for name in SAMPLE_DTYPE.names:
+            records[name] = samples[name]
+        records["host_timestamp_s"] = now_s
+
+        last = samples[-1]
+        last_uv = uv[-1].tolist()
+        latest = SampleRecord(
+            sample_index=int(last["sample_index"]),
+            t_us=int(last["t_us"]),
+            status24=int(last["status24"]),
+            ch1=int(last["ch1"]),
+            ch2=int(last["ch2"]),
+            ch3=int(last["ch3"]),
+            ch4=int(last["ch4"]),
+            ch1_uv=last_uv[0],
+            ch2_uv=last_uv[1],
+            ch3_uv=last_uv[2],
+            ch4_uv=last_uv[3],
+            flags=int(last["flags"]),
+            missed_drdy_frame=int(last["missed_drdy_frame"]),
+            recoveries_total=int(last["recoveries_total"]),
+            host_timestamp_s=now_s,
+        )
+        filtered = None
+        backfill = None
+        if self._filter_bank.available:
+            with self._lock:
+                wanted = self._wanted_bands()
+                warmup = tuple(name for name in wanted if name not in self._streaming_bands)
+                if warmup:
+                    view_start = self._history.total_written - len(self._view_history)
+                    raw_tail = self._history_uv(self._history.tail(len(self._view_history), ("counts",))["counts"])
+            if warmup:
+                # A band just became wanted: refilter the retained window so
+                # its view rows are valid, then continue from that state.
+                self._filter_bank.reset(warmup)
+                if len(raw_tail):
+                    backfill = self._filter_bank.process(raw_tail, bands=warmup)
+            # Bands nobody watches are neither filtered nor zero-filled; their
+            # view rows go stale until a warm-up refilters the window.
+            filtered = self._filter_bank.process(uv, bands=wanted) if wanted else {}
+        self._welch.update(uv)
         with self._lock:
-            self._packets_total += 1
+            seq = self._history.total_written
+            session = self._session_id
+            self._packets_total += n_samples
+            self._history.append(block)
+            self._pyramid.append(uv)
+            if filtered is not None:
+                if backfill:
+                    self._view_history.assign(view_start, backfill)
+                self._view_history.append(filtered, n_rows=n_samples)
+                self._streaming_bands = frozenset(wanted)
+            self._archive.append(records)
+            if self._shared_ring is not None:
+                self._shared_ring.write(
+                    {"raw": uv, **(filtered or {}), **block},
+                    views_available=filtered is not None and len(self._streaming_bands) == len(FILTERED_VIEWS),
+                )
+            self._latest_sample = latest
+            if self._t_us_unwrapper.restarts != t_us_restarts:
+                self._clock.reset()
+            self._clock.update(int(t_us[-1]), now_s)
+            if len(gap_at):
+                self._record_gaps(sample_index[gap_at], steps[gap_at] - 1)
+            self._samples_total += n_samples
+            if self._session_base_index is None:
+                self._session_base_index = int(sample_index[0])
+            self._generation += 1
+        self._publish(
+            "samples",
+            session=session,
+            seq=seq,
+            sample_index=block["sample_index"],
+            t_us=block["t_us"],
+            flags=block["flags"],
+            uv=uv,
+        )
+        self._perf["handle"].record_ns(time.perf_counter_ns() - started, n_samples)
+        if len(gap_at):
+            missing = steps[gap_at] - 1
+            self._push_event_line(
+                f"Sample gap: {int(missing.sum())} sample(s) missing in {len(gap_at)} gap(s), "
+                f"first before index {int(sample_index[gap_at[0]])}.",
+                level="WARN",
+            )
+
+    def _record_gaps(self, index_after: np.ndarray, missing: np.ndarray) -> None:
+        # Caller holds self._lock. Indices only grow, so appending keeps the lists sorted.
+        self._gap_index.extend(index_after.tolist())
+        self._gap_missing.extend(missing.tolist())
+        self._gaps_total += len(index_after)
+        self._samples_missing_total += int(missing.sum())
+        if len(self._gap_index) > _MAX_GAP_RECORDS:
+            drop = len(self._gap_index) - _MAX_GAP_RECORDS + _MAX_GAP_RECORDS // 10
+            del self._gap_index[:drop]
+            del self._gap_missing[:drop]
 
+    def _handle_packet(self, packet: Packet) -> None:
         if isinstance(packet, SamplePacket):
-            sample = SampleRecord(
-                sample_index=packet.sample_index,
-                t_us=packet.t_us,
-                status24=packet.status24,
-                ch1=packet.ch1,
-                ch2=packet.ch2,
-                ch3=packet.ch3,
-                ch4=packet.ch4,
-                ch1_uv=counts_to_microvolts(packet.ch1, self.config.vref_uv, self.config.gain),
-                ch2_uv=counts_to_microvolts(packet.ch2, self.config.vref_uv, self.config.gain),
-                ch3_uv=counts_to_microvolts(packet.ch3, self.config.vref_uv, self.config.gain),
-                ch4_uv=counts_to_microvolts(packet.ch4, self.config.vref_uv, self.config.gain),
-                flags=packet.flags,
-                missed_drdy_frame=packet.missed_drdy_frame,
-                recoveries_total=packet.recoveries_total,
-                host_timestamp_s=now_s,
-            )
-            with self._lock:
-                self._history.append(sample)
-                self._archive.append(sample)
-                self._latest_sample = sample
-                self._samples_total += 1
+            self._handle_sample_block(sample_packets_to_array((packet,)))
             return
 
+        with self._lock:
+            self._packets_total += 1
+            self._generation += 1
+
         if isinstance(packet, EventPacket):
             label = EVENT_CODE_NAMES.get(packet.event_code, "EVENT")
             msg = f"{label} code=0x{packet.event_code:02X} a={packet.a} b={packet.b} c={packet.c}"
@@ -473,25 +1351,45 @@ class EEGEngine:
             return
 
     def _update_metrics_from_history(self) -> None:
+        started = time.perf_counter_ns()
+        self._refresh_metrics()
+        self._perf["metrics"].record_ns(time.perf_counter_ns() - started)
+
+    def _refresh_metrics(self) -> None:
+        if self._welch.segment_count:
+            # Cached segment spectra; only segments completed since the last
+            # hop were transformed in _handle_sample_block.
+            metrics = band_metrics_from_powers(self._welch.band_powers())
+            with self._lock:
+                self._latest_metrics = metrics
+                self._generation += 1
+            self._publish("metrics", metrics=metrics)
+            return
+
+        # Fewer samples than one Welch segment: full recompute on what we have.
         with self._lock:
             window_size = int(self.config.metrics_window_seconds * self.config.sample_rate_hz)
             if window_size <= 0:
                 return
-            data = list(self._history)[-window_size:]
-            if not data:
+            # Scaling copies, so the window stays valid once the lock is released.
+            matrix = self._history_uv(self._history.tail(window_size, ("counts",))["counts"])
+            if matrix.shape[0] == 0:
                 self._latest_metrics = self._empty_metrics()
+                self._generation += 1
                 return
 
-        matrix = np.array(
-            [[s.ch1_uv, s.ch2_uv, s.ch3_uv, s.ch4_uv] for s in data],
-            dtype=np.float64,
-        )
         metrics = compute_band_metrics(matrix, sample_rate_hz=float(self.config.sample_rate_hz))
         with self._lock:
             self._latest_metrics = metrics
+            self._generation += 1
+        self._publish("metrics", metrics=metrics)
+
+    @staticmethod
+    def _export_root() -> Path:
+        return Path(__file__).resolve().parents[1] / "exports"
 
     def _ensure_export_dir(self) -> Path:
-        export_dir = Path(__file__).resolve().parents[1] / "exports"
+        export_dir = self._export_root()
         export_dir.mkdir(parents=True, exist_ok=True)
         return export_dir
 
@@ -499,14 +1397,16 @@ class EEGEngine:
     def _timestamp_slug() -> str:
         return time.strftime("%Y%m%d_%H%M%S")
 
-    def _copy_archive(self) -> Sequence[SampleRecord]:
-        with self._lock:
-            return list(self._archive)
+    def _read_archive(self) -> np.ndarray:
+        # Memory-mapped view of the session file; no engine lock is held while
+        # exporting because the archive is append-only.
+        records = self._archive.read()
+        if len(records) == 0:
+            raise ValueError("No samples available to export.")
+        return records
 
     def export_csv(self, path: str | Path | None = None) -> Path:
-        samples = self._copy_archive()
-        if not samples:
-            raise ValueError("No samples available to export.")
+        records = self._read_archive()
 
         if path is None:
             path = self._ensure_export_dir() / f"eeg_samples_{self._timestamp_slug()}.csv"
@@ -514,18 +1414,26 @@ class EEGEngine:
             path = Path(path)
             path.parent.mkdir(parents=True, exist_ok=True)
 
-        header = list(samples[0].as_export_row().keys())
+        corrected = corrected_host_times(records["t_us"], records["host_timestamp_s"])
+        chunk = 65_536
         with path.open("w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=header)
-            writer.writeheader()
-            for sample in samples:
-                writer.writerow(sample.as_export_row())
+            writer = csv.writer(f)
+            header_written = False
+            for start in range(0, len(records), chunk):
+                columns = archive_export_columns(
+                    records[start : start + chunk],
+                    self.config.vref_uv,
+                    self.config.gain,
+                    host_time_corrected_s=corrected[start : start + chunk],
+                )
+                if not header_written:
+                    writer.writerow(columns.keys())
+                    header_written = True
+                writer.writerows(zip(*(values.tolist() for values in columns.values())))
         return path
 
     def export_npz(self, path: str | Path | None = None) -> Path:
-        samples = self._copy_archive()
-        if not samples:
-            raise ValueError("No samples available to export.")
+        records = self._read_archive()
 
         if path is None:
             path = self._ensure_export_dir() / f"eeg_samples_{self._timestamp_slug()}.npz"
@@ -533,24 +1441,22 @@ class EEGEngine:
             path = Path(path)
             path.parent.mkdir(parents=True, exist_ok=True)
 
-        rows = [s.as_export_row() for s in samples]
+        columns = archive_export_columns(
+            records,
+            self.config.vref_uv,
+            self.config.gain,
+            host_time_corrected_s=corrected_host_times(records["t_us"], records["host_timestamp_s"]),
+        )
+        arrays = {
+            name: np.asarray(
+                values,
+                dtype=np.float64 if values.dtype.kind == "f" else np.int64,
+            )
+            for name, values in columns.items()
+        }
         np.savez_compressed(
             path,
-            sample_index=np.array([r["sample_index"] for r in rows], dtype=np.int64),
-            t_us=np.array([r["t_us"] for r in rows], dtype=np.int64),
-            status24=np.array([r["status24"] for r in rows], dtype=np.int64),
-            ch1=np.array([r["ch1"] for r in rows], dtype=np.int64),
-            ch2=np.array([r["ch2"] for r in rows], dtype=np.int64),
-            ch3=np.array([r["ch3"] for r in rows], dtype=np.int64),
-            ch4=np.array([r["ch4"] for r in rows], dtype=np.int64),
-            ch1_uv=np.array([r["ch1_uv"] for r in rows], dtype=np.float64),
-            ch2_uv=np.array([r["ch2_uv"] for r in rows], dtype=np.float64),
-            ch3_uv=np.array([r["ch3_uv"] for r in rows], dtype=np.float64),
-            ch4_uv=np.array([r["ch4_uv"] for r in rows], dtype=np.float64),
-            flags=np.array([r["flags"] for r in rows], dtype=np.int64),
-            missed_drdy_frame=np.array([r["missed_drdy_frame"] for r in rows], dtype=np.int64),
-            recoveries_total=np.array([r["recoveries_total"] for r in rows], dtype=np.int64),
-            host_timestamp_s=np.array([r["host_timestamp_s"] for r in rows], dtype=np.float64),
+            **arrays,
             sample_rate_hz=np.array([self.config.sample_rate_hz], dtype=np.int64),
         )
         return path
@@ -568,11 +1474,9 @@ class EEGEngine:
         return Path(path)
 
     def export_fif(self, path: str | Path | None = None) -> Path:
-        samples = self._copy_archive()
-        if not samples:
-            raise ValueError("No samples available to export.")
+        records = self._read_archive()
         try:
-            from .mne_tools import samples_to_mne_raw
+            from .mne_tools import microvolts_to_mne_raw
         except ImportError as exc:
             raise RuntimeError("mne is not installed. Install dependencies to export FIF.") from exc
 
@@ -582,6 +1486,10 @@ class EEGEngine:
             path = Path(path)
             path.parent.mkdir(parents=True, exist_ok=True)
 
-        raw = samples_to_mne_raw(samples=samples, sample_rate_hz=float(self.config.sample_rate_hz))
+        data_uv = archive_microvolts(records, self.config.vref_uv, self.config.gain)
+        # The mapping is not needed past this point; drop it before the slow
+        # save so the session file can be deleted meanwhile.
+        del records
+        raw = microvolts_to_mne_raw(data_uv, sample_rate_hz=float(self.config.sample_rate_hz))
         raw.save(str(path), overwrite=True, verbose="ERROR")
         return path
@@ -0,0 +1,476 @@
+from __future__ import annotations
+
+import argparse
+import errno
+import os
+import select
+import threading
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from .firmware_protocol import (
+    ADS_STATUS_HEADER_OK,
+    FLAG_DRDY_MISSED,
+    FLAG_RECOVERED,
+    FLAG_STREAMING,
+    FLAG_TX_OVERFLOW,
+    GAIN_DEFAULT,
+    PROTO_VER,
+    SAMPLE_DTYPE,
+    VREF_UV_DEFAULT,
+    FULL_SCALE_CODE,
+    encode_packet,
+    encode_sample_frames,
+)
+from .models import ErrorPacket, EventPacket
+from .simulator import synthetic_eeg_uv
+
+try:
+    import pty
+    import tty
+except ImportError:  # pragma: no cover - Windows
+    pty = None
+    tty = None
+
+
+SERIAL_BAUD = 921_600
+TX_RING_SIZE = 8_192  # firmware fw_tx.cpp
+MAX_SAMPLE_RATE_HZ = 16_000
+
+_TICK_S = 0.002
+_U32 = 0xFFFFFFFF
+
+
+@dataclass(slots=True)
+class EmulatorFaults:
+    """
+    Faults injected into the emitted stream (rates are per sample).
+
+    corrupt_rate: a frame gets one byte flipped (CRC or COBS failure on the host).
+    drdy_miss_rate: a DRDY edge is missed; like the firmware, sample_index keeps
+        counting but t_us jumps and the next sample carries FLAG_DRDY_MISSED.
+    tx_drop_rate: a whole packet is dropped by the TX queue, leaving a
+        sample_index gap and FLAG_TX_OVERFLOW on the next sample.
+    recovery_every_s: simulate a DRDY timeout this often: STREAM_STATE off,
+        error 0xE3, re-init, STREAM_STATE on with sample_index reset to 0.
+    """
+
+    corrupt_rate: float = 0.0
+    drdy_miss_rate: float = 0.0
+    tx_drop_rate: float = 0.0
+    recovery_every_s: float = 0.0
+
+
+@dataclass(slots=True)
+class _EmulatorStats:
+    sample_index: int = 0
+    samples_emitted: int = 0
+    frames_corrupted: int = 0
+    missed_drdy_total: int = 0
+    pending_missed: int = 0
+    tx_packets_dropped_total: int = 0
+    tx_bytes_dropped_total: int = 0
+    tx_max_queued_bytes: int = 0
+    recoveries_total: int = 0
+    pending_flags: int = 0
+
+
+class FirmwareEmulator:
+    """
+    EEGFrontier firmware stand-in on a pseudo-terminal.
+
+    `port` is the pty slave path to hand to `EEGEngine.start(port=...)`.
+    The emulator answers the firmware's text commands (STOP, START,
+    MODE BIN, INFO, STATS, PING, HELP, LOFF STATUS) with the same replies
+    and streams COBS/CRC sample, event and error packets at
+    `sample_rate_hz` (up to 16 kSPS) in real time. Output goes through a
+    TX queue of the firmware's size: when the host stops reading, whole
+    packets are dropped and flagged exactly like on the board.
+    """
+
+    def __init__(
+        self,
+        sample_rate_hz: int = 250,
+        *,
+        faults: EmulatorFaults | None = None,
+        seed: int | None = None,
+        amplitude_uv: float = 35.0,
+        vref_uv: int = VREF_UV_DEFAULT,
+        gain: int = GAIN_DEFAULT,
+        stream_on_open: bool = False,
+    ) -> None:
+        if pty is None:
+            raise RuntimeError("FirmwareEmulator needs a POSIX pseudo-terminal.")
+        if not 0 < sample_rate_hz <= MAX_SAMPLE_RATE_HZ:
+            raise ValueError(f"sample_rate_hz must be in (0, {MAX_SAMPLE_RATE_HZ}].")
+        self.sample_rate_hz = int(sample_rate_hz)
+        self.faults = faults or EmulatorFaults()
+        self.amplitude_uv = float(amplitude_uv)
+        self.vref_uv = int(vref_uv)
+        self.gain = int(gain)
+        self._rng = np.random.default_rng(seed)
+        self._master, self._slave = pty.openpty()
+        tty.setraw(self._slave)
+        os.set_blocking(self._master, False)
+        self.port = os.ttyname(self._slave)
+
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._stats = _EmulatorStats()
+        self._streaming = False
+        self._mode_bin = True
+        self._cmd_buf = bytearray()
+        self._tx = bytearray()
+        self._epoch = time.monotonic()
+        self._next_sample_at = 0.0
+        self._next_recovery_at = 0.0
+        if stream_on_open:
+            self._start_streaming()
+
+    def __enter__(self) -> FirmwareEmulator:
+        self.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    @property
+    def streaming(self) -> bool:
+        return self._streaming
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="FirmwareEmulator")
+        self._thread.start()
+
+    def close(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        for fd in (self._master, self._slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._master = self._slave = -1
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            s = self._stats
+            return {
+                "sample_index": s.sample_index,
+                "samples_emitted": s.samples_emitted,
+                "frames_corrupted": s.frames_corrupted,
+                "missed_drdy_total": s.missed_drdy_total,
+                "tx_packets_dropped_total": s.tx_packets_dropped_total,
+                "tx_bytes_dropped_total": s.tx_bytes_dropped_total,
+                "tx_queued_bytes": len(self._tx),
+                "recoveries_total": s.recoveries_total,
+            }
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            want_write = [self._master] if self._tx else []
+            try:
+                readable, _, _ = select.select([self._master], want_write, [], _TICK_S)
+            except (OSError, ValueError):
+                return
+            if readable:
+                self._read_commands()
+            if self._streaming:
+                self._emit_due()
+            if self._tx:
+                self._flush_tx()
+
+    def _read_commands(self) -> None:
+        try:
+            data = os.read(self._master, 4096)
+        except OSError as exc:
+            # EIO: no process has the slave open right now.
+            if exc.errno not in (errno.EIO, errno.EAGAIN):
+                raise
+            time.sleep(_TICK_S)
+            return
+        for byte in data:
+            if byte == 0x0D:
+                continue
+            if byte == 0x0A:
+                line = self._cmd_buf.decode("ascii", errors="replace").strip().upper()
+                self._cmd_buf.clear()
+                if line:
+                    self._handle_command(line)
+            elif len(self._cmd_buf) < 63:
+                self._cmd_buf.append(byte)
+            else:
+                self._cmd_buf.clear()
+                self._println("# ERR CMD_TOO_LONG")
+
+    def _flush_tx(self) -> None:
+        try:
+            written = os.write(self._master, self._tx)
+        except BlockingIOError:
+            return
+        except OSError as exc:
+            if exc.errno != errno.EIO:
+                raise
+            return
+        del self._tx[:written]
+
+    def _handle_command(self, cmd: str) -> None:
+        if cmd in ("HELP", "?"):
+            self._println(
+                "",
+                "EEGFrontier V1 commands:",
+                *(f"  {name}" for name in ("HELP", "INFO", "STATS", "START", "STOP", "MODE BIN", "LOFF STATUS", "PING")),
+                "",
+            )
+        elif cmd == "PING":
+            self._println("# PONG")
+        elif cmd == "INFO":
+            self._print_info()
+        elif cmd == "STATS":
+            self._print_stats()
+        elif cmd == "START":
+            self._start_streaming()
+        elif cmd == "STOP":
+            self._stop_streaming()
+        elif cmd == "MODE BIN":
+            if self._streaming:
+                self._stop_streaming()
+            self._mode_bin = True
+            self._println("# OK MODE BIN")
+        elif cmd == "MODE CSV":
+            self._println("# ERR CSV_DISABLED")
+        elif cmd == "LOFF STATUS":
+            self._print_loff()
+        else:
+            self._println(f"# ERR UNKNOWN_CMD {cmd}")
+
+    def _start_streaming(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._stats.sample_index = 0
+        self._streaming = True
+        self._next_sample_at = now
+        if self.faults.recovery_every_s > 0:
+            self._next_recovery_at = now + self.faults.recovery_every_s
+        self._emit_packet(EventPacket(PROTO_VER, 0x01, 1, 0, 0))
+
+    def _stop_streaming(self) -> None:
+        self._streaming = False
+        self._emit_packet(EventPacket(PROTO_VER, 0x01, 0, 0, 0))
+
+    def _now_us(self, at: float | None = None) -> int:
+        return int(((time.monotonic() if at is None else at) - self._epoch) * 1_000_000) & _U32
+
+    def _emit_due(self) -> None:
+        now = time.monotonic()
+        if self._next_recovery_at and now >= self._next_recovery_at:
+            self._recover(now)
+            return
+        period = 1.0 / self.sample_rate_hz
+        n = int((now - self._next_sample_at) / period) + 1
+        if n <= 0:
+            return
+        # After a long stall (e.g. the machine was suspended) do not burst
+        # seconds of backlog; the real ADC would simply have missed them.
+        n = min(n, max(1, self.sample_rate_hz // 10))
+        times = self._next_sample_at + np.arange(n) * period
+        self._next_sample_at = float(times[-1]) + period
+        self._emit_samples(times)
+
+    def _recover(self, now: float) -> None:
+        # The firmware declares a DRDY timeout after max(50 ms, 8 periods).
+        self._stop_streaming()
+        with self._lock:
+            recoveries = self._stats.recoveries_total
+        self._emit_packet(ErrorPacket(PROTO_VER, 0xE3, self._now_us(now), recoveries))
+        with self._lock:
+            self._stats.recoveries_total += 1
+            self._stats.pending_flags |= FLAG_RECOVERED
+        self._start_streaming()
+        self._next_sample_at = now + max(0.05, 8.0 / self.sample_rate_hz)
+
+    def _emit_samples(self, times: np.ndarray) -> None:
+        faults = self.faults
+        rng = self._rng
+        n = len(times)
+        missed = rng.random(n) < faults.drdy_miss_rate if faults.drdy_miss_rate > 0 else np.zeros(n, dtype=bool)
+        emitted_times = times[~missed]
+        with self._lock:
+            stats = self._stats
+            stats.missed_drdy_total += int(missed.sum())
+            # Missed edges are reported on the next sample that is read.
+            missed_so_far = np.cumsum(missed)[~missed]
+            m = len(emitted_times)
+            if m == 0:
+                stats.pending_missed += n
+                return
+            missed_before = np.diff(missed_so_far, prepend=0)
+            missed_before[0] += stats.pending_missed
+            stats.pending_missed = int(missed.sum() - missed_so_far[-1])
+            samples = np.zeros(m, dtype=SAMPLE_DTYPE)
+            samples["sample_index"] = (stats.sample_index + np.arange(m)) & _U32
+            stats.sample_index += m
+            samples["t_us"] = ((emitted_times - self._epoch) * 1_000_000).astype(np.int64) & _U32
+            samples["status24"] = ADS_STATUS_HEADER_OK
+            samples["flags"] = FLAG_STREAMING
+            samples["missed_drdy_frame"] = missed_before
+            samples["flags"][missed_before > 0] |= FLAG_DRDY_MISSED
+            samples["flags"][0] |= stats.pending_flags
+            stats.pending_flags = 0
+            samples["recoveries_total"] = stats.recoveries_total
+
+        counts = self._signal_counts(emitted_times)
+        for column, name in enumerate(("ch1", "ch2", "ch3", "ch4")):
+            samples[name] = counts[:, column]
+
+        if faults.tx_drop_rate > 0:
+            dropped = rng.random(m) < faults.tx_drop_rate
+            if dropped.any():
+                after = np.flatnonzero(dropped[:-1]) + 1
+                samples["flags"][after[~dropped[after]]] |= FLAG_TX_OVERFLOW
+                with self._lock:
+                    self._stats.tx_packets_dropped_total += int(dropped.sum())
+                    if dropped[-1]:
+                        self._stats.pending_flags |= FLAG_TX_OVERFLOW
+                samples = samples[~dropped]
+                if not len(samples):
+                    return
+
+        frames = encode_sample_frames(samples)
+        if faults.corrupt_rate > 0:
+            hit = np.flatnonzero(rng.random(len(frames)) < faults.corrupt_rate)
+            if len(hit):
+                # Never touch the delimiter, so frame boundaries survive.
+                columns = rng.integers(0, frames.shape[1] - 1, len(hit))
+                frames[hit, columns] ^= rng.integers(1, 256, len(hit)).astype(np.uint8)
+                with self._lock:
+                    self._stats.frames_corrupted += len(hit)
+        self._queue_tx(frames)
+        with self._lock:
+            self._stats.samples_emitted += len(frames)
+
+    def _signal_counts(self, times: np.ndarray) -> np.ndarray:
+        uv = synthetic_eeg_uv(times - self._epoch, self._rng, self.amplitude_uv)
+        scale = (self.gain * FULL_SCALE_CODE) / float(self.vref_uv)
+        return np.clip(uv * scale, -FULL_SCALE_CODE - 1, FULL_SCALE_CODE).astype(np.int32)
+
+    def _queue_tx(self, frames: np.ndarray) -> None:
+        """Append packets to the TX queue, dropping whole packets once it is full."""
+        free = TX_RING_SIZE - len(self._tx)
+        frame_len = frames.shape[1]
+        fits = min(len(frames), max(0, free // frame_len))
+        self._tx += frames[:fits].tobytes()
+        dropped = len(frames) - fits
+        with self._lock:
+            if dropped:
+                self._stats.tx_packets_dropped_total += dropped
+                self._stats.tx_bytes_dropped_total += dropped * frame_len
+                self._stats.pending_flags |= FLAG_TX_OVERFLOW
+            self._stats.tx_max_queued_bytes = max(self._stats.tx_max_queued_bytes, len(self._tx))
+
+    def _emit_packet(self, packet: EventPacket | ErrorPacket) -> None:
+        if not self._mode_bin:
+            return
+        data = encode_packet(packet)
+        if len(self._tx) + len(data) > TX_RING_SIZE:
+            with self._lock:
+                self._stats.tx_packets_dropped_total += 1
+                self._stats.tx_bytes_dropped_total += len(data)
+            return
+        self._tx += data
+
+    def _println(self, *lines: str) -> None:
+        data = "".join(f"{line}\r\n" for line in lines).encode("ascii")
+        if len(self._tx) + len(data) <= TX_RING_SIZE:
+            self._tx += data
+        self._flush_tx()
+
+    def _print_info(self) -> None:
+        s = self.stats()
+        period = 1_000_000 // self.sample_rate_hz
+        self._println(
+            "# EEGFrontier V1",
+            "firmware=emulator",
+            f"transport={'bin+cobs+crc16' if self._mode_bin else 'csv(debug)'}",
+            f"serial_baud={SERIAL_BAUD}",
+            f"sample_rate_sps={self.sample_rate_hz}",
+            f"drdy_expected_period_us={period}",
+            f"ads_vref_uv={self.vref_uv}",
+            f"ads_gain={self.gain}",
+            f"streaming={int(self._streaming)}",
+            "ads_ready=1",
+            f"recoveries_total={s['recoveries_total']}",
+            f"tx_bytes_dropped_total={s['tx_bytes_dropped_total']}",
+            f"tx_packets_dropped_total={s['tx_packets_dropped_total']}",
+            f"tx_queued_bytes={s['tx_queued_bytes']}",
+            f"missed_drdy_total={s['missed_drdy_total']}",
+            f"last_drdy_us={self._now_us()}",
+            "ads_id=62",
+        )
+
+    def _print_stats(self) -> None:
+        s = self.stats()
+        with self._lock:
+            max_queued = self._stats.tx_max_queued_bytes
+        self._println(
+            "# STATS",
+            f"sample_index={s['sample_index']}",
+            f"recoveries_total={s['recoveries_total']}",
+            "status_invalid_total=0",
+            "lead_off_any_total=0",
+            f"tx_bytes_dropped_total={s['tx_bytes_dropped_total']}",
+            f"tx_packets_dropped_total={s['tx_packets_dropped_total']}",
+            f"tx_queued_bytes={s['tx_queued_bytes']}",
+            f"tx_free_bytes={TX_RING_SIZE - s['tx_queued_bytes']}",
+            f"tx_max_queued_bytes={max_queued}",
+        )
+        self._print_loff()
+
+    def _print_loff(self) -> None:
+        self._println(f"# LOFF status24=0x{ADS_STATUS_HEADER_OK:X} p=0x0 n=0x0 header_ok=1")
+
+
+def add_emulator_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--rate", type=int, default=250, help="Sample rate in SPS (250..16000).")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--corrupt", type=float, default=0.0, help="Per-frame corruption probability.")
+    parser.add_argument("--drdy-miss", type=float, default=0.0, help="Per-sample missed DRDY probability.")
+    parser.add_argument("--tx-drop", type=float, default=0.0, help="Per-sample TX drop probability.")
+    parser.add_argument("--recover-every", type=float, default=0.0, help="Seconds between DRDY recoveries.")
+    parser.add_argument("--stream", action="store_true", help="Stream without waiting for START.")
+
+
+def run_emulator(args: argparse.Namespace) -> int:
+    faults = EmulatorFaults(
+        corrupt_rate=args.corrupt,
+        drdy_miss_rate=args.drdy_miss,
+        tx_drop_rate=args.tx_drop,
+        recovery_every_s=args.recover_every,
+    )
+    with FirmwareEmulator(args.rate, faults=faults, seed=args.seed, stream_on_open=args.stream) as emulator:
+        print(f"[emulator] {args.rate} SPS on {emulator.port} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(5.0)
+                print(f"[emulator] {emulator.stats()}")
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="EEGFrontier firmware emulator on a pseudo-terminal.")
+    add_emulator_arguments(parser)
+    return run_emulator(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import struct
-from typing import Union
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Literal, Sequence, Union
+
+import numpy as np
 
 from .models import ErrorPacket, EventPacket, SamplePacket
 
@@ -25,37 +28,128 @@ ADS_STATUS_HEADER_OK = 0xC00000
 VREF_UV_DEFAULT = 4_500_000
 GAIN_DEFAULT = 24
 FULL_SCALE_CODE = 8_388_607
+CHANNEL_COUNT = 4
 
 Packet = Union[SamplePacket, EventPacket, ErrorPacket]
+FrameKind = Literal["frame", "line", "overflow"]
 
 _SAMPLE_STRUCT = struct.Struct("<IIIiiiiIII")
 _EVENT_STRUCT = struct.Struct("<BIII")
 _ERROR_STRUCT = struct.Struct("<BII")
+_SAMPLE_RAW_SIZE = 2 + _SAMPLE_STRUCT.size + 2
+
+# Structured view of a SAMPLE payload; same little-endian layout as _SAMPLE_STRUCT.
+SAMPLE_DTYPE = np.dtype(
+    [
+        ("sample_index", "<u4"),
+        ("t_us", "<u4"),
+        ("status24", "<u4"),
+        ("ch1", "<i4"),
+        ("ch2", "<i4"),
+        ("ch3", "<i4"),
+        ("ch4", "<i4"),
+        ("flags", "<u4"),
+        ("missed_drdy_frame", "<u4"),
+        ("recoveries_total", "<u4"),
+    ]
+)
+CHANNEL_FIELDS = ("ch1", "ch2", "ch3", "ch4")
 
 
 class ProtocolError(RuntimeError):
     pass
 
 
+@dataclass(slots=True)
+class DecodedBatch:
+    samples: np.ndarray
+    events: list[EventPacket] = field(default_factory=list)
+    errors: list[ErrorPacket] = field(default_factory=list)
+    failures: list[str] = field(default_factory=list)
+
+
 def counts_to_microvolts(counts: int, vref_uv: int = VREF_UV_DEFAULT, gain: int = GAIN_DEFAULT) -> float:
     if gain == 0:
         return 0.0
     return (counts * float(vref_uv)) / (float(gain) * float(FULL_SCALE_CODE))
 
 
-def crc16_ccitt(data: bytes) -> int:
-    crc = 0xFFFF
-    for value in data:
-        crc ^= value << 8
+def microvolts_per_count(vref_uv: int = VREF_UV_DEFAULT, gain: int = GAIN_DEFAULT) -> float:
+    """Scale factor for vectorized conversion: ``uv = counts * microvolts_per_count()``."""
+    if gain == 0:
+        return 0.0
+    return float(vref_uv) / (float(gain) * float(FULL_SCALE_CODE))
+
+
+def _build_crc16_table() -> tuple[int, ...]:
+    table = []
+    for byte in range(256):
+        crc = byte << 8
         for _ in range(8):
             if crc & 0x8000:
                 crc = ((crc << 1) ^ 0x1021) & 0xFFFF
             else:
                 crc = (crc << 1) & 0xFFFF
+        table.append(crc)
+    return tuple(table)
+
+
+_CRC16_TABLE = _build_crc16_table()
+_CRC16_TABLE_NP = np.array(_CRC16_TABLE, dtype=np.uint16)
+_CRC_BATCH_MIN_ROWS = 32
+
+
+def crc16_ccitt(data: bytes) -> int:
+    """CRC16-CCITT (poly 0x1021, init 0xFFFF), same as firmware fw_utils crc16_ccitt()."""
+    crc = 0xFFFF
+    table = _CRC16_TABLE
+    for value in data:
+        crc = ((crc << 8) & 0xFFFF) ^ table[(crc >> 8) ^ value]
+    return crc
+
+
+def crc16_ccitt_batch(rows: np.ndarray) -> np.ndarray:
+    """
+    CRC16-CCITT of many equal-length messages at once.
+
+    rows: uint8 array of shape (n_messages, message_len). Returns uint16 (n_messages,).
+    """
+    rows = np.asarray(rows, dtype=np.uint8)
+    if rows.ndim != 2:
+        raise ValueError("crc16_ccitt_batch expects a 2D (n_messages, message_len) array.")
+    if rows.shape[0] < _CRC_BATCH_MIN_ROWS:
+        # Per-column NumPy calls only pay off once there are enough rows.
+        return np.array([crc16_ccitt(row.tobytes()) for row in rows], dtype=np.uint16)
+    crc = np.full(rows.shape[0], 0xFFFF, dtype=np.uint16)
+    for col in range(rows.shape[1]):
+        crc = (crc << 8) ^ _CRC16_TABLE_NP[(crc >> 8) ^ rows[:, col]]
     return crc
 
 
-def cobs_decode(encoded: bytes) -> bytes:
+def cobs_encode(data: bytes) -> bytes:
+    """COBS-encode `data` (no trailing delimiter), mirroring firmware cobsEncode()."""
+    out = bytearray(b"\x00")
+    code_idx = 0
+    code = 1
+    for value in data:
+        if value == 0:
+            out[code_idx] = code
+            code_idx = len(out)
+            out.append(0)
+            code = 1
+            continue
+        out.append(value)
+        code += 1
+        if code == 0xFF:
+            out[code_idx] = code
+            code_idx = len(out)
+            out.append(0)
+            code = 1
+    out[code_idx] = code
+    return bytes(out)
+
+
+def cobs_decode(encoded: bytes | memoryview) -> bytes:
     if not encoded:
         return b""
 
@@ -136,6 +230,230 @@ def parse_raw_packet(raw: bytes) -> Packet:
     raise ProtocolError(f"Unknown packet type: 0x{packet_type:02X}")
 
 
-def decode_frame(encoded_without_delimiter: bytes) -> Packet:
+def decode_frame(encoded_without_delimiter: bytes | memoryview) -> Packet:
     raw = cobs_decode(encoded_without_delimiter)
     return parse_raw_packet(raw)
+
+
+def decode_frames_batch(frames: Iterable[bytes | memoryview]) -> DecodedBatch:
+    """
+    Decode many COBS frames at once.
+
+    Sample packets are collected into one SAMPLE_DTYPE structured array built
+    with a single np.frombuffer call; events/errors come back as small packet
+    lists and undecodable frames as messages in `failures`.
+    """
+    sample_raws = bytearray()
+    n_samples = 0
+    events: list[EventPacket] = []
+    errors: list[ErrorPacket] = []
+    failures: list[str] = []
+
+    for frame in frames:
+        try:
+            raw = cobs_decode(frame)
+            if len(raw) == _SAMPLE_RAW_SIZE and raw[0] == PKT_SAMPLE:
+                # CRC of sample packets is validated below in one batch.
+                sample_raws += raw
+                n_samples += 1
+                continue
+            packet = parse_raw_packet(raw)
+        except ProtocolError as exc:
+            failures.append(f"Invalid frame: {exc}")
+            continue
+        except Exception as exc:
+            failures.append(f"Unexpected error while decoding frame: {exc}")
+            continue
+
+        if isinstance(packet, EventPacket):
+            events.append(packet)
+        elif isinstance(packet, ErrorPacket):
+            errors.append(packet)
+
+    rows = np.frombuffer(sample_raws, dtype=np.uint8).reshape(n_samples, _SAMPLE_RAW_SIZE)
+    calc_crc = crc16_ccitt_batch(rows[:, :-2])
+    recv_crc = rows[:, -2].astype(np.uint16) | (rows[:, -1].astype(np.uint16) << 8)
+    valid = calc_crc == recv_crc
+    if not valid.all():
+        for calc, recv in zip(calc_crc[~valid].tolist(), recv_crc[~valid].tolist()):
+            failures.append(
+                f"Invalid frame: Invalid CRC. expected=0x{calc:04X} received=0x{recv:04X}"
+            )
+        rows = rows[valid]
+    payloads = np.ascontiguousarray(rows[:, 2:-2])
+    samples = payloads.view(SAMPLE_DTYPE).reshape(len(payloads))
+    return DecodedBatch(samples=samples, events=events, errors=errors, failures=failures)
+
+
+def sample_packets_to_array(packets: Sequence[SamplePacket]) -> np.ndarray:
+    samples = np.empty(len(packets), dtype=SAMPLE_DTYPE)
+    for name in SAMPLE_DTYPE.names:
+        samples[name] = [getattr(p, name) for p in packets]
+    return samples
+
+
+def sample_counts(samples: np.ndarray) -> np.ndarray:
+    """Channel counts of a SAMPLE_DTYPE array as an (n_samples, n_channels) int32 matrix."""
+    return np.stack([samples[name] for name in CHANNEL_FIELDS], axis=1)
+
+
+def build_raw_packet(packet_type: int, payload: bytes, version: int = PROTO_VER) -> bytes:
+    body = bytes((packet_type & 0xFF, version & 0xFF)) + payload
+    return body + crc16_ccitt(body).to_bytes(2, "little")
+
+
+def encode_packet(packet: Packet) -> bytes:
+    """Encode a packet exactly as the firmware puts it on the wire: COBS(raw) + 0x00."""
+    if isinstance(packet, SamplePacket):
+        payload = _SAMPLE_STRUCT.pack(
+            packet.sample_index,
+            packet.t_us,
+            packet.status24,
+            packet.ch1,
+            packet.ch2,
+            packet.ch3,
+            packet.ch4,
+            packet.flags,
+            packet.missed_drdy_frame,
+            packet.recoveries_total,
+        )
+        raw = build_raw_packet(PKT_SAMPLE, payload, packet.version)
+    elif isinstance(packet, EventPacket):
+        payload = _EVENT_STRUCT.pack(packet.event_code, packet.a, packet.b, packet.c)
+        raw = build_raw_packet(PKT_EVENT, payload, packet.version)
+    elif isinstance(packet, ErrorPacket):
+        payload = _ERROR_STRUCT.pack(packet.error_code, packet.a, packet.b)
+        raw = build_raw_packet(PKT_ERROR, payload, packet.version)
+    else:
+        raise ProtocolError(f"Cannot encode object of type {type(packet).__name__}.")
+    return cobs_encode(raw) + b"\x00"
+
+
+def encode_sample_frames(samples: np.ndarray, version: int = PROTO_VER) -> np.ndarray:
+    """
+    Wire frames for a SAMPLE_DTYPE array, vectorized: uint8 (n_samples, frame_len).
+
+    Each row equals encode_packet() of the same sample. A raw sample packet
+    is shorter than 254 bytes, so COBS reduces to replacing every zero (and
+    a leading code byte) with the distance to the next zero.
+    """
+    samples = np.asarray(samples, dtype=SAMPLE_DTYPE)
+    n = len(samples)
+    raw = np.empty((n, _SAMPLE_RAW_SIZE), dtype=np.uint8)
+    raw[:, 0] = PKT_SAMPLE
+    raw[:, 1] = version & 0xFF
+    raw[:, 2:-2] = np.ascontiguousarray(samples).view(np.uint8).reshape(n, SAMPLE_DTYPE.itemsize)
+    crc = crc16_ccitt_batch(raw[:, :-2])
+    raw[:, -2] = crc & 0xFF
+    raw[:, -1] = crc >> 8
+
+    # next_zero[:, k]: first zero at or after raw position k (virtual zero at the end).
+    width = _SAMPLE_RAW_SIZE + 1
+    positions = np.where(raw == 0, np.arange(_SAMPLE_RAW_SIZE), _SAMPLE_RAW_SIZE)
+    next_zero = np.minimum.accumulate(positions[:, ::-1], axis=1)[:, ::-1]
+    next_zero = np.concatenate((next_zero, np.full((n, 1), _SAMPLE_RAW_SIZE)), axis=1)
+    frames = np.zeros((n, width + 1), dtype=np.uint8)
+    frames[:, 1:width] = raw
+    # Code bytes sit at frame position 0 and wherever raw[k - 1] == 0.
+    is_code = np.concatenate((np.ones((n, 1), dtype=bool), raw == 0), axis=1)
+    codes = next_zero - np.arange(width) + 1
+    frames[:, :width][is_code] = codes[is_code]
+    return frames
+
+
+_TEXT_CONTROL_BYTES = bytes(b for b in range(0x20) if b not in (0x09, 0x0A, 0x0D))
+_ENCODED_SAMPLE_SIZE = _SAMPLE_RAW_SIZE + 1  # COBS frame without its 0x00 delimiter
+_PACKET_TYPES = (PKT_SAMPLE, PKT_EVENT, PKT_ERROR)
+
+
+def _is_text(data: bytes) -> bool:
+    """True for printable ASCII lines; COBS frames start with a control byte."""
+    return data.isascii() and len(data.translate(None, _TEXT_CONTROL_BYTES)) == len(data)
+
+
+def _is_text_line(data: bytes, start: int, newline_idx: int) -> bool:
+    """
+    Whether ``data[start:newline_idx]`` is a text line rather than the head
+    of a binary frame. A COBS code byte can be TAB, LF or CR, but it is
+    followed by the packet type, so a line that does not start with a
+    printable character is only text if the next byte rules that out.
+    """
+    if not _is_text(data[start:newline_idx]):
+        return False
+    if 0x20 <= data[start] < 0x7F:
+        return True
+    return start + 1 < len(data) and data[start + 1] not in _PACKET_TYPES
+
+
+class FrameParser:
+    """
+    Incremental splitter for the serial byte stream.
+
+    `feed()` scans each chunk once with offset tracking and returns
+    ``(kind, value)`` items in stream order:
+
+    - ``("frame", memoryview)``: COBS-encoded frame without its 0x00 delimiter.
+    - ``("line", str)``: ASCII line (boot text, or command replies between frames).
+    - ``("overflow", int)``: bytes dropped because no delimiter arrived in time.
+
+    Frame views point into an immutable per-chunk buffer, so they stay valid
+    after later calls to `feed()`. Only the unterminated tail is carried over.
+    """
+
+    def __init__(self, max_pending: int = 8192) -> None:
+        self.max_pending = int(max_pending)
+        self._pending = b""
+
+    @property
+    def pending_bytes(self) -> int:
+        return len(self._pending)
+
+    def reset(self) -> None:
+        self._pending = b""
+
+    def feed(self, chunk: bytes | bytearray | memoryview) -> list[tuple[FrameKind, Any]]:
+        data = self._pending + bytes(chunk) if self._pending else bytes(chunk)
+        view = memoryview(data)
+        size = len(data)
+        offset = 0
+        items: list[tuple[FrameKind, Any]] = []
+
+        while offset < size:
+            delimiter_idx = data.find(0, offset)
+            if delimiter_idx < 0:
+                # ASCII lines may appear during boot before BIN mode is enabled.
+                newline_idx = data.find(b"\n", offset)
+                if newline_idx < 0:
+                    break
+                if not _is_text_line(data, offset, newline_idx):
+                    # 0x0A inside a partially received binary frame: wait for
+                    # its 0x00 delimiter instead of splitting it as text.
+                    break
+                line = data[offset:newline_idx].decode(errors="ignore").strip()
+                offset = newline_idx + 1
+                if line:
+                    items.append(("line", line))
+                continue
+
+            # Command replies are printed as text between binary frames. A
+            # full-length sample frame is never text, even if it holds 0x0A.
+            while delimiter_idx - offset != _ENCODED_SAMPLE_SIZE:
+                newline_idx = data.find(b"\n", offset, delimiter_idx)
+                if newline_idx < 0 or not _is_text_line(data, offset, newline_idx):
+                    break
+                text = data[offset:newline_idx].decode(errors="ignore").strip()
+                if text:
+                    items.append(("line", text))
+                offset = newline_idx + 1
+
+            if delimiter_idx > offset:
+                items.append(("frame", view[offset:delimiter_idx]))
+            offset = delimiter_idx + 1
+
+        remaining = size - offset
+        if remaining > self.max_pending:
+            items.append(("overflow", remaining))
+            self._pending = b""
+        else:
+            self._pending = data[offset:]
+        return items
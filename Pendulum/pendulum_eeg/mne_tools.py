@@ -20,6 +20,18 @@ def samples_to_mne_raw(
         [[s.ch1_uv, s.ch2_uv, s.ch3_uv, s.ch4_uv] for s in samples],
         dtype=np.float64,
     )
+    return microvolts_to_mne_raw(data_uv, sample_rate_hz, channel_names)
+
+
+def microvolts_to_mne_raw(
+    data_uv: np.ndarray,
+    sample_rate_hz: float,
+    channel_names: Sequence[str] = ("EEG1", "EEG2", "EEG3", "EEG4"),
+) -> mne.io.BaseRaw:
+    """data_uv: shape (n_samples, n_channels), unit in microvolts."""
+    if data_uv.ndim != 2 or data_uv.shape[0] == 0:
+        raise ValueError("No samples available to convert to MNE Raw.")
+
     data_v = (data_uv.T) * 1e-6
 
     info = mne.create_info(
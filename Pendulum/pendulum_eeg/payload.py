@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import base64
+from typing import Any, Literal, Mapping
+
+import numpy as np
+
+PayloadFormat = Literal["rows", "float32", "int16"]
+PAYLOAD_FORMATS: tuple[PayloadFormat, ...] = ("rows", "float32", "int16")
+
+_INT16_STEPS = 65534.0
+
+
+def _b64(array: np.ndarray) -> str:
+    return base64.b64encode(np.ascontiguousarray(array).tobytes()).decode("ascii")
+
+
+def encode_view(x: np.ndarray, matrix: np.ndarray, fmt: PayloadFormat = "float32") -> dict[str, Any]:
+    """
+    Pack one signal view as little-endian columnar arrays in base64.
+
+    "x" is stored as float32 offsets from "x0" (so long sessions keep
+    sub-sample precision) and "data" is channel-major (all of ch1, then ch2,
+    ...). For "int16", each channel is quantized over its own range and
+    value = q * scale[ch] + offset[ch].
+    """
+    x = np.asarray(x, dtype=np.float64)
+    matrix = np.asarray(matrix, dtype=np.float64)
+    if matrix.ndim == 1:
+        matrix = matrix[:, None]
+    n, n_channels = matrix.shape
+    x0 = float(x[0]) if n else 0.0
+    payload: dict[str, Any] = {
+        "format": fmt,
+        "n": n,
+        "channels": n_channels,
+        "x0": x0,
+        "x": _b64((x - x0).astype("<f4")),
+    }
+    columns = matrix.T
+    if fmt == "float32":
+        payload["data"] = _b64(columns.astype("<f4"))
+    elif fmt == "int16":
+        if n:
+            low = columns.min(axis=1)
+            high = columns.max(axis=1)
+        else:
+            low = high = np.zeros(n_channels)
+        offset = (high + low) / 2.0
+        scale = np.where(high > low, (high - low) / _INT16_STEPS, 1.0)
+        quantized = np.rint((columns - offset[:, None]) / scale[:, None])
+        payload["scale"] = scale.tolist()
+        payload["offset"] = offset.tolist()
+        payload["data"] = _b64(np.clip(quantized, -32767, 32767).astype("<i2"))
+    else:
+        raise ValueError(f"Unsupported payload format: {fmt}")
+    return payload
+
+
+def decode_view(payload: Mapping[str, Any]) -> tuple[np.ndarray, np.ndarray]:
+    """Inverse of `encode_view`: returns (x, (n, channels) matrix) as float64."""
+    n = int(payload["n"])
+    n_channels = int(payload["channels"])
+    x = np.frombuffer(base64.b64decode(payload["x"]), dtype="<f4").astype(np.float64) + float(payload["x0"])
+    raw = base64.b64decode(payload["data"])
+    if payload["format"] == "int16":
+        columns = np.frombuffer(raw, dtype="<i2").reshape(n_channels, n).astype(np.float64)
+        scale = np.asarray(payload["scale"], dtype=np.float64)[:, None]
+        offset = np.asarray(payload["offset"], dtype=np.float64)[:, None]
+        columns = columns * scale + offset
+    else:
+        columns = np.frombuffer(raw, dtype="<f4").reshape(n_channels, n).astype(np.float64)
+    return x, columns.T
+
+
+def payload_nbytes(payloads: Mapping[str, Mapping[str, Any]]) -> int:
+    """Approximate wire size of encoded views (base64 text plus small fields)."""
+    return sum(len(p["x"]) + len(p["data"]) + 96 for p in payloads.values())
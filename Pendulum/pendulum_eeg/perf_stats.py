@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+# Four buckets per power of two of nanoseconds: percentiles are reported at
+# the bucket's upper edge, within ~19% of the true value.
+_SUB_BITS = 2
+_SUB_BUCKETS = 1 << _SUB_BITS
+_MAX_EXPONENT = 42  # ~73 minutes
+_N_BUCKETS = (_MAX_EXPONENT + 1) * _SUB_BUCKETS
+
+
+def _bucket(ns: int) -> int:
+    if ns < _SUB_BUCKETS:
+        return max(0, ns)
+    exponent = min(ns.bit_length() - 1, _MAX_EXPONENT)
+    sub = (ns >> (exponent - _SUB_BITS)) & (_SUB_BUCKETS - 1)
+    return exponent * _SUB_BUCKETS + sub
+
+
+def _bucket_upper_ns(index: int) -> int:
+    exponent, sub = divmod(index, _SUB_BUCKETS)
+    if exponent < _SUB_BITS:
+        return index + 1
+    return (_SUB_BUCKETS + sub + 1) << (exponent - _SUB_BITS)
+
+
+class StageTimer:
+    """
+    Count, total, max and a log-bucketed histogram of one stage's durations.
+
+    `record_ns` is a few integer operations under an uncontended lock, cheap
+    enough to call per serial read or per sample block.
+    """
+
+    __slots__ = ("_lock", "_buckets", "count", "items", "total_ns", "max_ns")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._buckets = [0] * _N_BUCKETS
+        self.count = 0
+        self.items = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record_ns(self, ns: int, items: int = 1) -> None:
+        index = _bucket(ns)
+        with self._lock:
+            self._buckets[index] += 1
+            self.count += 1
+            self.items += items
+            self.total_ns += ns
+            if ns > self.max_ns:
+                self.max_ns = ns
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets = [0] * _N_BUCKETS
+            self.count = self.items = self.total_ns = self.max_ns = 0
+
+    def percentile_ns(self, q: float) -> int:
+        with self._lock:
+            buckets = list(self._buckets)
+            count = self.count
+            max_ns = self.max_ns
+        return _percentile(buckets, count, max_ns, q)
+
+    def summary(self, elapsed_s: float) -> dict[str, Any]:
+        with self._lock:
+            buckets = list(self._buckets)
+            count, items, total_ns, max_ns = self.count, self.items, self.total_ns, self.max_ns
+        busy_s = total_ns / 1e9
+        return {
+            "count": count,
+            "items": items,
+            "total_ms": total_ns / 1e6,
+            "mean_us": total_ns / count / 1e3 if count else 0.0,
+            "p50_us": _percentile(buckets, count, max_ns, 0.50) / 1e3,
+            "p90_us": _percentile(buckets, count, max_ns, 0.90) / 1e3,
+            "p99_us": _percentile(buckets, count, max_ns, 0.99) / 1e3,
+            "max_us": max_ns / 1e3,
+            # Items per second of time spent in the stage, and share of wall time.
+            "items_per_busy_s": items / busy_s if busy_s > 0 else 0.0,
+            "busy_fraction": busy_s / elapsed_s if elapsed_s > 0 else 0.0,
+        }
+
+
+def _percentile(buckets: list[int], count: int, max_ns: int, q: float) -> int:
+    if count == 0:
+        return 0
+    rank = max(1, int(round(q * count)))
+    seen = 0
+    for index, n in enumerate(buckets):
+        seen += n
+        if seen >= rank:
+            return min(_bucket_upper_ns(index), max_ns)
+    return max_ns
+
+
+class TimedLock:
+    """
+    Re-entrant lock that records how long threads wait for it and how long
+    the outermost holder keeps it. Drop-in for `threading.RLock` in `with`
+    statements.
+    """
+
+    __slots__ = ("_lock", "_depth", "_acquired_ns", "wait", "hold")
+
+    def __init__(self, wait: StageTimer, hold: StageTimer) -> None:
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._acquired_ns = 0
+        self.wait = wait
+        self.hold = hold
+
+    def __enter__(self) -> bool:
+        started = time.perf_counter_ns()
+        self._lock.acquire()
+        self._depth += 1
+        if self._depth == 1:
+            now = time.perf_counter_ns()
+            self._acquired_ns = now
+            self.wait.record_ns(now - started)
+        return True
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            self.hold.record_ns(time.perf_counter_ns() - self._acquired_ns)
+        self._lock.release()
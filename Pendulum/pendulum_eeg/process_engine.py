@@ -0,0 +1,463 @@
+from __future__ import annotations
+
+import atexit
+import dataclasses
+import itertools
+import multiprocessing as mp
+import threading
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+
+from .analysis import SIGNAL_VIEW_ORDER, normalize_views
+from .decimation import DecimationMethod, decimate_views
+from .payload import PayloadFormat, encode_view, payload_nbytes
+from .engine import EEGEngine, EngineConfig
+from .shared_ring import SharedSampleRing
+from .subscription import OverflowPolicy, Subscription
+
+# Engine methods the frontend process may call in the acquisition process.
+_REMOTE_METHODS = frozenset(
+    {
+        "start",
+        "stop",
+        "get_status",
+        "get_range",
+        "get_perf_stats",
+        "get_clock_stats",
+        "get_gaps",
+        "send_command",
+        "start_raw_capture",
+        "stop_raw_capture",
+        "export_csv",
+        "export_npz",
+        "export_fif",
+        "export_json_snapshot",
+    }
+)
+
+
+def _apply_config(engine: EEGEngine, config: EngineConfig) -> None:
+    """
+    Copy the parent's config into the child's engine. As with mutating
+    `EEGEngine.config`, run settings (speeds, seed, baud, metrics period)
+    apply from the next start; buffer sizes stay as constructed.
+    """
+    for field in dataclasses.fields(EngineConfig):
+        setattr(engine.config, field.name, getattr(config, field.name))
+    # Readers pick views from the ring, so every band is filtered here.
+    engine.config.lazy_views = False
+
+
+def _acquisition_main(conn: Any, ring_name: str, config: EngineConfig, push_conn: Any) -> None:
+    """Entry point of the acquisition process: an EEGEngine writing into the ring."""
+    ring = SharedSampleRing.attach(ring_name, readonly=False)
+    engine = EEGEngine(config)
+    _apply_config(engine, config)
+    engine.attach_shared_ring(ring)
+    push_lock = threading.Lock()
+    forward: Subscription | None = None
+
+    def push(message: dict[str, Any]) -> None:
+        # Events can be published from the RPC thread and the engine threads.
+        with push_lock:
+            push_conn.send(message)
+
+    try:
+        while True:
+            try:
+                request_id, method, args, kwargs = conn.recv()
+            except (EOFError, OSError):
+                break
+            if method == "shutdown":
+                conn.send((request_id, True, None))
+                break
+            if method == "forward":
+                # Subscribers live in the parent; one callback subscription
+                # here pushes the union of their kinds over push_conn.
+                if forward is not None:
+                    forward.close()
+                kinds = tuple(args[0])
+                forward = engine.subscribe(kinds, callback=push) if kinds else None
+                conn.send((request_id, True, None))
+                continue
+            if method == "configure":
+                _apply_config(engine, args[0])
+                conn.send((request_id, True, None))
+                continue
+            try:
+                if method not in _REMOTE_METHODS:
+                    raise AttributeError(f"Method not available remotely: {method}")
+                conn.send((request_id, True, getattr(engine, method)(*args, **kwargs)))
+            except Exception as exc:
+                conn.send((request_id, False, f"{type(exc).__name__}: {exc}"))
+    finally:
+        if forward is not None:
+            forward.close()
+        engine.close()
+        engine.attach_shared_ring(None)
+        ring.close()
+        conn.close()
+        push_conn.close()
+
+
+class ProcessEngine:
+    """
+    `EEGEngine` facade whose acquisition runs in a child process.
+
+    The child owns the serial port or simulator, filters and metrics, and
+    writes every sample block (raw + band views) into a `SharedSampleRing`.
+    This process maps the ring read-only, so plotting and JSON serialization
+    here never compete with acquisition for the GIL. Status, events,
+    commands and exports go through a pipe; `subscribe` messages arrive on
+    a second pipe only while someone is subscribed.
+    """
+
+    def __init__(self, config: EngineConfig | None = None) -> None:
+        self.config = config or EngineConfig()
+        self._lock = threading.Lock()
+        self._request_ids = itertools.count(1)
+        self._process: Any = None
+        self._conn: Any = None
+        self._ring: SharedSampleRing | None = None
+        self._push_conn: Any = None
+        self._push_thread: threading.Thread | None = None
+        self._subscribers: tuple[Subscription, ...] = ()
+        self._last_status: dict[str, Any] = {
+            "running": False,
+            "connected": False,
+            "status_message": "Idle",
+        }
+        self._base_session = -1
+        self._base_index = 0
+        atexit.register(self.close)
+
+    @property
+    def running(self) -> bool:
+        return bool(self.get_status(event_limit=0).get("running", False))
+
+    @property
+    def connected(self) -> bool:
+        return bool(self.get_status(event_limit=0).get("connected", False))
+
+    @property
+    def status_message(self) -> str:
+        return str(self.get_status(event_limit=0).get("status_message", ""))
+
+    def start(
+        self,
+        *,
+        port: str | None = None,
+        baud: int | None = None,
+        simulate: bool = False,
+        auto_start_stream: bool = True,
+        reset_data: bool = True,
+        replay: str | Path | None = None,
+    ) -> bool:
+        self._ensure_process()
+        # The child got a copy of the config when it was spawned; send the
+        # current one so changes made since (e.g. simulate_speed) apply.
+        self._call("configure", self.config)
+        return bool(
+            self._call(
+                "start",
+                port=port,
+                baud=baud,
+                simulate=simulate,
+                auto_start_stream=auto_start_stream,
+                reset_data=reset_data,
+                replay=replay,
+            )
+        )
+
+    def stop(self) -> None:
+        # The child keeps running (idle) so exports still work after a stop.
+        if self._alive():
+            self._call("stop")
+
+    def close(self) -> None:
+        """Shut down the acquisition process and release the shared ring."""
+        if self._alive():
+            try:
+                self._call("shutdown", timeout=5.0)
+            except Exception:
+                pass
+            self._process.join(timeout=3.0)
+            if self._process.is_alive():
+                self._process.terminate()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if self._push_thread is not None:
+            self._push_thread.join(timeout=1.0)
+            self._push_thread = None
+        if self._push_conn is not None:
+            self._push_conn.close()
+            self._push_conn = None
+        self._process = None
+        if self._ring is not None:
+            self._ring.close()
+            self._ring = None
+
+    def subscribe(
+        self,
+        kinds: tuple[str, ...] = ("samples", "metrics", "events"),
+        *,
+        maxsize: int = 256,
+        overflow: OverflowPolicy = "drop_oldest",
+        callback: Callable[[dict[str, Any]], None] | None = None,
+    ) -> Subscription:
+        """Same contract as `EEGEngine.subscribe`; messages are forwarded from the child."""
+        subscription = Subscription(
+            kinds,
+            maxsize=maxsize,
+            overflow=overflow,
+            max_samples=self._ring_capacity(),
+            callback=callback,
+            on_close=self._unsubscribe,
+        )
+        with self._lock:
+            self._subscribers = (*self._subscribers, subscription)
+        self._sync_forwarding()
+        return subscription
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers = tuple(sub for sub in self._subscribers if sub is not subscription)
+        self._sync_forwarding()
+
+    def _sync_forwarding(self) -> None:
+        if not self._alive():
+            return
+        kinds = sorted(set().union(*(sub.kinds for sub in self._subscribers)))
+        try:
+            self._call("forward", kinds)
+        except Exception:
+            pass
+
+    def _run_push_loop(self, push_conn: Any) -> None:
+        while True:
+            try:
+                message = push_conn.recv()
+            except (EOFError, OSError):
+                return
+            for subscription in self._subscribers:
+                subscription.publish(message)
+
+    def send_command(self, command: str) -> bool:
+        return bool(self._call("send_command", command)) if self._alive() else False
+
+    def start_raw_capture(self, path: str | Path | None = None) -> Path:
+        self._ensure_process()
+        return self._call("start_raw_capture", path)
+
+    def stop_raw_capture(self) -> Path | None:
+        return self._call("stop_raw_capture") if self._alive() else None
+
+    def export_csv(self, path: str | Path | None = None) -> Path:
+        return self._call("export_csv", path, timeout=600.0)
+
+    def export_npz(self, path: str | Path | None = None) -> Path:
+        return self._call("export_npz", path, timeout=600.0)
+
+    def export_fif(self, path: str | Path | None = None) -> Path:
+        return self._call("export_fif", path, timeout=600.0)
+
+    def export_json_snapshot(self, path: str | Path | None = None) -> Path:
+        return self._call("export_json_snapshot", path, timeout=60.0)
+
+    def get_status(self, cursor: dict[str, int] | None = None, event_limit: int = 60) -> dict[str, Any]:
+        if not self._alive():
+            status = dict(self._last_status)
+            status.update({"running": False, "connected": False, "events": [], "cursor": cursor or {}})
+            return status
+        status = self._call("get_status", cursor, event_limit)
+        self._last_status = {key: value for key, value in status.items() if key not in ("events", "cursor")}
+        return status
+
+    def get_gaps(self, t0: float = 0.0, t1: float | None = None, limit: int = 1_000) -> dict[str, Any]:
+        if not self._alive():
+            return {"gaps": [], "in_range": 0, "gaps_total": 0, "samples_missing_total": 0}
+        return self._call("get_gaps", t0, t1, limit)
+
+    def get_clock_stats(self) -> dict[str, Any]:
+        return self._call("get_clock_stats") if self._alive() else {"synced": False}
+
+    def get_perf_stats(self) -> dict[str, Any]:
+        """Stage timings of the acquisition process (snapshots built here are not included)."""
+        if not self._alive():
+            return {"elapsed_s": 0.0, "stages": {}}
+        return self._call("get_perf_stats")
+
+    def get_range(
+        self,
+        t0: float = 0.0,
+        t1: float | None = None,
+        max_points: int = 2_000,
+        include_rows: bool = False,
+    ) -> dict[str, Any]:
+        # The pyramid lives with the history in the acquisition process.
+        if not self._alive():
+            raise RuntimeError("Acquisition process is not running.")
+        return self._call("get_range", t0, t1, max_points, include_rows, timeout=30.0)
+
+    def get_snapshot(
+        self,
+        max_points: int = 1_500,
+        event_limit: int = 60,
+        target_points: int | None = None,
+        decimation: DecimationMethod = "minmax",
+        payload_format: PayloadFormat = "rows",
+        views: tuple[str, ...] | None = None,
+    ) -> dict[str, Any]:
+        requested = normalize_views(views)
+        snapshot = self.get_status(None, event_limit)
+        snapshot.pop("cursor", None)
+        ring = self._ring
+        if ring is None:
+            rows: dict[str, np.ndarray] = {}
+            x_values = np.array([], dtype=np.float64)
+        else:
+            session = ring.session
+            committed, rows = ring.tail(max_points, ("sample_index", *requested))
+            x_values = self._x_values(session, committed - len(rows["sample_index"]), rows)
+        if payload_format != "rows":
+            reduced = decimate_views(x_values, self._available_views(rows, requested), target_points, decimation)
+            payloads = {key: encode_view(*series, payload_format) for key, series in reduced.items()}
+            snapshot["signal_payloads"] = payloads
+            snapshot["payload_bytes"] = payload_nbytes(payloads)
+            snapshot["signal_plot_points"] = {key: [] for key in SIGNAL_VIEW_ORDER}
+        else:
+            snapshot["signal_plot_points"] = self._plot_rows(x_values, rows, requested, target_points, decimation)
+        snapshot["plot_points"] = snapshot["signal_plot_points"]["raw"]
+        return snapshot
+
+    def get_updates(
+        self,
+        cursor: dict[str, int] | None = None,
+        max_points: int = 1_500,
+        event_limit: int = 60,
+        views: tuple[str, ...] | None = None,
+    ) -> dict[str, Any]:
+        """Same contract as `EEGEngine.get_updates`; rows come from shared memory."""
+        requested = normalize_views(views)
+        ring = self._ring
+        session = ring.session if ring is not None else 0
+        reset = not cursor or cursor.get("session") != session
+        status_cursor = None
+        if not reset:
+            status_cursor = {"session": cursor.get("status_session", -1), "events": cursor.get("events", 0)}
+        status = self.get_status(status_cursor, event_limit)
+
+        rows: dict[str, np.ndarray] = {}
+        committed = 0
+        if ring is not None:
+            while True:
+                committed = ring.committed
+                if not reset and not 0 <= committed - int(cursor["samples"]) <= max_points:
+                    reset = True
+                start = committed - min(max_points, committed, ring.capacity) if reset else int(cursor["samples"])
+                read = ring.read(start, committed, ("sample_index", *requested))
+                if read is not None:
+                    rows = read
+                    break
+                reset = True
+            x_values = self._x_values(session, start, rows)
+        else:
+            x_values = np.array([], dtype=np.float64)
+
+        updates = status
+        updates["signal_plot_points"] = self._plot_rows(x_values, rows, requested)
+        updates["plot_points"] = updates["signal_plot_points"]["raw"]
+        updates["reset"] = reset
+        engine_cursor = status.get("cursor", {})
+        updates["cursor"] = {
+            "session": session,
+            "samples": committed,
+            "status_session": engine_cursor.get("session", -1),
+            "events": engine_cursor.get("events", 0),
+        }
+        return updates
+
+    def _x_values(self, session: int, start: int, rows: dict[str, np.ndarray]) -> np.ndarray:
+        """Seconds since the session's first sample, as `EEGEngine` reports x."""
+        if not len(rows.get("sample_index", ())):
+            return np.array([], dtype=np.float64)
+        if self._base_session != session:
+            # sample_index of the session's first row, so x lines up across calls.
+            self._base_session = session
+            self._base_index = int(rows["sample_index"][0]) - start
+        sample_index = rows["sample_index"].astype(np.int64)
+        return (sample_index - self._base_index) / float(self.config.sample_rate_hz)
+
+    def _plot_rows(
+        self,
+        x_values: np.ndarray,
+        rows: dict[str, np.ndarray],
+        views: tuple[str, ...],
+        target_points: int | None = None,
+        decimation: DecimationMethod = "minmax",
+    ) -> dict[str, list[dict[str, float]]]:
+        reduced = decimate_views(x_values, self._available_views(rows, views), target_points, decimation)
+        return {
+            key: EEGEngine._matrix_to_plot_rows(*reduced[key]) if key in reduced else []
+            for key in SIGNAL_VIEW_ORDER
+        }
+
+    def _available_views(self, rows: dict[str, np.ndarray], views: tuple[str, ...]) -> dict[str, np.ndarray]:
+        views_available = self._ring is not None and self._ring.views_available
+        return {
+            key: rows[key]
+            for key in views
+            if key in rows and (key == "raw" or views_available)
+        }
+
+    def _alive(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def _ensure_process(self) -> None:
+        if self._alive():
+            return
+        self.close()
+        self._ring = SharedSampleRing.create(self._ring_capacity(), readonly=True)
+        ctx = mp.get_context("spawn")
+        parent_conn, child_conn = ctx.Pipe()
+        push_recv, push_send = ctx.Pipe(duplex=False)
+        self._process = ctx.Process(
+            target=_acquisition_main,
+            args=(child_conn, self._ring.name, self.config, push_send),
+            daemon=True,
+            name="PendulumEEGAcquisition",
+        )
+        self._process.start()
+        child_conn.close()
+        push_send.close()
+        self._conn = parent_conn
+        self._push_conn = push_recv
+        self._push_thread = threading.Thread(
+            target=self._run_push_loop, args=(push_recv,), daemon=True, name="PendulumEEGPush"
+        )
+        self._push_thread.start()
+        if self._subscribers:
+            self._sync_forwarding()
+
+    def _ring_capacity(self) -> int:
+        return max(1, min(self.config.view_history_samples, self.config.history_seconds * self.config.sample_rate_hz))
+
+    def _call(self, method: str, *args: Any, timeout: float = 5.0, **kwargs: Any) -> Any:
+        with self._lock:
+            if self._conn is None:
+                raise RuntimeError("Acquisition process is not running.")
+            request_id = next(self._request_ids)
+            self._conn.send((request_id, method, args, kwargs))
+            while True:
+                if not self._conn.poll(timeout):
+                    raise TimeoutError(f"Acquisition process did not answer {method!r} in {timeout:.0f}s.")
+                reply_id, ok, value = self._conn.recv()
+                # Replies to calls that timed out earlier are discarded.
+                if reply_id == request_id:
+                    break
+        if not ok:
+            raise RuntimeError(value)
+        return value
@@ -8,16 +8,28 @@ import numpy as np
 import pyqtgraph as pg
 from pyqtgraph.Qt import QtCore, QtWidgets
 
-from .reflex_bridge import get_engine
+from .decimation import DECIMATION_METHODS, decimate_indices
+from .pyramid import envelope_series
+from .reflex_bridge import get_engine, use_process_engine
 
 
 class FocusMonitorWindow(QtWidgets.QMainWindow):
-    def __init__(self, points_window: int = 1500):
+    def __init__(
+        self,
+        points_window: int = 1500,
+        target_points: int = 2000,
+        decimation: str = "minmax",
+    ):
         super().__init__()
         self.setWindowTitle("Pendulum Focus Monitor (pyqtgraph)")
         self.resize(1450, 920)
         self._points_window = points_window
+        self._target_points = target_points
+        self._decimation = decimation
         self._engine = get_engine()
+        self._update_cursor: dict[str, int] | None = None
+        self._x = np.empty(0, dtype=np.float64)
+        self._y = np.empty((0, 4), dtype=np.float64)
 
         root = QtWidgets.QWidget()
         self.setCentralWidget(root)
@@ -40,7 +52,7 @@ class FocusMonitorWindow(QtWidgets.QMainWindow):
         self.raw_plot.showGrid(x=True, y=True, alpha=0.2)
         self.raw_plot.addLegend()
         self.raw_plot.setLabel("left", "uV")
-        self.raw_plot.setLabel("bottom", "Time (s) - Window")
+        self.raw_plot.setLabel("bottom", "Time (s) - Session")
         layout.addWidget(self.raw_plot, stretch=2)
 
         colors = ["#D62828", "#F77F00", "#003049", "#2A9D8F"]
@@ -51,6 +63,28 @@ class FocusMonitorWindow(QtWidgets.QMainWindow):
             "ch4_uv": self.raw_plot.plot(pen=pg.mkPen(colors[3], width=1.6), name="CH4"),
         }
 
+        # Whole-session overview from the engine's min/max pyramid; the
+        # region selects what the zoom plot shows.
+        zoom_row = QtWidgets.QHBoxLayout()
+        self.session_plot = pg.PlotWidget(title="Session overview (drag region to zoom)")
+        self.session_plot.showGrid(x=True, y=True, alpha=0.2)
+        self.session_plot.setLabel("bottom", "Time (s) - Session")
+        self.session_curves = [
+            self.session_plot.plot(pen=pg.mkPen(color, width=1.0)) for color in colors
+        ]
+        self._region = pg.LinearRegionItem(values=(0.0, 1.0))
+        self._region.sigRegionChangeFinished.connect(self._update_zoom)
+        self.session_plot.addItem(self._region)
+        zoom_row.addWidget(self.session_plot, stretch=1)
+
+        self.zoom_plot = pg.PlotWidget(title="Session zoom")
+        self.zoom_plot.showGrid(x=True, y=True, alpha=0.2)
+        self.zoom_plot.setLabel("bottom", "Time (s) - Session")
+        self.zoom_curves = [self.zoom_plot.plot(pen=pg.mkPen(color, width=1.2)) for color in colors]
+        zoom_row.addWidget(self.zoom_plot, stretch=1)
+        layout.addLayout(zoom_row, stretch=1)
+        self._overview_ticks = 0
+
         self.band_plot = pg.PlotWidget(title="Band Power (current window)")
         self.band_plot.showGrid(x=True, y=True, alpha=0.2)
         self.band_plot.setLabel("left", "Power")
@@ -119,7 +153,7 @@ class FocusMonitorWindow(QtWidgets.QMainWindow):
             self._set_message(f"Export error ({kind}): {exc}")
 
     def _copy_metrics_json(self) -> None:
-        snapshot = self._engine.get_snapshot(max_points=10)
+        snapshot = self._engine.get_snapshot(max_points=10, views=())
         payload = {
             "metrics": snapshot.get("latest_metrics", {}),
             "latest_sample": snapshot.get("latest_sample", {}),
@@ -130,8 +164,44 @@ class FocusMonitorWindow(QtWidgets.QMainWindow):
         QtWidgets.QApplication.clipboard().setText(as_json)
         self._set_message("Metrics copied to clipboard as JSON.")
 
+    def _get_range(self, t0: float, t1: float | None, max_points: int) -> tuple[np.ndarray, np.ndarray] | None:
+        try:
+            result = self._engine.get_range(t0, t1, max_points=max_points)
+        except Exception as exc:
+            self._set_message(f"Range error: {exc}")
+            return None
+        return envelope_series(
+            result["x"],
+            result["min"],
+            result["max"],
+            result["bucket_samples"] / float(self._engine.config.sample_rate_hz),
+        )
+
+    def _refresh_overview(self) -> None:
+        series = self._get_range(0.0, None, 1000)
+        if series is None or not len(series[0]):
+            return
+        x, y = series
+        for column, curve in enumerate(self.session_curves):
+            curve.setData(x=x, y=y[:, column])
+
+    def _update_zoom(self) -> None:
+        t0, t1 = self._region.getRegion()
+        series = self._get_range(float(t0), float(t1), max(200, self.zoom_plot.width()))
+        if series is None:
+            return
+        x, y = series
+        for column, curve in enumerate(self.zoom_curves):
+            curve.setData(x=x, y=y[:, column])
+
     def _refresh(self) -> None:
-        snapshot = self._engine.get_snapshot(max_points=self._points_window, event_limit=40)
+        snapshot = self._engine.get_updates(
+            cursor=self._update_cursor,
+            max_points=self._points_window,
+            event_limit=40,
+            views=("raw",),
+        )
+        self._update_cursor = snapshot.get("cursor")
 
         status = snapshot.get("status_message", "")
         samples_total = snapshot.get("samples_total", 0)
@@ -141,11 +211,25 @@ class FocusMonitorWindow(QtWidgets.QMainWindow):
         )
 
         points = snapshot.get("plot_points", [])
+        if snapshot.get("reset", True):
+            self._x = self._x[:0]
+            self._y = self._y[:0]
         if points:
-            x = np.array([float(p["x"]) for p in points], dtype=np.float64)
-            for key, curve in self.curves.items():
-                y = np.array([float(p[key]) for p in points], dtype=np.float64)
-                curve.setData(x=x, y=y)
+            # Only rows since the last refresh arrive; keep a rolling window.
+            x_new = np.array([float(p["x"]) for p in points], dtype=np.float64)
+            y_new = np.array([[float(p[key]) for key in self.curves] for p in points], dtype=np.float64)
+            self._x = np.concatenate((self._x, x_new))[-self._points_window :]
+            self._y = np.concatenate((self._y, y_new))[-self._points_window :]
+            x, y = self._x, self._y
+            if self._target_points and len(x) > self._target_points:
+                keep = decimate_indices(x, y, self._target_points, self._decimation)
+                x, y = x[keep], y[keep]
+            for column, curve in enumerate(self.curves.values()):
+                curve.setData(x=x, y=y[:, column])
+
+        self._overview_ticks += 1
+        if self._overview_ticks % 10 == 1:
+            self._refresh_overview()
 
         metrics = snapshot.get("latest_metrics", {})
         delta = float(metrics.get("delta", 0.0))
@@ -178,21 +262,39 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser.add_argument("--baud", type=int, default=921600, help="Serial baud rate.")
     parser.add_argument("--simulate", action="store_true", help="Use simulator instead of serial.")
     parser.add_argument("--window-points", type=int, default=1500, help="Number of points in chart window.")
+    parser.add_argument(
+        "--target-points",
+        type=int,
+        default=2000,
+        help="Decimate the raw plot to at most this many points (0 disables).",
+    )
+    parser.add_argument("--decimation", choices=DECIMATION_METHODS, default="minmax")
+    parser.add_argument(
+        "--multiprocess",
+        action="store_true",
+        help="Run acquisition in a separate process (shared-memory ring).",
+    )
     return parser.parse_args(argv)
 
 
 def main(argv: list[str] | None = None) -> int:
     args = parse_args(argv)
+    if args.multiprocess:
+        use_process_engine()
     engine = get_engine()
     engine.start(port=args.port, baud=args.baud, simulate=args.simulate, auto_start_stream=True)
 
     app = QtWidgets.QApplication(sys.argv)
     pg.setConfigOptions(antialias=True)
-    window = FocusMonitorWindow(points_window=args.window_points)
+    window = FocusMonitorWindow(
+        points_window=args.window_points,
+        target_points=args.target_points,
+        decimation=args.decimation,
+    )
     window.show()
     exit_code = app.exec()
 
-    engine.stop()
+    engine.close()
     return int(exit_code)
 
 
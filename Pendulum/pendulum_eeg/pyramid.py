@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import numpy as np
+
+from .ring_buffer import ColumnarRingBuffer
+
+
+def aggregate_blocks(
+    low: np.ndarray,
+    high: np.ndarray,
+    mean: np.ndarray,
+    group: int,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Combine consecutive groups of `group` rows (len must be a multiple)."""
+    n_rows = len(low) // group
+    shape = (n_rows, group, *low.shape[1:])
+    return (
+        low.reshape(shape).min(axis=1),
+        high.reshape(shape).max(axis=1),
+        mean.reshape(shape).mean(axis=1),
+    )
+
+
+class _Level:
+    """Ring of (min, max, mean) buckets plus the partial bucket being filled."""
+
+    def __init__(self, capacity: int, group: int, n_channels: int) -> None:
+        self.group = group
+        spec = (np.float32, (n_channels,))
+        self.ring = ColumnarRingBuffer(capacity, {"min": spec, "max": spec, "mean": spec})
+        self.pending: tuple[np.ndarray, np.ndarray, np.ndarray] | None = None
+
+    def clear(self) -> None:
+        self.ring.clear()
+        self.pending = None
+
+    def push(
+        self,
+        low: np.ndarray,
+        high: np.ndarray,
+        mean: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray] | None:
+        """Fold finer rows in; returns the newly completed buckets (if any)."""
+        if self.pending is not None:
+            low = np.concatenate((self.pending[0], low))
+            high = np.concatenate((self.pending[1], high))
+            mean = np.concatenate((self.pending[2], mean))
+        complete = len(low) - len(low) % self.group
+        self.pending = (low[complete:], high[complete:], mean[complete:]) if complete < len(low) else None
+        if complete == 0:
+            return None
+        out = aggregate_blocks(low[:complete], high[:complete], mean[:complete], self.group)
+        self.ring.append({"min": out[0], "max": out[1], "mean": out[2]})
+        return out
+
+
+class MinMaxPyramid:
+    """
+    Incremental min/max/mean pyramid over a sample stream.
+
+    Level k holds one bucket per 2**k samples; bucket r of level k covers
+    sample sequence numbers [r * 2**k, (r + 1) * 2**k). Levels below
+    `min_level` are not stored (they are cheap to rebuild from the raw
+    history), which keeps the whole pyramid at about 1/2**(min_level-1) of
+    the raw history size. Each level keeps as many buckets as needed to span
+    `capacity` samples.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        n_channels: int,
+        *,
+        min_level: int = 3,
+        min_top_buckets: int = 64,
+    ) -> None:
+        if min_level < 1:
+            raise ValueError("min_level must be at least 1.")
+        self.capacity = int(capacity)
+        self.min_level = int(min_level)
+        self.levels: dict[int, _Level] = {}
+        level = self.min_level
+        group = 1 << self.min_level
+        while True:
+            buckets = -(-self.capacity // (1 << level)) + 1
+            self.levels[level] = _Level(buckets, group, n_channels)
+            if buckets <= min_top_buckets:
+                break
+            level += 1
+            group = 2
+
+    @property
+    def max_level(self) -> int:
+        return max(self.levels)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(level.ring.nbytes for level in self.levels.values())
+
+    def clear(self) -> None:
+        for level in self.levels.values():
+            level.clear()
+
+    def append(self, values: np.ndarray) -> None:
+        """Append a (n_samples, n_channels) block of raw values."""
+        if len(values) == 0:
+            return
+        values = np.asarray(values, dtype=np.float32)
+        rows: tuple[np.ndarray, np.ndarray, np.ndarray] | None = (values, values, values)
+        for level in self.levels.values():
+            rows = level.push(*rows)
+            if rows is None:
+                break
+
+    def level_for(self, n_samples: int, max_buckets: int) -> int:
+        """Smallest level whose bucket count for `n_samples` fits in `max_buckets`."""
+        level = 0
+        while (n_samples >> level) > max_buckets and level < self.max_level:
+            level += 1
+        return level
+
+    def buckets(self, level: int, start: int, stop: int) -> dict[str, np.ndarray]:
+        """Stored buckets with index in [start, stop) (clamped to what is kept)."""
+        ring = self.levels[level].ring
+        return ring.rows(start, stop)
+
+    def bucket_bounds(self, level: int) -> tuple[int, int]:
+        ring = self.levels[level].ring
+        return ring.total_written - len(ring), ring.total_written
+
+
+def envelope_series(
+    x: np.ndarray,
+    low: np.ndarray,
+    high: np.ndarray,
+    bucket_seconds: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Interleave bucket minima and maxima into one drawable series: the min at
+    the bucket start and the max half a bucket later, so a plain line plot
+    shows the full envelope.
+    """
+    if bucket_seconds <= 0 or np.array_equal(low, high):
+        return x, low
+    x_env = np.column_stack((x, x + bucket_seconds / 2.0)).ravel()
+    y_env = np.stack((low, high), axis=1).reshape(-1, *low.shape[1:])
+    return x_env, y_env
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+# File layout: header, then one record per serial read:
+#   u64 nanoseconds since capture start (monotonic) | u32 length | bytes
+RAW_CAPTURE_MAGIC = b"PNDRAW\x00\x01"
+RAW_CAPTURE_SUFFIX = ".pndraw"
+_HEADER = struct.Struct("<8sdI")  # magic, wall-clock start (unix s), sample_rate_hz
+_RECORD = struct.Struct("<QI")
+
+
+class RawCaptureError(ValueError):
+    pass
+
+
+class RawCaptureWriter:
+    """
+    Append-only tee of the raw serial byte stream with read timestamps.
+
+    Chunks are written exactly as `ser.read()` returned them, so a replay
+    reproduces the same parser input boundaries. Writes and `close` may
+    come from different threads.
+    """
+
+    def __init__(self, path: str | Path, sample_rate_hz: int = 0) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._file: BinaryIO | None = self.path.open("wb")
+        self._file.write(_HEADER.pack(RAW_CAPTURE_MAGIC, time.time(), int(sample_rate_hz)))
+        self._started_ns = time.monotonic_ns()
+        self.bytes_written = 0
+        self.chunks_written = 0
+
+    @property
+    def closed(self) -> bool:
+        return self._file is None
+
+    def write(self, chunk: bytes, offset_ns: int | None = None) -> None:
+        """Append `chunk` stamped now, or at `offset_ns` for synthesized captures."""
+        if offset_ns is None:
+            offset_ns = time.monotonic_ns() - self._started_ns
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(_RECORD.pack(offset_ns, len(chunk)))
+            self._file.write(chunk)
+            self.bytes_written += len(chunk)
+            self.chunks_written += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class RawCapture:
+    """Reader for a capture file: header fields plus (seconds, chunk) records."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as handle:
+            header = handle.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise RawCaptureError(f"{self.path} is too short to be a raw capture.")
+        magic, self.started_wall_s, self.sample_rate_hz = _HEADER.unpack(header)
+        if magic != RAW_CAPTURE_MAGIC:
+            raise RawCaptureError(f"{self.path} is not a raw capture file.")
+
+    def chunks(self) -> Iterator[tuple[float, bytes]]:
+        """Yield (seconds since capture start, chunk); a truncated tail is ignored."""
+        with self.path.open("rb") as handle:
+            handle.seek(_HEADER.size)
+            while True:
+                record = handle.read(_RECORD.size)
+                if len(record) < _RECORD.size:
+                    return
+                offset_ns, length = _RECORD.unpack(record)
+                chunk = handle.read(length)
+                if len(chunk) < length:
+                    return
+                yield offset_ns / 1e9, chunk
@@ -1,9 +1,33 @@
 from __future__ import annotations
 
+import os
+import threading
+
+from .async_engine import AsyncEEGEngine
 from .engine import EEGEngine
+from .process_engine import ProcessEngine
+
+_ENGINE: EEGEngine | ProcessEngine | None = None
+_ENGINE_LOCK = threading.Lock()
+
 
-_ENGINE = EEGEngine()
+def use_process_engine(enabled: bool = True) -> None:
+    """Select multiprocess acquisition; must run before the first get_engine()."""
+    os.environ["PENDULUM_ACQUISITION"] = "process" if enabled else "thread"
 
 
-def get_engine() -> EEGEngine:
-    return _ENGINE
+def get_engine() -> EEGEngine | ProcessEngine:
+    global _ENGINE
+    with _ENGINE_LOCK:
+        if _ENGINE is None:
+            # PENDULUM_ACQUISITION=process runs acquisition in a child process
+            # that writes into a shared-memory ring; =async reads the serial
+            # port from the caller's asyncio loop (see AsyncEEGEngine).
+            mode = os.environ.get("PENDULUM_ACQUISITION", "").strip().lower()
+            if mode == "process":
+                _ENGINE = ProcessEngine()
+            elif mode == "async":
+                _ENGINE = AsyncEEGEngine()
+            else:
+                _ENGINE = EEGEngine()
+        return _ENGINE
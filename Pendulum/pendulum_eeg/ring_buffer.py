@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+from typing import Literal, Mapping
+
+import numpy as np
+
+
+ColumnSpec = tuple[np.dtype | type, tuple[int, ...]]
+
+
+class ColumnarRingBuffer:
+    """
+    Preallocated fixed-capacity ring buffer with one NumPy array per column.
+
+    Rows are appended in blocks and read back as tails. A tail that does not
+    cross the wrap point is returned as zero-copy views; otherwise each column
+    is gathered with a single contiguous copy.
+    """
+
+    def __init__(self, capacity: int, columns: Mapping[str, ColumnSpec]) -> None:
+        if capacity <= 0:
+            raise ValueError("Ring buffer capacity must be positive.")
+        if not columns:
+            raise ValueError("Ring buffer needs at least one column.")
+
+        self.capacity = int(capacity)
+        self._columns: dict[str, np.ndarray] = {
+            name: np.zeros((self.capacity, *shape), dtype=dtype)
+            for name, (dtype, shape) in columns.items()
+        }
+        self._write_pos = 0
+        self._size = 0
+        self._total_written = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return tuple(self._columns)
+
+    @property
+    def total_written(self) -> int:
+        """Number of rows appended since the last clear (monotonic)."""
+        return self._total_written
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in self._columns.values())
+
+    @property
+    def bytes_per_row(self) -> int:
+        return self.nbytes // self.capacity
+
+    def clear(self) -> None:
+        self._write_pos = 0
+        self._size = 0
+        self._total_written = 0
+
+    def append(self, block: Mapping[str, np.ndarray], n_rows: int | None = None) -> int:
+        """
+        Append a block of rows. Every column must be present with the same
+        leading length, unless `n_rows` is given: then columns missing from
+        `block` are skipped and keep stale values in the new rows. Returns
+        the number of rows written.
+        """
+        n_rows = self._block_length(block) if n_rows is None else int(n_rows)
+        if n_rows == 0:
+            return 0
+
+        skip = 0
+        if n_rows > self.capacity:
+            # Only the newest `capacity` rows can survive.
+            skip = n_rows - self.capacity
+            self._write_pos = (self._write_pos + skip) % self.capacity
+
+        kept = n_rows - skip
+        first = min(kept, self.capacity - self._write_pos)
+        second = kept - first
+        for name, column in self._columns.items():
+            if name not in block:
+                continue
+            values = np.asarray(block[name])[skip:]
+            column[self._write_pos : self._write_pos + first] = values[:first]
+            if second:
+                column[:second] = values[first:]
+
+        self._write_pos = (self._write_pos + kept) % self.capacity
+        self._size = min(self.capacity, self._size + n_rows)
+        self._total_written += n_rows
+        return n_rows
+
+    def tail(self, n: int, columns: tuple[str, ...] | None = None) -> dict[str, np.ndarray]:
+        """Return the newest `n` rows (oldest first) for the requested columns."""
+        n = max(0, min(int(n), self._size))
+        names = columns or tuple(self._columns)
+        start = (self._write_pos - n) % self.capacity
+        end = start + n
+        out: dict[str, np.ndarray] = {}
+        for name in names:
+            column = self._columns[name]
+            if end <= self.capacity:
+                out[name] = column[start:end]
+            else:
+                out[name] = np.concatenate((column[start:], column[: end - self.capacity]))
+        return out
+
+    def rows(
+        self,
+        start: int,
+        stop: int,
+        columns: tuple[str, ...] | None = None,
+    ) -> dict[str, np.ndarray]:
+        """
+        Return rows by sequence number (0 = first row since the last clear),
+        clamped to the rows still retained.
+        """
+        oldest = self._total_written - self._size
+        start = max(int(start), oldest)
+        stop = min(int(stop), self._total_written)
+        n = max(0, stop - start)
+        names = columns or tuple(self._columns)
+        first_pos = (self._write_pos - (self._total_written - start)) % self.capacity
+        end = first_pos + n
+        out: dict[str, np.ndarray] = {}
+        for name in names:
+            column = self._columns[name]
+            if end <= self.capacity:
+                out[name] = column[first_pos:end]
+            else:
+                out[name] = np.concatenate((column[first_pos:], column[: end - self.capacity]))
+        return out
+
+    def assign(self, start: int, block: Mapping[str, np.ndarray]) -> None:
+        """
+        Overwrite retained rows from sequence number `start` for the columns
+        in `block` (rows that are no longer retained are skipped).
+        """
+        n_rows = len(next(iter(block.values()))) if block else 0
+        oldest = self._total_written - self._size
+        skip = max(0, oldest - int(start))
+        n = min(n_rows, self._total_written - int(start)) - skip
+        if n <= 0:
+            return
+        pos = (self._write_pos - (self._total_written - int(start) - skip)) % self.capacity
+        first = min(n, self.capacity - pos)
+        for name, values in block.items():
+            column = self._columns[name]
+            values = np.asarray(values)[skip : skip + n]
+            column[pos : pos + first] = values[:first]
+            column[: n - first] = values[first:]
+
+    def search(self, column: str, value: int | float, side: Literal["left", "right"] = "left") -> int:
+        """
+        Sequence number of the first retained row whose `column` is >= `value`
+        (or > with side="right"); `total_written` if there is none. The
+        column must be non-decreasing in append order. O(log n): one
+        searchsorted per contiguous part of the ring.
+        """
+        oldest = self._total_written - self._size
+        column_values = self._columns[column]
+        start = (self._write_pos - self._size) % self.capacity
+        if start + self._size <= self.capacity:
+            return oldest + int(np.searchsorted(column_values[start : start + self._size], value, side))
+        head = column_values[start:]
+        found = int(np.searchsorted(head, value, side))
+        if found < len(head):
+            return oldest + found
+        tail = column_values[: self._size - len(head)]
+        return oldest + len(head) + int(np.searchsorted(tail, value, side))
+
+    def at(self, column: str, seqs: np.ndarray) -> np.ndarray:
+        """Values of `column` at retained sequence numbers `seqs` (a gather, not views)."""
+        positions = (self._write_pos - (self._total_written - np.asarray(seqs, dtype=np.int64))) % self.capacity
+        return self._columns[column][positions]
+
+    def latest(self, column: str) -> np.ndarray | None:
+        if self._size == 0:
+            return None
+        return self._columns[column][(self._write_pos - 1) % self.capacity]
+
+    def _block_length(self, block: Mapping[str, np.ndarray]) -> int:
+        lengths = set()
+        for name in self._columns:
+            if name not in block:
+                raise KeyError(f"Missing ring buffer column: {name}")
+            lengths.add(len(block[name]))
+        if len(lengths) != 1:
+            raise ValueError("Ring buffer block columns have different lengths.")
+        return lengths.pop()
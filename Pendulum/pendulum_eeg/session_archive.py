@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import os
+import queue
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from .firmware_protocol import CHANNEL_FIELDS, SAMPLE_DTYPE, counts_to_microvolts
+
+
+ARCHIVE_DTYPE = np.dtype(SAMPLE_DTYPE.descr + [("host_timestamp_s", "<f8")])
+
+COUNT_FIELDS = CHANNEL_FIELDS
+
+# Session files are scratch space for exports. Ones left behind by a process
+# that never closed its archive are pruned once they are this old.
+STALE_ARCHIVE_SECONDS = 24 * 60 * 60
+
+
+def archive_export_columns(
+    records: np.ndarray,
+    vref_uv: int,
+    gain: int,
+    host_time_corrected_s: np.ndarray | None = None,
+) -> dict[str, np.ndarray]:
+    """Expand archive records into the export column order used by CSV/NPZ."""
+    columns: dict[str, np.ndarray] = {
+        "sample_index": records["sample_index"],
+        "t_us": records["t_us"],
+        "status24": records["status24"],
+    }
+    for name in COUNT_FIELDS:
+        columns[name] = records[name]
+    for name in COUNT_FIELDS:
+        columns[f"{name}_uv"] = counts_to_microvolts(
+            records[name].astype(np.float64), vref_uv, gain
+        )
+    columns["flags"] = records["flags"]
+    columns["missed_drdy_frame"] = records["missed_drdy_frame"]
+    columns["recoveries_total"] = records["recoveries_total"]
+    columns["host_timestamp_s"] = records["host_timestamp_s"]
+    if host_time_corrected_s is not None:
+        columns["host_time_corrected_s"] = host_time_corrected_s
+    return columns
+
+
+def archive_microvolts(records: np.ndarray, vref_uv: int, gain: int) -> np.ndarray:
+    """Return archive records as a (n_samples, n_channels) float64 microvolt matrix."""
+    counts = np.stack([records[name] for name in COUNT_FIELDS], axis=1)
+    return counts_to_microvolts(counts.astype(np.float64), vref_uv, gain)
+
+
+def _try_unlink(path: Path) -> bool:
+    """Delete `path`; False if it is still in use (e.g. mapped, on Windows)."""
+    try:
+        path.unlink(missing_ok=True)
+    except OSError:
+        return False
+    return True
+
+
+class SessionArchive:
+    """
+    Append-only on-disk archive of every sample in a session.
+
+    Producers append record blocks into an in-memory chunk; full chunks are
+    handed to a background writer thread, so RAM usage is bounded by
+    ``chunk_records * max_queued_chunks`` regardless of session length.
+    Reads flush pending records and return a read-only ``numpy.memmap``.
+
+    The file only lives as long as the session: `reset()` and
+    `close(delete=True)` remove it, and the first file an archive creates
+    prunes `session_*.bin` files older than `stale_after_s` from crashed
+    runs. A file that cannot be removed yet (Windows refuses while a memmap
+    of it is open) is retried on the next reset, close or prune.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        *,
+        chunk_records: int = 4096,
+        max_queued_chunks: int = 64,
+        stale_after_s: float | None = STALE_ARCHIVE_SECONDS,
+    ) -> None:
+        if chunk_records <= 0:
+            raise ValueError("chunk_records must be positive.")
+        self.directory = Path(directory)
+        self.chunk_records = int(chunk_records)
+        self.stale_after_s = stale_after_s
+
+        self._lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, int(max_queued_chunks)))
+        self._thread: threading.Thread | None = None
+        self._path: Path | None = None
+        self._file = None
+        self._pruned = False
+        self._undeleted: list[Path] = []
+
+        self._pending = np.empty(self.chunk_records, dtype=ARCHIVE_DTYPE)
+        self._pending_len = 0
+        self._appended = 0
+        self._written = 0
+        self._write_error: Exception | None = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._appended
+
+    @property
+    def path(self) -> Path | None:
+        return self._path
+
+    def append(self, records: np.ndarray) -> None:
+        if records.dtype != ARCHIVE_DTYPE:
+            raise TypeError("SessionArchive.append expects ARCHIVE_DTYPE records.")
+        with self._lock:
+            self._ensure_writer()
+            offset = 0
+            total = len(records)
+            while offset < total:
+                take = min(total - offset, self.chunk_records - self._pending_len)
+                self._pending[self._pending_len : self._pending_len + take] = records[offset : offset + take]
+                self._pending_len += take
+                offset += take
+                if self._pending_len == self.chunk_records:
+                    self._hand_off_pending()
+            self._appended += total
+
+    def flush(self) -> None:
+        """Write every appended record to disk and wait for the writer."""
+        with self._lock:
+            if self._thread is None:
+                return
+            if self._pending_len:
+                self._hand_off_pending()
+            done = threading.Event()
+            self._queue.put(("flush", done))
+        done.wait()
+        if self._write_error is not None:
+            raise RuntimeError(f"Session archive write failed: {self._write_error}")
+
+    def read(self) -> np.ndarray:
+        """Return every archived record as a read-only memory-mapped array."""
+        self.flush()
+        with self._lock:
+            count = self._written
+            path = self._path
+        if count == 0 or path is None:
+            return np.empty(0, dtype=ARCHIVE_DTYPE)
+        return np.memmap(path, dtype=ARCHIVE_DTYPE, mode="r", shape=(count,))
+
+    def reset(self) -> None:
+        """
+        Discard archived records: the writer stops and the session file is
+        deleted. The next append starts a new file.
+        """
+        with self._lock:
+            self._pending_len = 0
+            self._appended = 0
+            thread = self._stop_writer()
+        if thread is not None:
+            thread.join(timeout=5.0)
+        with self._lock:
+            self._written = 0
+            path, self._path = self._path, None
+        self._delete_files(path)
+
+    def close(self, delete: bool = False) -> None:
+        """
+        Write pending records and stop the writer. The file stays readable
+        unless `delete` is set, which discards it like `reset()`.
+        """
+        if delete:
+            self.reset()
+            return
+        self.flush()
+        with self._lock:
+            thread = self._stop_writer()
+        if thread is not None:
+            thread.join(timeout=5.0)
+
+    def _delete_files(self, path: Path | None) -> None:
+        with self._lock:
+            paths, self._undeleted = self._undeleted, []
+        if path is not None:
+            paths.append(path)
+        kept = [candidate for candidate in paths if not _try_unlink(candidate)]
+        if kept:
+            with self._lock:
+                self._undeleted.extend(kept)
+
+    def _prune_stale(self) -> None:
+        # Called with self._lock held, before this archive creates its file.
+        if self.stale_after_s is None:
+            return
+        cutoff = time.time() - float(self.stale_after_s)
+        for candidate in self.directory.glob("session_*.bin"):
+            try:
+                stale = candidate.stat().st_mtime < cutoff
+            except OSError:
+                continue
+            if stale:
+                _try_unlink(candidate)
+
+    def _stop_writer(self) -> threading.Thread | None:
+        # Called with self._lock held; the caller joins the returned thread.
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(("close", None))
+        return thread
+
+    def _hand_off_pending(self) -> None:
+        # Called with self._lock held.
+        chunk = self._pending[: self._pending_len]
+        self._pending = np.empty(self.chunk_records, dtype=ARCHIVE_DTYPE)
+        self._pending_len = 0
+        self._queue.put(("write", chunk))
+
+    def _ensure_writer(self) -> None:
+        # Called with self._lock held. The file is created lazily so an idle
+        # engine never touches the disk.
+        if self._thread is not None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if not self._pruned:
+            self._pruned = True
+            self._prune_stale()
+        if self._undeleted:
+            self._undeleted = [candidate for candidate in self._undeleted if not _try_unlink(candidate)]
+        if self._path is None:
+            # Unique even for archives started in the same second and process.
+            slug = time.strftime("%Y%m%d_%H%M%S")
+            fd, name = tempfile.mkstemp(
+                prefix=f"session_{slug}_{os.getpid()}_", suffix=".bin", dir=self.directory
+            )
+            self._path = Path(name)
+            self._file = os.fdopen(fd, "wb")
+            self._written = 0
+        else:
+            # Appending after close() continues the same file.
+            self._file = self._path.open("ab")
+        self._thread = threading.Thread(
+            target=self._writer_loop, daemon=True, name="PendulumSessionArchive"
+        )
+        self._thread.start()
+
+    def _writer_loop(self) -> None:
+        handle = self._file
+        while True:
+            kind, payload = self._queue.get()
+            if kind == "write":
+                try:
+                    handle.write(payload.tobytes())
+                    # Only this thread writes the counter, so no lock is taken
+                    # (producers may hold self._lock while blocked on put()).
+                    self._written += len(payload)
+                except Exception as exc:
+                    self._write_error = exc
+            elif kind == "flush":
+                try:
+                    handle.flush()
+                except Exception as exc:
+                    self._write_error = exc
+                payload.set()
+            elif kind == "close":
+                handle.close()
+                return
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .analysis import SIGNAL_VIEW_ORDER
+from .firmware_protocol import CHANNEL_COUNT
+
+
+SHARED_RING_MAGIC = 0x50454547  # "PEEG"
+SHARED_RING_VERSION = 2
+
+# int64 header slots
+_H_MAGIC = 0
+_H_VERSION = 1
+_H_CAPACITY = 2
+_H_CHANNELS = 3
+_H_RESERVED = 4  # rows being written (published before the data)
+_H_COMMITTED = 5  # rows readable (published after the data)
+_H_SESSION = 6
+_H_VIEWS = 7  # 1 when band views are filtered, 0 when only "raw" is valid
+_HEADER_SLOTS = 8
+
+
+def shared_ring_columns(n_channels: int = CHANNEL_COUNT) -> dict[str, tuple[type, tuple[int, ...]]]:
+    """Columns mirrored into shared memory: sample metadata plus every signal view."""
+    columns: dict[str, tuple[type, tuple[int, ...]]] = {
+        "sample_index": (np.int64, ()),
+        "t_us": (np.int64, ()),
+        "flags": (np.uint32, ()),
+    }
+    for view in SIGNAL_VIEW_ORDER:
+        columns[view] = (np.float32, (n_channels,))
+    return columns
+
+
+def _layout(capacity: int, n_channels: int) -> tuple[dict[str, tuple[int, np.dtype, tuple[int, ...]]], int]:
+    offset = _HEADER_SLOTS * 8
+    layout: dict[str, tuple[int, np.dtype, tuple[int, ...]]] = {}
+    for name, (dtype, shape) in shared_ring_columns(n_channels).items():
+        dt = np.dtype(dtype)
+        layout[name] = (offset, dt, (capacity, *shape))
+        size = dt.itemsize * capacity * int(np.prod(shape, dtype=np.int64))
+        offset += (size + 7) & ~7
+    return layout, offset
+
+
+class SharedSampleRing:
+    """
+    Sample ring buffer in ``multiprocessing.shared_memory``.
+
+    One process (the acquisition process) writes; any number of processes
+    attach read-only. Writers publish ``reserved`` before copying a block and
+    ``committed`` after it, so a reader can tell whether the rows it copied
+    were overwritten mid-read without taking a cross-process lock.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, *, owner: bool, readonly: bool) -> None:
+        self._shm = shm
+        self._owner = owner
+        self.readonly = readonly
+        header = np.ndarray((_HEADER_SLOTS,), dtype=np.int64, buffer=shm.buf)
+        if header[_H_MAGIC] != SHARED_RING_MAGIC or header[_H_VERSION] != SHARED_RING_VERSION:
+            raise ValueError(f"Shared memory {shm.name!r} is not a Pendulum sample ring.")
+        if readonly:
+            header.flags.writeable = False
+        self._header = header
+        self.capacity = int(header[_H_CAPACITY])
+        self.n_channels = int(header[_H_CHANNELS])
+        layout, _ = _layout(self.capacity, self.n_channels)
+        self._columns: dict[str, np.ndarray] = {}
+        for name, (offset, dtype, shape) in layout.items():
+            column = np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+            if readonly:
+                column.flags.writeable = False
+            self._columns[name] = column
+
+    @classmethod
+    def create(
+        cls,
+        capacity: int,
+        n_channels: int = CHANNEL_COUNT,
+        name: str | None = None,
+        *,
+        readonly: bool = False,
+    ) -> SharedSampleRing:
+        """Allocate a ring; the creating process owns (and unlinks) the segment."""
+        if capacity <= 0:
+            raise ValueError("Shared ring capacity must be positive.")
+        _, size = _layout(int(capacity), n_channels)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = np.ndarray((_HEADER_SLOTS,), dtype=np.int64, buffer=shm.buf)
+        header[:] = 0
+        header[_H_CAPACITY] = int(capacity)
+        header[_H_CHANNELS] = int(n_channels)
+        header[_H_VERSION] = SHARED_RING_VERSION
+        header[_H_MAGIC] = SHARED_RING_MAGIC
+        del header
+        return cls(shm, owner=True, readonly=readonly)
+
+    @classmethod
+    def attach(cls, name: str, *, readonly: bool = True) -> SharedSampleRing:
+        return cls(shared_memory.SharedMemory(name=name), owner=False, readonly=readonly)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def committed(self) -> int:
+        """Sequence counter: rows written since the last clear."""
+        return int(self._header[_H_COMMITTED])
+
+    @property
+    def session(self) -> int:
+        return int(self._header[_H_SESSION])
+
+    @property
+    def views_available(self) -> bool:
+        return bool(self._header[_H_VIEWS])
+
+    def clear(self) -> None:
+        """Start a new session; readers see the session id change."""
+        self._check_writable()
+        self._header[_H_RESERVED] = 0
+        self._header[_H_COMMITTED] = 0
+        self._header[_H_SESSION] += 1
+
+    def write(self, block: dict[str, np.ndarray], views_available: bool = True) -> int:
+        """Append a block; missing view columns are written as zeros."""
+        self._check_writable()
+        n_rows = len(block["sample_index"])
+        if n_rows == 0:
+            return 0
+        start = int(self._header[_H_COMMITTED])
+        skip = max(0, n_rows - self.capacity)
+        self._header[_H_RESERVED] = start + n_rows
+
+        kept = n_rows - skip
+        pos = (start + skip) % self.capacity
+        first = min(kept, self.capacity - pos)
+        for name, column in self._columns.items():
+            values = block.get(name)
+            if values is None:
+                column[pos : pos + first] = 0
+                column[: kept - first] = 0
+                continue
+            values = np.asarray(values)[skip:]
+            column[pos : pos + first] = values[:first]
+            column[: kept - first] = values[first:]
+
+        self._header[_H_VIEWS] = int(views_available)
+        self._header[_H_COMMITTED] = start + n_rows
+        return n_rows
+
+    def read(self, start: int, stop: int, columns: tuple[str, ...] | None = None) -> dict[str, np.ndarray] | None:
+        """
+        Copy rows [start, stop) by sequence number.
+
+        Returns None if any of them has been (or is being) overwritten; the
+        caller should retry with a newer range.
+        """
+        names = columns or tuple(self._columns)
+        n = stop - start
+        if n < 0 or start < 0:
+            return None
+        pos = start % self.capacity
+        first = min(n, self.capacity - pos)
+        out: dict[str, np.ndarray] = {}
+        for name in names:
+            column = self._columns[name]
+            if first == n:
+                out[name] = column[pos : pos + n].copy()
+            else:
+                out[name] = np.concatenate((column[pos:], column[: n - first]))
+        if start < int(self._header[_H_RESERVED]) - self.capacity:
+            return None
+        return out
+
+    def tail(self, n: int, columns: tuple[str, ...] | None = None) -> tuple[int, dict[str, np.ndarray]]:
+        """Return (sequence counter, newest `n` rows), retrying on overwrite."""
+        while True:
+            committed = self.committed
+            count = max(0, min(int(n), committed, self.capacity))
+            rows = self.read(committed - count, committed, columns)
+            if rows is not None:
+                return committed, rows
+
+    def close(self) -> None:
+        self._header = None  # type: ignore[assignment]
+        self._columns = {}
+        self._shm.close()
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _check_writable(self) -> None:
+        if self.readonly:
+            raise PermissionError("Shared ring is mapped read-only.")
@@ -1,67 +1,91 @@
 from __future__ import annotations
 
-import math
-import random
-import time
 from dataclasses import dataclass, field
 
-from .firmware_protocol import ADS_STATUS_HEADER_OK, counts_to_microvolts
+import numpy as np
+
+from .firmware_protocol import (
+    ADS_STATUS_HEADER_OK,
+    CHANNEL_FIELDS,
+    FLAG_STREAMING,
+    FULL_SCALE_CODE,
+    SAMPLE_DTYPE,
+    counts_to_microvolts,
+)
 from .models import SamplePacket
 
+_CHANNEL_GAINS = np.array([1.0, 0.95, 1.05, 1.02])
+_CHANNEL_NOISE_UV = np.array([2.0, 2.0, 2.2, 1.8])
+
 
 def microvolts_to_counts(microvolts: float, vref_uv: int = 4_500_000, gain: int = 24) -> int:
     scale = (gain * 8_388_607.0) / float(vref_uv)
     return int(microvolts * scale)
 
 
+def synthetic_eeg_uv(t: np.ndarray, rng: np.random.Generator, amplitude_uv: float = 35.0) -> np.ndarray:
+    """(len(t), 4) microvolt matrix of an EEG-like band mixture at times `t` (seconds)."""
+    two_pi = 2.0 * np.pi
+    drift = 1.0 + 0.2 * np.sin(two_pi * 0.03 * t)
+
+    # Mistura simples de bandas para parecer EEG.
+    alpha = np.sin(two_pi * 10.0 * t)
+    beta = np.sin(two_pi * 19.0 * t + 0.5)
+    theta = np.sin(two_pi * 6.0 * t + 1.2)
+    delta = np.sin(two_pi * 2.0 * t + 2.4)
+    gamma = np.sin(two_pi * 35.0 * t + 0.7)
+    # One draw per sample (shared + per channel), so the stream does not
+    # depend on how it is split into blocks.
+    draws = rng.standard_normal((len(t), 5))
+    noise = 0.15 * draws[:, 0]
+
+    base_uv = amplitude_uv * drift * (
+        0.35 * alpha + 0.45 * beta + 0.20 * theta + 0.12 * delta + 0.06 * gamma + noise
+    )
+    return base_uv[:, None] * _CHANNEL_GAINS + draws[:, 1:] * _CHANNEL_NOISE_UV
+
+
 @dataclass(slots=True)
 class EEGSimulator:
+    """
+    Seeded EEG-like sample generator.
+
+    `next_block(n)` returns n samples as a SAMPLE_DTYPE array in one NumPy
+    pass. Timestamps follow simulated time (sample_index / sample_rate_hz),
+    so the output is identical for a given seed however fast it is drained.
+    """
+
     sample_rate_hz: int = 250
     amplitude_uv: float = 35.0
-    start_monotonic: float = field(default_factory=time.monotonic)
+    seed: int | None = None
+    vref_uv: int = 4_500_000
+    gain: int = 24
     sample_index: int = 0
+    _rng: np.random.Generator = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._rng = np.random.default_rng(self.seed)
+
+    def next_block(self, n_samples: int) -> np.ndarray:
+        index = self.sample_index + np.arange(int(n_samples), dtype=np.int64)
+        t = index / float(self.sample_rate_hz)
+        uv = synthetic_eeg_uv(t, self._rng, self.amplitude_uv)
+        scale = (self.gain * float(FULL_SCALE_CODE)) / float(self.vref_uv)
+        counts = np.clip(uv * scale, -FULL_SCALE_CODE - 1, FULL_SCALE_CODE).astype(np.int32)
+
+        samples = np.zeros(len(index), dtype=SAMPLE_DTYPE)
+        samples["sample_index"] = index & 0xFFFFFFFF
+        samples["t_us"] = (index * 1_000_000 // self.sample_rate_hz) & 0xFFFFFFFF
+        samples["status24"] = ADS_STATUS_HEADER_OK
+        for column, name in enumerate(CHANNEL_FIELDS):
+            samples[name] = counts[:, column]
+        samples["flags"] = FLAG_STREAMING
+        self.sample_index += len(index)
+        return samples
 
     def next_packet(self) -> SamplePacket:
-        t = self.sample_index / float(self.sample_rate_hz)
-        drift = 1.0 + 0.2 * math.sin(2.0 * math.pi * 0.03 * t)
-
-        # Mistura simples de bandas para parecer EEG.
-        alpha = math.sin(2.0 * math.pi * 10.0 * t)
-        beta = math.sin(2.0 * math.pi * 19.0 * t + 0.5)
-        theta = math.sin(2.0 * math.pi * 6.0 * t + 1.2)
-        delta = math.sin(2.0 * math.pi * 2.0 * t + 2.4)
-        gamma = math.sin(2.0 * math.pi * 35.0 * t + 0.7)
-        noise = random.gauss(0.0, 0.15)
-
-        base_uv = self.amplitude_uv * drift * (
-            0.35 * alpha + 0.45 * beta + 0.20 * theta + 0.12 * delta + 0.06 * gamma + noise
-        )
-
-        ch_values_uv = [
-            base_uv + random.gauss(0.0, 2.0),
-            base_uv * 0.95 + random.gauss(0.0, 2.0),
-            base_uv * 1.05 + random.gauss(0.0, 2.2),
-            base_uv * 1.02 + random.gauss(0.0, 1.8),
-        ]
-        ch_counts = [microvolts_to_counts(v) for v in ch_values_uv]
-
-        timestamp_us = int((time.monotonic() - self.start_monotonic) * 1_000_000.0)
-
-        packet = SamplePacket(
-            version=1,
-            sample_index=self.sample_index,
-            t_us=timestamp_us,
-            status24=ADS_STATUS_HEADER_OK,
-            ch1=ch_counts[0],
-            ch2=ch_counts[1],
-            ch3=ch_counts[2],
-            ch4=ch_counts[3],
-            flags=1,  # FLAG_STREAMING
-            missed_drdy_frame=0,
-            recoveries_total=0,
-        )
-        self.sample_index += 1
-        return packet
+        row = self.next_block(1)[0]
+        return SamplePacket(1, *(int(row[name]) for name in SAMPLE_DTYPE.names))
 
     def to_microvolts(self, counts: int) -> float:
         return counts_to_microvolts(counts)
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import threading
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class SpscQueue(Generic[T]):
+    """
+    Bounded single-producer/single-consumer queue.
+
+    The producer only advances ``_tail`` and the consumer only advances
+    ``_head``; each slot is written before the index that publishes it, so
+    no lock is needed under the GIL. A full queue never blocks the producer:
+    ``put`` returns False and the item is counted as dropped, which keeps a
+    serial reader draining the port even when processing falls behind.
+    The drop counters are written by the producer only, so readers on other
+    threads see monotonic values without taking a lock.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("Queue capacity must be positive.")
+        self.capacity = int(capacity)
+        self._slots: list[T | None] = [None] * self.capacity
+        self._head = 0
+        self._tail = 0
+        self._not_empty = threading.Event()
+        self.dropped = 0
+        # Sum of the `weight` of dropped items (e.g. samples per block).
+        self.dropped_weight = 0
+        self.high_water = 0
+
+    def __len__(self) -> int:
+        return self._tail - self._head
+
+    def put(self, item: T, weight: int = 1) -> bool:
+        """
+        Producer side. Returns False when full, counting the drop and adding
+        `weight` to `dropped_weight`.
+        """
+        tail = self._tail
+        depth = tail - self._head
+        if depth >= self.capacity:
+            self.dropped += 1
+            self.dropped_weight += weight
+            return False
+        self._slots[tail % self.capacity] = item
+        self._tail = tail + 1
+        if depth + 1 > self.high_water:
+            self.high_water = depth + 1
+        self._not_empty.set()
+        return True
+
+    def get(self, timeout: float | None = None) -> T | None:
+        """Consumer side. Returns None if nothing arrived within `timeout`."""
+        if self._head == self._tail:
+            if not timeout:
+                return None
+            # Clear before re-checking so a put() in between is not missed.
+            self._not_empty.clear()
+            if self._head == self._tail and not self._not_empty.wait(timeout):
+                return None
+            if self._head == self._tail:
+                return None
+        head = self._head
+        index = head % self.capacity
+        item = self._slots[index]
+        self._slots[index] = None
+        self._head = head + 1
+        return item
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "depth": len(self),
+            "capacity": self.capacity,
+            "high_water": self.high_water,
+            "dropped": self.dropped,
+            "dropped_weight": self.dropped_weight,
+        }
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import deque
+from typing import Any, Callable, Iterable, Iterator, Literal
+
+import numpy as np
+
+OverflowPolicy = Literal["drop_oldest", "coalesce"]
+OVERFLOW_POLICIES: tuple[OverflowPolicy, ...] = ("drop_oldest", "coalesce")
+SUBSCRIPTION_KINDS = ("samples", "metrics", "events", "status")
+
+_SAMPLE_ARRAYS = ("sample_index", "t_us", "flags", "uv")
+
+
+def _merge_parts(parts: list[dict[str, Any]]) -> dict[str, Any]:
+    """Collapse coalesced messages of one kind into a single message."""
+    newest = parts[-1]
+    if len(parts) == 1:
+        return newest
+    kind = newest["kind"]
+    if kind == "samples":
+        merged = dict(newest)
+        merged["seq"] = parts[0]["seq"]
+        for key in _SAMPLE_ARRAYS:
+            merged[key] = np.concatenate([part[key] for part in parts])
+        return merged
+    if kind == "events":
+        return {**newest, "events": [event for part in parts for event in part["events"]]}
+    return newest
+
+
+class _Entry:
+    __slots__ = ("kind", "parts", "rows")
+
+    def __init__(self, message: dict[str, Any]) -> None:
+        self.kind = message["kind"]
+        self.parts = [message]
+        self.rows = len(message["uv"]) if self.kind == "samples" else 0
+
+    def absorb(self, message: dict[str, Any]) -> bool:
+        """Fold a newer message of the same kind in; False if it cannot merge."""
+        last = self.parts[-1]
+        if message["kind"] != self.kind or message.get("session") != last.get("session"):
+            return False
+        if self.kind == "samples":
+            if last["seq"] + len(last["uv"]) != message["seq"]:
+                return False
+            self.parts.append(message)
+            self.rows += len(message["uv"])
+        elif self.kind == "events":
+            self.parts.append(message)
+        else:
+            # Metrics and status are state: only the latest one matters.
+            self.parts = [message]
+        return True
+
+
+class Subscription:
+    """
+    Bounded stream of engine messages for one consumer.
+
+    Messages are dicts with a "kind" (samples, metrics, events, status) and
+    the engine session id. Consume them with `get` (blocking), iteration,
+    or `async for`; or pass `callback` to have them delivered on the
+    engine thread instead of queued.
+
+    When `maxsize` messages are pending, "drop_oldest" discards the oldest
+    one, while "coalesce" merges the new message into the newest pending
+    one of the same kind: sample blocks are concatenated (keeping at most
+    `max_samples` rows), events are appended and metrics/status keep only
+    the latest value. A consumer that falls behind therefore sees fewer,
+    larger messages instead of losing data.
+    """
+
+    def __init__(
+        self,
+        kinds: Iterable[str] = ("samples", "metrics", "events"),
+        *,
+        maxsize: int = 256,
+        overflow: OverflowPolicy = "drop_oldest",
+        max_samples: int | None = None,
+        callback: Callable[[dict[str, Any]], None] | None = None,
+        on_close: Callable[[Subscription], None] | None = None,
+    ) -> None:
+        kinds = tuple(kinds)
+        unknown = set(kinds) - set(SUBSCRIPTION_KINDS)
+        if unknown:
+            raise ValueError(f"Unknown subscription kinds: {sorted(unknown)}")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        if maxsize <= 0:
+            raise ValueError("Subscription maxsize must be positive.")
+        self.kinds = frozenset(kinds)
+        self.maxsize = int(maxsize)
+        self.overflow = overflow
+        self.max_samples = max_samples
+        self._callback = callback
+        self._on_close = on_close
+        self._cond = threading.Condition()
+        self._queue: deque[_Entry] = deque()
+        self._waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future[None]]] = []
+        self._closed = False
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.samples_dropped = 0
+        self.callback_errors = 0
+
+    def __enter__(self) -> Subscription:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def publish(self, message: dict[str, Any]) -> None:
+        """Producer side (engine threads). Never blocks on the consumer."""
+        if self._closed or message["kind"] not in self.kinds:
+            return
+        if self._callback is not None:
+            try:
+                self._callback(message)
+                self.delivered += 1
+            except Exception:
+                self.callback_errors += 1
+            return
+        with self._cond:
+            self._enqueue(message)
+            self._cond.notify()
+            waiters, self._waiters = self._waiters, []
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_wake, future)
+
+    def get(self, timeout: float | None = None) -> dict[str, Any] | None:
+        """Next message; None on timeout or once closed and drained."""
+        with self._cond:
+            if not self._queue and not self._closed:
+                self._cond.wait_for(lambda: self._queue or self._closed, timeout)
+            return self._pop()
+
+    def get_nowait(self) -> dict[str, Any] | None:
+        with self._cond:
+            return self._pop()
+
+    def drain(self) -> list[dict[str, Any]]:
+        """All pending messages, oldest first."""
+        with self._cond:
+            out = []
+            while self._queue:
+                out.append(self._pop())
+            return out
+
+    async def aget(self, timeout: float | None = None) -> dict[str, Any] | None:
+        """Async `get`: awaits the next message without blocking the loop."""
+        try:
+            return await asyncio.wait_for(self.__anext__(), timeout)
+        except (asyncio.TimeoutError, StopAsyncIteration):
+            return None
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        while True:
+            message = self.get()
+            if message is None:
+                return
+            yield message
+
+    def __aiter__(self) -> Subscription:
+        return self
+
+    async def __anext__(self) -> dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self._queue:
+                    return self._pop()
+                if self._closed:
+                    raise StopAsyncIteration
+                future: asyncio.Future[None] = loop.create_future()
+                self._waiters.append((loop, future))
+            await future
+
+    def close(self) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+            waiters, self._waiters = self._waiters, []
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_wake, future)
+        if self._on_close is not None:
+            self._on_close(self)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "kinds": sorted(self.kinds),
+            "depth": len(self._queue),
+            "maxsize": self.maxsize,
+            "overflow": self.overflow,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "samples_dropped": self.samples_dropped,
+        }
+
+    def _enqueue(self, message: dict[str, Any]) -> None:
+        if len(self._queue) >= self.maxsize and self.overflow == "coalesce":
+            for entry in reversed(self._queue):
+                if entry.kind == message["kind"]:
+                    if entry.absorb(message):
+                        self.coalesced += 1
+                        self._trim(entry)
+                        return
+                    break
+        self._queue.append(_Entry(message))
+        if len(self._queue) > self.maxsize:
+            dropped = self._queue.popleft()
+            self.dropped += len(dropped.parts)
+            self.samples_dropped += dropped.rows
+
+    def _trim(self, entry: _Entry) -> None:
+        if not self.max_samples:
+            return
+        while entry.rows > self.max_samples and len(entry.parts) > 1:
+            oldest = entry.parts.pop(0)
+            entry.rows -= len(oldest["uv"])
+            self.samples_dropped += len(oldest["uv"])
+
+    def _pop(self) -> dict[str, Any] | None:
+        if not self._queue:
+            return None
+        self.delivered += 1
+        return _merge_parts(self._queue.popleft().parts)
+
+
+def _wake(future: asyncio.Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
@@ -5,8 +5,25 @@ import json
 
 import reflex as rx
 
+from pendulum_eeg.analysis import SIGNAL_VIEW_ORDER
+from pendulum_eeg.async_engine import AsyncEEGEngine
 from pendulum_eeg.reflex_bridge import get_engine
 
+try:
+    from reflex.vars.function import FunctionStringVar
+except ImportError:  # pragma: no cover - reflex < 0.6
+    FunctionStringVar = None
+
+# Rows per chart sent to the browser; wider windows are min/max decimated.
+DISPLAY_POINTS = 2_000
+# Envelope points for the whole-session overview (served by the engine pyramid).
+SESSION_OVERVIEW_POINTS = 800
+# Longest the poll loop sleeps without engine activity before rechecking its flags.
+WAKEUP_TIMEOUT_S = 2.0
+# Compact transport: int16 columnar payloads decoded in the browser by
+# assets/pendulum_payload.js.
+COMPACT_TRANSPORT_AVAILABLE = FunctionStringVar is not None
+
 def _clamp_int(value: str | int, min_v: int, max_v: int, fallback: int) -> int:
     try:
         parsed = int(value)
@@ -42,6 +59,7 @@ class DashboardState(rx.State):
     errors_total: int = 0
     parse_error_count: int = 0
     rx_bytes_total: int = 0
+    perf_hotspot: str = "-"
 
     # Metrics
     focus_score: float = 0.0
@@ -61,6 +79,18 @@ class DashboardState(rx.State):
     alpha_signal_points: list[dict[str, float]] = []
     theta_signal_points: list[dict[str, float]] = []
     delta_signal_points: list[dict[str, float]] = []
+    session_overview_points: list[dict[str, float]] = []
+    session_zoom_points: list[dict[str, float]] = []
+    session_zoom_label: str = "Drag the overview brush to zoom"
+    signal_tab: str = "raw"
+    compact_transport: bool = False
+    payload_bytes: int = 0
+    raw_payload: dict = {}
+    gamma_payload: dict = {}
+    beta_payload: dict = {}
+    alpha_payload: dict = {}
+    theta_payload: dict = {}
+    delta_payload: dict = {}
     band_points: list[dict[str, float | str]] = [
         {"band": "delta", "power": 0.0},
         {"band": "theta", "power": 0.0},
@@ -75,6 +105,9 @@ class DashboardState(rx.State):
     # Sidebar active tab
     sidebar_tab: str = "connection"
 
+    # Backend-only cursor for engine.get_updates (append-only polling)
+    _update_cursor: dict[str, int] = {}
+
     def set_port(self, value: str) -> None:
         self.port = value
 
@@ -145,17 +178,67 @@ class DashboardState(rx.State):
             return DashboardState.poll_loop
         return None
 
-    def connect(self):
+    def toggle_compact_transport(self) -> None:
+        if not COMPACT_TRANSPORT_AVAILABLE:
+            self.status_message = "Compact transport needs reflex >= 0.6."
+            return
+        self.compact_transport = not self.compact_transport
+        self._update_cursor = {}
+
+    def set_signal_tab(self, value: str) -> None:
+        self.signal_tab = value
+        # The newly shown band may not be streaming yet; start from a reset.
+        self._update_cursor = {}
+        if value == "session":
+            self._refresh_session_overview()
+
+    def set_session_brush(self, start_index: int, end_index: int) -> None:
+        points = self.session_overview_points
+        if not points:
+            return
+        start = max(0, min(len(points) - 1, int(start_index)))
+        end = max(start, min(len(points) - 1, int(end_index)))
+        t0 = float(points[start]["x"])
+        t1 = float(points[end]["x"])
+        try:
+            zoom = get_engine().get_range(
+                t0, t1, max_points=DISPLAY_POINTS, include_rows=True
+            )
+        except Exception as exc:
+            self.status_message = f"Zoom error: {exc}"
+            return
+        self.session_zoom_points = list(zoom["plot_points"])
+        bucket = int(zoom["bucket_samples"])
+        self.session_zoom_label = (
+            f"{t0:.1f}s - {t1:.1f}s, "
+            + ("every sample" if bucket == 1 else f"min/max per {bucket} samples")
+        )
+
+    def _refresh_session_overview(self) -> None:
+        try:
+            overview = get_engine().get_range(
+                0.0, None, max_points=SESSION_OVERVIEW_POINTS, include_rows=True
+            )
+        except Exception:
+            return
+        self.session_overview_points = list(overview["plot_points"])
+
+    async def connect(self):
         engine = get_engine()
         baud = int(self.baud or "921600")
-        engine.start(
+        options = dict(
             port=(self.port.strip() or None),
             baud=baud,
             simulate=self.simulate,
             auto_start_stream=True,
             reset_data=True,
         )
-        snapshot = engine.get_snapshot(max_points=10, event_limit=20)
+        if isinstance(engine, AsyncEEGEngine):
+            # Serial reads are then driven by this server's event loop.
+            await engine.start_async(**options)
+        else:
+            engine.start(**options)
+        snapshot = engine.get_snapshot(max_points=10, event_limit=20, views=())
         self.connected = bool(snapshot["connected"])
         self.status_message = str(snapshot["status_message"])
         if bool(snapshot["running"]) and self.auto_refresh and not self.poll_running:
@@ -163,18 +246,24 @@ class DashboardState(rx.State):
             return DashboardState.poll_loop
         return None
 
-    def disconnect(self) -> None:
+    async def disconnect(self) -> None:
         self.poll_running = False
         engine = get_engine()
-        engine.stop()
-        snapshot = engine.get_snapshot(max_points=5, event_limit=10)
+        if isinstance(engine, AsyncEEGEngine):
+            await engine.stop_async()
+        else:
+            engine.stop()
+        snapshot = engine.get_snapshot(max_points=5, event_limit=10, views=())
         self.connected = bool(snapshot["connected"])
         self.status_message = str(snapshot["status_message"])
 
     def refresh_once(self) -> None:
         self._consume_snapshot(
             get_engine().get_snapshot(
-                max_points=self._points_window_int(), event_limit=80
+                max_points=self._points_window_int(),
+                event_limit=80,
+                target_points=DISPLAY_POINTS,
+                views=self._active_views(),
             )
         )
 
@@ -217,21 +306,71 @@ class DashboardState(rx.State):
 
     @rx.event(background=True)
     async def poll_loop(self):
-        while True:
-            async with self:
-                should_run = self.poll_running and self.auto_refresh
-                interval_s = max(0.05, float(self.refresh_ms or "250") / 1000.0)
-                points_window = self._points_window_int()
-            if not should_run:
-                break
-            snapshot = get_engine().get_snapshot(
-                max_points=points_window, event_limit=100
-            )
-            async with self:
-                self._consume_snapshot(snapshot)
-                if not bool(snapshot["running"]):
-                    self.poll_running = False
-            await asyncio.sleep(interval_s)
+        # Only used as a wake-up: after each tick the loop sleeps one refresh
+        # interval, then waits until the engine has something new, so an idle
+        # or stopped stream costs no polling.
+        wakeups = get_engine().subscribe(
+            kinds=("samples", "events", "status"), maxsize=1, overflow="coalesce"
+        )
+        try:
+            while True:
+                async with self:
+                    should_run = self.poll_running and self.auto_refresh
+                    interval_s = max(0.05, float(self.refresh_ms or "250") / 1000.0)
+                    points_window = self._points_window_int()
+                    cursor = dict(self._update_cursor)
+                    session_tab = self.signal_tab == "session"
+                    compact = self.compact_transport
+                    views = self._active_views()
+                if not should_run:
+                    break
+                if compact:
+                    updates = get_engine().get_snapshot(
+                        max_points=points_window,
+                        event_limit=100,
+                        target_points=DISPLAY_POINTS,
+                        payload_format="int16",
+                        views=views,
+                    )
+                elif points_window > DISPLAY_POINTS:
+                    # Decimated snapshots are shared between tabs by the engine cache.
+                    updates = get_engine().get_snapshot(
+                        max_points=points_window,
+                        event_limit=100,
+                        target_points=DISPLAY_POINTS,
+                        views=views,
+                    )
+                else:
+                    updates = get_engine().get_updates(
+                        cursor=cursor,
+                        max_points=points_window,
+                        event_limit=100,
+                        views=views,
+                    )
+                perf = get_engine().get_perf_stats()
+                async with self:
+                    self.perf_hotspot = _perf_hotspot(perf)
+                    if "cursor" in updates:
+                        self._consume_updates(updates, points_window)
+                    else:
+                        self._consume_snapshot(updates)
+                    if session_tab:
+                        self._refresh_session_overview()
+                    if not bool(updates["running"]):
+                        self.poll_running = False
+                await asyncio.sleep(interval_s)
+                if not len(wakeups):
+                    await wakeups.aget(timeout=WAKEUP_TIMEOUT_S)
+                wakeups.drain()
+        finally:
+            wakeups.close()
+
+    def _active_views(self) -> tuple[str, ...]:
+        # Only the visible tab is filtered and serialized; the session tab
+        # draws from get_range and needs no live view.
+        if self.signal_tab in SIGNAL_VIEW_ORDER:
+            return (self.signal_tab,)
+        return ()
 
     def _points_window_int(self) -> int:
         try:
@@ -240,6 +379,82 @@ class DashboardState(rx.State):
             return 1500
 
     def _consume_snapshot(self, snapshot: dict) -> None:
+        self._consume_status(snapshot)
+
+        signal_plot_points = snapshot.get("signal_plot_points", {})
+        self.raw_signal_points = list(
+            signal_plot_points.get("raw", snapshot.get("plot_points", []))
+        )
+        self.gamma_signal_points = list(signal_plot_points.get("gamma", []))
+        self.beta_signal_points = list(signal_plot_points.get("beta", []))
+        self.alpha_signal_points = list(signal_plot_points.get("alpha", []))
+        self.theta_signal_points = list(signal_plot_points.get("theta", []))
+        self.delta_signal_points = list(signal_plot_points.get("delta", []))
+        self.plot_points = list(self.raw_signal_points)
+        payloads = snapshot.get("signal_payloads")
+        if payloads is not None:
+            self.raw_payload = payloads.get("raw", {})
+            self.gamma_payload = payloads.get("gamma", {})
+            self.beta_payload = payloads.get("beta", {})
+            self.alpha_payload = payloads.get("alpha", {})
+            self.theta_payload = payloads.get("theta", {})
+            self.delta_payload = payloads.get("delta", {})
+            self.payload_bytes = int(snapshot.get("payload_bytes", 0))
+        else:
+            self.payload_bytes = _rows_size(signal_plot_points)
+        self.event_lines = [
+            f"{evt.get('level', 'INFO')}: {evt.get('message', '')}"
+            for evt in snapshot.get("events", [])
+        ]
+        # Snapshot x values are window-relative; restart the update stream.
+        self._update_cursor = {}
+
+    def _consume_updates(self, updates: dict, points_window: int) -> None:
+        """Append the rows/events from engine.get_updates and trim to the window."""
+        self._consume_status(updates)
+        self._update_cursor = dict(updates.get("cursor", {}))
+        reset = bool(updates.get("reset", True))
+
+        def merged(current: list, new_rows: list) -> list:
+            if reset:
+                return list(new_rows[-points_window:])
+            if not new_rows:
+                return current
+            return (current + new_rows)[-points_window:]
+
+        signal_plot_points = updates.get("signal_plot_points", {})
+        self.raw_signal_points = merged(
+            self.raw_signal_points, signal_plot_points.get("raw", [])
+        )
+        self.gamma_signal_points = merged(
+            self.gamma_signal_points, signal_plot_points.get("gamma", [])
+        )
+        self.beta_signal_points = merged(
+            self.beta_signal_points, signal_plot_points.get("beta", [])
+        )
+        self.alpha_signal_points = merged(
+            self.alpha_signal_points, signal_plot_points.get("alpha", [])
+        )
+        self.theta_signal_points = merged(
+            self.theta_signal_points, signal_plot_points.get("theta", [])
+        )
+        self.delta_signal_points = merged(
+            self.delta_signal_points, signal_plot_points.get("delta", [])
+        )
+        self.plot_points = self.raw_signal_points
+        # Size of the rows applied this tick, not of the merged charts.
+        self.payload_bytes = _rows_size(signal_plot_points)
+
+        new_lines = [
+            f"{evt.get('level', 'INFO')}: {evt.get('message', '')}"
+            for evt in updates.get("events", [])
+        ]
+        if reset:
+            self.event_lines = new_lines
+        elif new_lines:
+            self.event_lines = (self.event_lines + new_lines)[-100:]
+
+    def _consume_status(self, snapshot: dict) -> None:
         self.connected = bool(snapshot.get("connected", False))
         self.status_message = str(snapshot.get("status_message", ""))
         self.samples_total = int(snapshot.get("samples_total", 0))
@@ -265,27 +480,47 @@ class DashboardState(rx.State):
             {"band": "Beta", "power": self.beta_power},
             {"band": "Gamma", "power": self.gamma_power},
         ]
-
-        signal_plot_points = snapshot.get("signal_plot_points", {})
-        self.raw_signal_points = list(
-            signal_plot_points.get("raw", snapshot.get("plot_points", []))
-        )
-        self.gamma_signal_points = list(signal_plot_points.get("gamma", []))
-        self.beta_signal_points = list(signal_plot_points.get("beta", []))
-        self.alpha_signal_points = list(signal_plot_points.get("alpha", []))
-        self.theta_signal_points = list(signal_plot_points.get("theta", []))
-        self.delta_signal_points = list(signal_plot_points.get("delta", []))
-        self.plot_points = list(self.raw_signal_points)
         self.latest_sample_json = json.dumps(
             snapshot.get("latest_sample", {}), ensure_ascii=False, indent=2
         )
-        self.event_lines = [
-            f"{evt.get('level', 'INFO')}: {evt.get('message', '')}"
-            for evt in snapshot.get("events", [])
-        ]
         self.parse_error_lines = [str(x) for x in snapshot.get("parse_errors", [])]
 
 
+def _json_size(value) -> int:
+    return len(json.dumps(value, separators=(",", ":")))
+
+
+def _rows_size(signal_plot_points: dict) -> int:
+    """Approximate JSON size of plot rows: first row's size times the row count."""
+    return sum(
+        _json_size(rows[0]) * len(rows) + 2
+        for rows in signal_plot_points.values()
+        if rows
+    )
+
+
+def _perf_hotspot(stats: dict) -> str:
+    """Engine stage with the highest p99, e.g. "handle 1.20 ms"."""
+    # serial_read is mostly time spent waiting for bytes, not work.
+    timings = {
+        stage: timing
+        for stage, timing in stats.get("stages", {}).items()
+        if stage != "serial_read" and timing["count"]
+    }
+    if not timings:
+        return "-"
+    stage = max(timings, key=lambda name: timings[name]["p99_us"])
+    return f"{stage} {timings[stage]['p99_us'] / 1e3:.2f} ms"
+
+
+def _chart_data(rows_var, payload_var):
+    """Rows as-is, or the browser-side decode of a compact payload."""
+    if not COMPACT_TRANSPORT_AVAILABLE:
+        return rows_var
+    decoded = FunctionStringVar.create("decodePendulumPayload").call(payload_var)
+    return rx.cond(DashboardState.compact_transport, decoded, rows_var)
+
+
 def _section_label(text: str, icon_tag: str) -> rx.Component:
     """Small section label with icon used inside the sidebar."""
     return rx.hstack(
@@ -381,6 +616,16 @@ def _sidebar_connection() -> rx.Component:
             spacing="2",
             align_items="center",
         ),
+        rx.hstack(
+            rx.switch(
+                checked=DashboardState.compact_transport,
+                on_change=lambda _: DashboardState.toggle_compact_transport(),
+                color_scheme="cyan",
+            ),
+            rx.text("Compact Transport", size="2", weight="medium"),
+            spacing="2",
+            align_items="center",
+        ),
         rx.separator(size="4"),
         rx.vstack(
             rx.tooltip(
@@ -616,13 +861,16 @@ def stats_row() -> rx.Component:
         _stat_card("Focus", DashboardState.focus_score, "crosshair", "orange"),
         _stat_card("Relax", DashboardState.relax_score, "cloud", "green"),
         _stat_card("Engagement", DashboardState.engagement_ratio, "flame", "crimson"),
-        columns=rx.breakpoints(initial="2", sm="3", lg="6"),
+        _stat_card("Payload B/tick", DashboardState.payload_bytes, "gauge", "gray"),
+        _stat_card("Slowest stage p99", DashboardState.perf_hotspot, "timer", "amber"),
+        columns=rx.breakpoints(initial="2", sm="4", lg="8"),
         spacing="3",
         width="100%",
     )
 
 
-def eeg_chart(title: str, subtitle: str, data_points) -> rx.Component:
+def eeg_chart(title: str, subtitle, data_points, on_brush=None) -> rx.Component:
+    brush_props = {"on_change": on_brush} if on_brush is not None else {}
     return rx.card(
         rx.vstack(
             rx.hstack(
@@ -647,7 +895,7 @@ def eeg_chart(title: str, subtitle: str, data_points) -> rx.Component:
                 rx.recharts.line(data_key="ch2_uv", stroke="#f59e0b", type_="monotone", dot=False, stroke_width=1.5, name="CH2 Right Eyebrow"),
                 rx.recharts.line(data_key="ch3_uv", stroke="#3b82f6", type_="monotone", dot=False, stroke_width=1.5, name="C3 Back Left"),
                 rx.recharts.line(data_key="ch4_uv", stroke="#10b981", type_="monotone", dot=False, stroke_width=1.5, name="C4 Back Right"),
-                rx.recharts.brush(data_key="x", height=20, stroke="#888"),
+                rx.recharts.brush(data_key="x", height=20, stroke="#888", **brush_props),
                 data=data_points,
                 height=DashboardState.line_chart_height,
             ),
@@ -696,13 +944,21 @@ def eeg_signal_tabs() -> rx.Component:
             rx.tabs.trigger("Alpha", value="alpha"),
             rx.tabs.trigger("Theta", value="theta"),
             rx.tabs.trigger("Delta", value="delta"),
+            rx.tabs.trigger("Session", value="session"),
             size="1",
             style={"flexWrap": "wrap", "rowGap": "0.4rem"},
         ),
         rx.tabs.content(
             rx.vstack(
                 electrode_positions_card(),
-                eeg_chart("Raw EEG", "Unfiltered microvolts", DashboardState.raw_signal_points),
+                eeg_chart(
+                    "Raw EEG",
+                    "Unfiltered microvolts",
+                    _chart_data(
+                        DashboardState.raw_signal_points,
+                        DashboardState.raw_payload,
+                    ),
+                ),
                 spacing="3",
                 width="100%",
             ),
@@ -710,31 +966,86 @@ def eeg_signal_tabs() -> rx.Component:
             padding_top="0.75rem",
         ),
         rx.tabs.content(
-            eeg_chart("Gamma", "Band-pass 30-45 Hz", DashboardState.gamma_signal_points),
+            eeg_chart(
+                "Gamma",
+                "Band-pass 30-45 Hz",
+                _chart_data(
+                    DashboardState.gamma_signal_points,
+                    DashboardState.gamma_payload,
+                ),
+            ),
             value="gamma",
             padding_top="0.75rem",
         ),
         rx.tabs.content(
-            eeg_chart("Beta", "Band-pass 12-30 Hz", DashboardState.beta_signal_points),
+            eeg_chart(
+                "Beta",
+                "Band-pass 12-30 Hz",
+                _chart_data(
+                    DashboardState.beta_signal_points,
+                    DashboardState.beta_payload,
+                ),
+            ),
             value="beta",
             padding_top="0.75rem",
         ),
         rx.tabs.content(
-            eeg_chart("Alpha", "Band-pass 8-12 Hz", DashboardState.alpha_signal_points),
+            eeg_chart(
+                "Alpha",
+                "Band-pass 8-12 Hz",
+                _chart_data(
+                    DashboardState.alpha_signal_points,
+                    DashboardState.alpha_payload,
+                ),
+            ),
             value="alpha",
             padding_top="0.75rem",
         ),
         rx.tabs.content(
-            eeg_chart("Theta", "Band-pass 4-8 Hz", DashboardState.theta_signal_points),
+            eeg_chart(
+                "Theta",
+                "Band-pass 4-8 Hz",
+                _chart_data(
+                    DashboardState.theta_signal_points,
+                    DashboardState.theta_payload,
+                ),
+            ),
             value="theta",
             padding_top="0.75rem",
         ),
         rx.tabs.content(
-            eeg_chart("Delta", "Band-pass 1-4 Hz", DashboardState.delta_signal_points),
+            eeg_chart(
+                "Delta",
+                "Band-pass 1-4 Hz",
+                _chart_data(
+                    DashboardState.delta_signal_points,
+                    DashboardState.delta_payload,
+                ),
+            ),
             value="delta",
             padding_top="0.75rem",
         ),
-        default_value="raw",
+        rx.tabs.content(
+            rx.vstack(
+                eeg_chart(
+                    "Session Overview",
+                    "Min/max envelope, whole history",
+                    DashboardState.session_overview_points,
+                    on_brush=DashboardState.set_session_brush,
+                ),
+                eeg_chart(
+                    "Session Zoom",
+                    DashboardState.session_zoom_label,
+                    DashboardState.session_zoom_points,
+                ),
+                spacing="3",
+                width="100%",
+            ),
+            value="session",
+            padding_top="0.75rem",
+        ),
+        value=DashboardState.signal_tab,
+        on_change=DashboardState.set_signal_tab,
         width="100%",
     )
 
@@ -975,6 +1286,7 @@ def index() -> rx.Component:
 
 
 app = rx.App(
+    head_components=[rx.script(src="/pendulum_payload.js")],
     theme=rx.theme(
         appearance="dark",
         accent_color="iris",
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from pendulum_eeg.clock_sync import ClockSync, corrected_host_times
+
+HOST0 = 1_700_000_000.0
+DRIFT_PPM = 40.0
+
+
+def _reads(n: int, seed: int = 0, period_us: int = 20_000) -> tuple[np.ndarray, np.ndarray]:
+    """Device times of n reads and host arrival times with drift plus small jitter."""
+    rng = np.random.default_rng(seed)
+    device_us = np.arange(1, n + 1, dtype=np.int64) * period_us
+    host = HOST0 + device_us / 1e6 * (1.0 + DRIFT_PPM * 1e-6) + 0.002 + rng.uniform(0.0, 2e-4, n)
+    return device_us, host
+
+
+def test_fits_drift_and_rejects_buffered_reads():
+    device_us, host = _reads(3_000)
+    late = np.arange(100, 3_000, 97)
+    host[late] += 0.05  # reads that sat in a driver buffer
+
+    clock = ClockSync()
+    accepted = [clock.update(int(d), float(h)) for d, h in zip(device_us, host)]
+
+    stats = clock.stats()
+    assert clock.synced
+    assert not any(accepted[i] for i in late)
+    assert stats["outliers"] == len(late)
+    assert stats["resets"] == 0
+    assert stats["drift_ppm"] == pytest.approx(DRIFT_PPM, abs=2.0)
+    assert stats["jitter_ms"] < 1.0
+    assert stats["latency_p99_ms"] < 1.0
+
+    # Mapped times sit on the fastest deliveries, not on the late ones.
+    mapped = clock.to_host(device_us[-200:])
+    ideal = HOST0 + device_us[-200:] / 1e6 * (1.0 + DRIFT_PPM * 1e-6) + 0.002
+    assert np.abs(mapped - ideal).max() < 1e-4
+
+
+def test_host_clock_step_resets_fit():
+    device_us, host = _reads(600, seed=1)
+    host[300:] += 2.0  # host clock jumped
+    clock = ClockSync(reset_after_outliers=32)
+    for d, h in zip(device_us, host):
+        clock.update(int(d), float(h))
+
+    assert clock.resets == 1
+    assert clock.synced
+    assert clock.to_host(int(device_us[-1])) == pytest.approx(host[-1], abs=1e-3)
+
+
+def test_unsynced_clock_maps_to_nan():
+    clock = ClockSync()
+    assert np.isnan(clock.to_host(np.array([1, 2]))).all()
+    assert clock.stats()["latency_p50_ms"] == 0.0
+
+
+def test_corrected_host_times_ignore_late_reads():
+    device_us, host = _reads(400, seed=2, period_us=40_000)
+    host[::37] += 0.03
+    samples_per_read = 10
+    t_us = (device_us[:, None] - 4_000 * np.arange(samples_per_read)[::-1]).ravel()
+    host_s = np.repeat(host, samples_per_read)
+
+    corrected = corrected_host_times(t_us.astype(np.uint32), host_s)
+    ideal = HOST0 + t_us / 1e6 * (1.0 + DRIFT_PPM * 1e-6) + 0.002
+    assert np.abs(corrected - ideal).max() < 2e-4
+    np.testing.assert_allclose(np.diff(corrected), 0.004 * (1.0 + DRIFT_PPM * 1e-6), atol=1e-6)
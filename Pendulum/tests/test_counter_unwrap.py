@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import numpy as np
+
+from pendulum_eeg.clock_sync import T_US_MODULUS, CounterUnwrapper
+from pendulum_eeg.engine import EEGEngine, EngineConfig
+from pendulum_eeg.firmware_protocol import encode_sample_frames
+from pendulum_eeg.simulator import EEGSimulator
+
+
+def test_wrap_across_blocks_stays_monotonic():
+    raw = (np.arange(T_US_MODULUS - 30, T_US_MODULUS + 30, 4, dtype=np.int64) % T_US_MODULUS).astype(np.uint32)
+    unwrapper = CounterUnwrapper()
+    assert unwrapper.last is None
+
+    out = np.concatenate([unwrapper.unwrap(raw[:5]), unwrapper.unwrap(raw[5:9]), unwrapper.unwrap(raw[9:])])
+    np.testing.assert_array_equal(out, np.arange(T_US_MODULUS - 30, T_US_MODULUS + 30, 4))
+    assert unwrapper.restarts == 0
+    assert unwrapper.last == out[-1]
+
+
+def test_restart_resumes_one_past_last_value():
+    unwrapper = CounterUnwrapper()
+    out, segments = unwrapper.unwrap_segments(np.array([1_000, 1_004, 1_008, 0, 4, 8]))
+    np.testing.assert_array_equal(out, [1_000, 1_004, 1_008, 1_009, 1_013, 1_017])
+    np.testing.assert_array_equal(segments, [0, 0, 0, 1, 1, 1])
+
+    out, segments = unwrapper.unwrap_segments(np.array([12, 2]))
+    np.testing.assert_array_equal(out, [1_021, 1_022])
+    np.testing.assert_array_equal(segments, [1, 2])
+    assert unwrapper.restarts == 2
+
+
+def test_forward_gaps_are_kept_and_reset_forgets_history():
+    unwrapper = CounterUnwrapper(modulus=1 << 16)
+    np.testing.assert_array_equal(unwrapper.unwrap(np.array([65_530, 5, 20_000])), [65_530, 65_541, 85_536])
+    assert len(unwrapper.unwrap(np.array([], dtype=np.int64))) == 0
+
+    unwrapper.reset()
+    assert unwrapper.last is None and unwrapper.restarts == 0
+    np.testing.assert_array_equal(unwrapper.unwrap(np.array([7, 8])), [7, 8])
+
+
+def test_engine_unwraps_sample_index_and_reports_gaps(tmp_path):
+    samples = EEGSimulator(seed=11).next_block(600)
+    start = T_US_MODULUS - 300
+    index = np.arange(start, start + 600, dtype=np.int64)
+    index[400:] += 10  # ten samples lost after the wrap
+    samples["sample_index"] = (index % T_US_MODULUS).astype(samples["sample_index"].dtype)
+    frames = encode_sample_frames(samples)
+
+    engine = EEGEngine(EngineConfig(archive_dir=str(tmp_path)))
+    try:
+        for offset in range(0, 600, 50):
+            engine._consume_rx_bytes(frames[offset : offset + 50].tobytes())
+        window = engine.get_range(0.0, None, max_points=2_000)
+        status = engine.get_status()
+        gaps = engine.get_gaps()
+    finally:
+        engine.close()
+
+    x = window["x"] * engine.config.sample_rate_hz
+    np.testing.assert_allclose(x, index - start, atol=1e-6)
+    assert np.all(np.diff(x) > 0)
+    assert status["counter_restarts"] == 0
+    assert (status["gaps_total"], status["samples_missing_total"]) == (1, 10)
+    assert len(gaps["gaps"]) == 1
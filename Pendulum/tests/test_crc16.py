@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from pendulum_eeg.firmware_protocol import _CRC_BATCH_MIN_ROWS, crc16_ccitt, crc16_ccitt_batch
+
+
+def test_known_check_value():
+    # CRC-16/CCITT-FALSE check value.
+    assert crc16_ccitt(b"123456789") == 0x29B1
+    assert crc16_ccitt(b"") == 0xFFFF
+
+
+@pytest.mark.parametrize("n_rows", [1, _CRC_BATCH_MIN_ROWS - 1, _CRC_BATCH_MIN_ROWS, 500])
+def test_batch_matches_scalar(n_rows):
+    rows = np.random.default_rng(n_rows).integers(0, 256, size=(n_rows, 42), dtype=np.uint8)
+
+    batch = crc16_ccitt_batch(rows)
+
+    assert batch.dtype == np.uint16
+    assert batch.tolist() == [crc16_ccitt(row.tobytes()) for row in rows]
+
+
+def test_batch_of_zero_rows_and_bad_shape():
+    assert crc16_ccitt_batch(np.zeros((0, 42), dtype=np.uint8)).shape == (0,)
+    with pytest.raises(ValueError):
+        crc16_ccitt_batch(np.zeros(42, dtype=np.uint8))
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from pendulum_eeg.decimation import decimate_views, lttb_indices, minmax_indices
+
+
+def _signals(n: int, n_channels: int, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).normal(size=(n, n_channels)).cumsum(axis=0)
+
+
+@pytest.mark.parametrize("n_channels", [1, 4, 24])
+def test_minmax_fills_but_never_exceeds_budget(n_channels):
+    y = _signals(5_000, n_channels)
+
+    keep = minmax_indices(y, 200)
+
+    assert 180 <= len(keep) <= 200
+    assert keep[0] == 0 and keep[-1] == len(y) - 1
+    assert np.all(np.diff(keep) > 0)
+    kept = set(keep.tolist())
+    assert set(y.argmin(axis=0).tolist()) <= kept
+    assert set(y.argmax(axis=0).tolist()) <= kept
+
+
+def test_minmax_keeps_short_input():
+    assert list(minmax_indices(np.zeros((50, 4)), 200)) == list(range(50))
+
+
+def test_lttb_returns_exactly_target():
+    y = _signals(3_000, 4)
+    x = np.arange(len(y)) / 250.0
+
+    keep = lttb_indices(x, y, 200)
+
+    assert len(keep) == 200
+    assert keep[0] == 0 and keep[-1] == len(y) - 1
+    assert np.all(np.diff(keep) > 0)
+
+
+@pytest.mark.parametrize("method", ["minmax", "lttb"])
+def test_views_share_one_x_grid(method):
+    x = np.arange(4_000) / 250.0
+    views = {"raw": 100.0 * _signals(len(x), 4, 1), "alpha": _signals(len(x), 4, 2), "beta": _signals(len(x), 4, 3)}
+
+    reduced = decimate_views(x, views, 300, method)
+
+    grids = [reduced[name][0] for name in views]
+    assert 270 <= len(grids[0]) <= 300
+    for name in views:
+        np.testing.assert_array_equal(reduced[name][0], grids[0])
+        assert reduced[name][1].shape == (len(grids[0]), 4)
+    if method == "minmax":
+        keep = np.searchsorted(x, grids[0])
+        for name, matrix in views.items():
+            assert set(matrix.argmax(axis=0).tolist()) <= set(keep.tolist())
+
+
+def test_views_untouched_below_target():
+    x = np.arange(100.0)
+    views = {"raw": _signals(100, 4)}
+    reduced = decimate_views(x, views, 300)
+    assert reduced["raw"][0] is x and reduced["raw"][1] is views["raw"]
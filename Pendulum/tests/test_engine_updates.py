@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from pendulum_eeg.benchmarks.synthetic import synthetic_frames
+from pendulum_eeg.engine import EEGEngine, EngineConfig
+
+RATE = 250
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = EEGEngine(EngineConfig(sample_rate_hz=RATE, archive_dir=str(tmp_path)))
+    yield engine
+    engine.close()
+
+
+@pytest.fixture
+def frames():
+    return synthetic_frames(3_000, sample_rate_hz=RATE, seed=7)
+
+
+def _feed(engine: EEGEngine, frames: np.ndarray, start: int, stop: int, read: int = 25) -> None:
+    for offset in range(start, stop, read):
+        engine._consume_rx_bytes(frames[offset : min(stop, offset + read)].tobytes())
+
+
+def _column(points: list[dict[str, float]], key: str) -> np.ndarray:
+    return np.array([point[key] for point in points])
+
+
+def test_cursor_returns_only_new_rows(engine, frames):
+    _feed(engine, frames, 0, 500)
+    first = engine.get_updates(max_points=200, views=("raw",))
+    assert first["reset"]
+    assert len(first["plot_points"]) == 200
+
+    _feed(engine, frames, 500, 560)
+    delta = engine.get_updates(first["cursor"], max_points=200, views=("raw",))
+    assert not delta["reset"]
+    x = _column(delta["plot_points"], "x")
+    assert len(x) == 60
+    np.testing.assert_allclose(x, (np.arange(500, 560)) / RATE)
+    assert x[0] == pytest.approx(_column(first["plot_points"], "x")[-1] + 1 / RATE)
+
+    idle = engine.get_updates(delta["cursor"], max_points=200, views=("raw",))
+    assert not idle["reset"] and idle["plot_points"] == []
+
+
+def test_cursor_resets_when_stale_or_foreign(engine, frames):
+    _feed(engine, frames, 0, 300)
+    cursor = engine.get_updates(max_points=100, views=("raw",))["cursor"]
+
+    _feed(engine, frames, 300, 450)  # more than max_points behind
+    behind = engine.get_updates(cursor, max_points=100, views=("raw",))
+    assert behind["reset"] and len(behind["plot_points"]) == 100
+
+    foreign = dict(behind["cursor"], session=behind["cursor"]["session"] + 1)
+    assert engine.get_updates(foreign, max_points=100, views=("raw",))["reset"]
+
+
+def test_snapshot_and_updates_share_x(engine, frames):
+    _feed(engine, frames, 0, 400)
+    snapshot = engine.get_snapshot(max_points=150, views=("raw",))
+    updates = engine.get_updates(max_points=150, views=("raw",))
+
+    np.testing.assert_allclose(_column(snapshot["plot_points"], "x"), _column(updates["plot_points"], "x"))
+    assert _column(snapshot["plot_points"], "x")[-1] == pytest.approx(399 / RATE)
+
+
+def test_new_band_resets_then_continues_without_transient(engine, frames):
+    _feed(engine, frames, 0, 1_500)
+    first = engine.get_updates(max_points=300, views=("alpha",))
+    assert first["reset"]
+
+    # The next block warms the stream up over the same history span.
+    _feed(engine, frames, 1_500, 1_525)
+    streamed = engine.get_snapshot(max_points=325, views=("alpha",))["signal_plot_points"]["alpha"]
+    for key in ("ch1_uv", "ch4_uv"):
+        np.testing.assert_allclose(
+            _column(first["signal_plot_points"]["alpha"], key),
+            _column(streamed, key)[:300],
+            rtol=1e-5,
+            atol=1e-3,
+        )
+
+    delta = engine.get_updates(first["cursor"], max_points=300, views=("alpha",))
+    assert not delta["reset"]
+    assert len(delta["signal_plot_points"]["alpha"]) == 25
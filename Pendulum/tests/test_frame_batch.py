@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import numpy as np
+
+from pendulum_eeg.firmware_protocol import (
+    PROTO_VER,
+    SAMPLE_DTYPE,
+    cobs_decode,
+    decode_frames_batch,
+    encode_packet,
+    encode_sample_frames,
+    parse_raw_packet,
+)
+from pendulum_eeg.models import EventPacket
+
+
+def _samples(n: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    samples = np.zeros(n, dtype=SAMPLE_DTYPE)
+    for name in SAMPLE_DTYPE.names:
+        info = np.iinfo(SAMPLE_DTYPE[name])
+        samples[name] = rng.integers(info.min, info.max, size=n, endpoint=True)
+    # Zero bytes and zero fields exercise the COBS code bytes.
+    samples["sample_index"][0] = 0
+    samples["ch1"][1] = 0
+    samples["ch2"][2] = -(1 << 23)
+    samples["flags"][:3] = 0x0A
+    return samples
+
+
+def _frames(samples: np.ndarray) -> list[bytes]:
+    return [bytes(row[:-1]) for row in encode_sample_frames(samples)]
+
+
+def test_encode_sample_frames_matches_encode_packet():
+    samples = _samples(40)
+    frames = encode_sample_frames(samples)
+
+    for row, sample in zip(frames, samples):
+        packet = parse_raw_packet(cobs_decode(bytes(row[:-1])))
+        assert bytes(row) == encode_packet(packet)
+        assert packet.version == PROTO_VER
+        assert tuple(getattr(packet, name) for name in SAMPLE_DTYPE.names) == sample.tolist()
+    assert (frames[:, -1] == 0).all() and (frames[:, :-1] != 0).all()
+
+
+def test_batch_decode_round_trip():
+    samples = _samples(100, seed=1)
+
+    batch = decode_frames_batch(_frames(samples))
+
+    assert batch.failures == [] and batch.events == [] and batch.errors == []
+    assert batch.samples.dtype == SAMPLE_DTYPE
+    np.testing.assert_array_equal(batch.samples, samples)
+
+
+def test_batch_decode_sorts_events_and_reports_bad_frames():
+    samples = _samples(5, seed=2)
+    frames = _frames(samples)
+    event = encode_packet(EventPacket(version=PROTO_VER, event_code=3, a=1, b=2, c=3))[:-1]
+    corrupt = bytearray(frames[2])
+    corrupt[10] ^= 0x01
+    stream = [frames[0], event, frames[1], bytes(corrupt), frames[3], b"\x01", frames[4]]
+
+    batch = decode_frames_batch(stream)
+
+    assert [packet.event_code for packet in batch.events] == [3]
+    np.testing.assert_array_equal(batch.samples, samples[[0, 1, 3, 4]])
+    assert len(batch.failures) == 2
+    assert any("CRC" in message for message in batch.failures)
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from pendulum_eeg.firmware_protocol import (
+    ADS_STATUS_HEADER_OK,
+    FLAG_STREAMING,
+    PROTO_VER,
+    FrameParser,
+    ProtocolError,
+    decode_frame,
+    encode_packet,
+)
+from pendulum_eeg.models import SamplePacket
+
+
+def _packet(sample_index: int, t_us: int) -> SamplePacket:
+    return SamplePacket(
+        version=PROTO_VER,
+        sample_index=sample_index,
+        t_us=t_us,
+        status24=ADS_STATUS_HEADER_OK,
+        ch1=1,
+        ch2=-2,
+        ch3=3,
+        ch4=-4,
+        flags=FLAG_STREAMING,
+        missed_drdy_frame=0,
+        recoveries_total=0,
+    )
+
+
+def _decode(parser: FrameParser, chunks: list[bytes]) -> tuple[list[int], list[str], list[str]]:
+    indices, lines, failures = [], [], []
+    for chunk in chunks:
+        for kind, value in parser.feed(chunk):
+            if kind == "line":
+                lines.append(value)
+            elif kind == "frame":
+                try:
+                    indices.append(decode_frame(value).sample_index)
+                except ProtocolError as exc:
+                    failures.append(str(exc))
+    return indices, lines, failures
+
+
+def test_frame_with_newline_code_byte() -> None:
+    # The first zero is t_us's top byte, so the COBS code byte is 0x0A.
+    frame = encode_packet(_packet(0x01020304, 0x00050607))
+    assert frame[0] == 0x0A
+    stream = encode_packet(_packet(1, 1)) + frame + frame
+    expected = ([1, 0x01020304, 0x01020304], [], [])
+
+    assert _decode(FrameParser(), [stream]) == expected
+    # Split right after each delimiter, so the 0x0A starts a chunk.
+    chunks = [stream[: len(frame)], stream[len(frame) : 2 * len(frame)], stream[2 * len(frame) :]]
+    assert _decode(FrameParser(), chunks) == expected
+    assert _decode(FrameParser(), [bytes([b]) for b in stream]) == expected
+
+
+def test_text_between_frames() -> None:
+    frame = encode_packet(_packet(0x01020304, 0x00050607))
+    stream = b"# boot\n\n" + frame + b"OK PING\r\n" + frame
+    for chunks in ([stream], [bytes([b]) for b in stream]):
+        assert _decode(FrameParser(), chunks) == ([0x01020304, 0x01020304], ["# boot", "OK PING"], [])
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+
+from pendulum_eeg.payload import decode_view, encode_view, payload_nbytes
+
+
+def _view(n: int = 500) -> tuple[np.ndarray, np.ndarray]:
+    # Session-relative x far from zero, as late in a long recording.
+    x = 36_000.0 + np.arange(n) / 250.0
+    matrix = np.random.default_rng(0).normal(size=(n, 4)) * np.array([5.0, 50.0, 500.0, 0.5]) + 10.0
+    return x, matrix
+
+
+def test_float32_round_trip():
+    x, matrix = _view()
+
+    decoded_x, decoded = decode_view(json.loads(json.dumps(encode_view(x, matrix, "float32"))))
+
+    np.testing.assert_allclose(decoded_x, x, rtol=0, atol=1e-4)
+    np.testing.assert_allclose(decoded, matrix, rtol=1e-6)
+
+
+def test_int16_round_trip_within_one_step_per_channel():
+    x, matrix = _view()
+    payload = encode_view(x, matrix, "int16")
+
+    decoded_x, decoded = decode_view(payload)
+
+    np.testing.assert_allclose(decoded_x, x, rtol=0, atol=1e-4)
+    step = np.ptp(matrix, axis=0) / 65534.0
+    assert (np.abs(decoded - matrix) <= step / 2 + 1e-9).all()
+    np.testing.assert_allclose(decoded.min(axis=0), matrix.min(axis=0), atol=1e-9)
+    np.testing.assert_allclose(decoded.max(axis=0), matrix.max(axis=0), atol=1e-9)
+
+
+@pytest.mark.parametrize("fmt", ["float32", "int16"])
+def test_empty_and_flat_views(fmt):
+    x, decoded = decode_view(encode_view(np.zeros(0), np.zeros((0, 4)), fmt))
+    assert x.shape == (0,) and decoded.shape == (0, 4)
+
+    flat = np.full((10, 2), 3.25)
+    _, decoded = decode_view(encode_view(np.arange(10.0), flat, fmt))
+    np.testing.assert_array_equal(decoded, flat)
+
+
+def test_int16_is_smaller_and_size_matches_fields():
+    x, matrix = _view()
+    payloads = {fmt: {"raw": encode_view(x, matrix, fmt)} for fmt in ("float32", "int16")}
+
+    sizes = {fmt: payload_nbytes(views) for fmt, views in payloads.items()}
+
+    assert sizes["int16"] < sizes["float32"]
+    raw = payloads["float32"]["raw"]
+    assert sizes["float32"] == len(raw["x"]) + len(raw["data"]) + 96
+
+
+def test_unknown_format_rejected():
+    with pytest.raises(ValueError):
+        encode_view(np.arange(3.0), np.zeros((3, 1)), "float16")  # type: ignore[arg-type]
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from pendulum_eeg.benchmarks.synthetic import synthetic_frames
+from pendulum_eeg.engine import EEGEngine, EngineConfig
+from pendulum_eeg.pyramid import MinMaxPyramid, envelope_series
+
+
+def _feed(pyramid: MinMaxPyramid, values: np.ndarray, seed: int = 0) -> None:
+    rng = np.random.default_rng(seed)
+    start = 0
+    while start < len(values):
+        stop = start + int(rng.integers(1, 50))
+        pyramid.append(values[start:stop])
+        start = stop
+
+
+def test_levels_match_brute_force_aggregation():
+    values = np.random.default_rng(0).normal(size=(3_000, 2)).astype(np.float32)
+    pyramid = MinMaxPyramid(4_096, 2, min_level=3, min_top_buckets=8)
+    _feed(pyramid, values)
+
+    for level in pyramid.levels:
+        group = 1 << level
+        lo, hi = pyramid.bucket_bounds(level)
+        assert (lo, hi) == (0, len(values) // group)
+        buckets = pyramid.buckets(level, lo, hi)
+        expected = values[: hi * group].reshape(hi, group, 2)
+        np.testing.assert_array_equal(buckets["min"], expected.min(axis=1))
+        np.testing.assert_array_equal(buckets["max"], expected.max(axis=1))
+        np.testing.assert_allclose(buckets["mean"], expected.mean(axis=1), rtol=1e-5, atol=1e-6)
+
+
+def test_levels_keep_only_the_newest_capacity():
+    values = np.arange(2_000, dtype=np.float32)[:, None]
+    pyramid = MinMaxPyramid(256, 1, min_level=3, min_top_buckets=4)
+    _feed(pyramid, values, seed=1)
+
+    lo, hi = pyramid.bucket_bounds(3)
+    assert hi == 250 and hi - lo <= 256 // 8 + 1
+    buckets = pyramid.buckets(3, 0, hi)  # clamped to what is kept
+    assert len(buckets["min"]) == hi - lo
+    assert buckets["min"][-1, 0] == 1_992 and buckets["max"][-1, 0] == 1_999
+    assert pyramid.level_for(2_000, 100) == 5
+
+
+def test_envelope_interleaves_min_and_max():
+    x, y = envelope_series(np.array([0.0, 1.0]), np.array([[1.0], [2.0]]), np.array([[3.0], [4.0]]), 1.0)
+    assert x.tolist() == [0.0, 0.5, 1.0, 1.5]
+    assert y[:, 0].tolist() == [1.0, 3.0, 2.0, 4.0]
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = EEGEngine(EngineConfig(sample_rate_hz=250, archive_dir=str(tmp_path)))
+    frames = synthetic_frames(20 * 250, seed=5)
+    for start in range(0, len(frames), 125):
+        engine._consume_rx_bytes(frames[start : start + 125].tobytes())
+    yield engine
+    engine.close()
+
+
+def _raw_uv(engine: EEGEngine) -> np.ndarray:
+    return engine._history_uv(engine._history.tail(len(engine._history), ("counts",))["counts"])
+
+
+def test_get_range_returns_samples_when_they_fit(engine):
+    result = engine.get_range(2.0, 3.0, max_points=1_000)
+
+    assert result["level"] == 0 and result["bucket_samples"] == 1
+    assert len(result["x"]) == 250
+    assert result["x"][0] == pytest.approx(2.0) and result["t0"] == pytest.approx(2.0)
+    np.testing.assert_allclose(result["min"], _raw_uv(engine)[500:750], rtol=1e-6)
+
+
+def test_get_range_envelope_from_pyramid(engine):
+    result = engine.get_range(0.0, None, max_points=200)
+    group = result["bucket_samples"]
+
+    assert result["level"] >= 3 and len(result["min"]) <= 100
+    raw = _raw_uv(engine)
+    n = len(result["min"]) * group
+    blocks = raw[:n].reshape(-1, group, raw.shape[1])
+    np.testing.assert_allclose(result["min"], blocks.min(axis=1), rtol=1e-5)
+    np.testing.assert_allclose(result["max"], blocks.max(axis=1), rtol=1e-5)
+    np.testing.assert_allclose(np.diff(result["x"]), group / 250.0)
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from pendulum_eeg.benchmarks.synthetic import split_chunks, synthetic_byte_stream
+from pendulum_eeg.engine import EEGEngine, EngineConfig
+from pendulum_eeg.raw_capture import RawCapture, RawCaptureError, RawCaptureWriter
+
+RATE = 250
+N_SAMPLES = 1_000
+
+
+@pytest.fixture
+def capture_path(tmp_path):
+    path = tmp_path / "session.pndraw"
+    writer = RawCaptureWriter(path, sample_rate_hz=RATE)
+    for i, chunk in enumerate(split_chunks(synthetic_byte_stream(N_SAMPLES, RATE, seed=5), 437)):
+        writer.write(chunk, offset_ns=i * 20_000_000)
+    writer.close()
+    return path
+
+
+def _replay(tmp_path, path, speed: float) -> EEGEngine:
+    engine = EEGEngine(EngineConfig(sample_rate_hz=RATE, archive_dir=str(tmp_path / f"archive_{speed}")))
+    engine.config.replay_speed = speed
+    assert engine.start(replay=path)
+    engine._thread.join(timeout=10.0)
+    return engine
+
+
+def test_writer_round_trip_keeps_chunks_and_offsets(capture_path):
+    chunks = split_chunks(synthetic_byte_stream(N_SAMPLES, RATE, seed=5), 437)
+    capture = RawCapture(capture_path)
+
+    assert capture.sample_rate_hz == RATE
+    records = list(capture.chunks())
+    assert [chunk for _, chunk in records] == chunks
+    assert [offset for offset, _ in records] == pytest.approx([i * 0.02 for i in range(len(chunks))])
+
+
+def test_truncated_tail_is_ignored(capture_path):
+    full = capture_path.read_bytes()
+    capture_path.write_bytes(full[:-5])
+    records = list(RawCapture(capture_path).chunks())
+    stream = synthetic_byte_stream(N_SAMPLES, RATE, seed=5)
+    assert b"".join(chunk for _, chunk in records) == stream[: 437 * len(records)]
+
+
+def test_rejects_foreign_and_short_files(tmp_path):
+    (tmp_path / "short.pndraw").write_bytes(b"PND")
+    (tmp_path / "other.pndraw").write_bytes(b"x" * 64)
+    with pytest.raises(RawCaptureError):
+        RawCapture(tmp_path / "short.pndraw")
+    with pytest.raises(RawCaptureError):
+        RawCapture(tmp_path / "other.pndraw")
+
+
+def test_replay_is_deterministic_across_speeds(tmp_path, capture_path):
+    fast = _replay(tmp_path, capture_path, 0.0)
+    paced = _replay(tmp_path, capture_path, 8.0)
+    try:
+        for engine in (fast, paced):
+            status = engine.get_status()
+            assert not status["running"]
+            assert status["samples_total"] == N_SAMPLES
+            assert status["status_message"] == "Replay finished."
+        first = fast.get_range(0.0, None, max_points=4 * N_SAMPLES)
+        second = paced.get_range(0.0, None, max_points=4 * N_SAMPLES)
+        np.testing.assert_array_equal(first["x"], second["x"])
+        np.testing.assert_array_equal(first["mean"], second["mean"])
+        assert fast.get_clock_stats() == paced.get_clock_stats()
+    finally:
+        fast.close()
+        paced.close()
+
+
+def test_engine_tee_writes_replayable_capture(tmp_path):
+    stream = synthetic_byte_stream(300, RATE, seed=9)
+    engine = EEGEngine(EngineConfig(sample_rate_hz=RATE, archive_dir=str(tmp_path / "archive")))
+    try:
+        path = engine.start_raw_capture(tmp_path / "tee.pndraw")
+        for chunk in split_chunks(stream, 100):
+            engine._tee_raw(chunk)
+        assert engine.stop_raw_capture() == path
+        engine._tee_raw(b"after stop")
+    finally:
+        engine.close()
+
+    assert b"".join(chunk for _, chunk in RawCapture(path).chunks()) == stream
+    replayed = _replay(tmp_path, path, 0.0)
+    try:
+        assert replayed.get_status()["samples_total"] == 300
+    finally:
+        replayed.close()
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from pendulum_eeg.engine import history_columns
+from pendulum_eeg.ring_buffer import ColumnarRingBuffer
+
+
+def _ring(capacity: int = 8) -> ColumnarRingBuffer:
+    return ColumnarRingBuffer(capacity, {"index": (np.int64, ()), "value": (np.float32, (2,))})
+
+
+def _block(start: int, n: int) -> dict[str, np.ndarray]:
+    index = np.arange(start, start + n, dtype=np.int64)
+    return {"index": index, "value": np.stack((index, -index), axis=1).astype(np.float32)}
+
+
+def test_append_wraps_and_keeps_newest_rows():
+    ring = _ring()
+    ring.append(_block(0, 5))
+    ring.append(_block(5, 6))
+
+    assert len(ring) == 8 and ring.total_written == 11
+    assert ring.tail(8)["index"].tolist() == list(range(3, 11))
+    assert ring.tail(3)["value"][:, 1].tolist() == [-8, -9, -10]
+    assert ring.rows(0, 6)["index"].tolist() == [3, 4, 5]
+    assert ring.latest("index") == 10
+
+
+def test_oversized_block_keeps_last_capacity_rows():
+    ring = _ring()
+    ring.append(_block(0, 3))
+    ring.append(_block(3, 20))
+
+    assert ring.tail(8)["index"].tolist() == list(range(15, 23))
+    assert ring.at("index", np.array([15, 22])).tolist() == [15, 22]
+
+
+def test_tail_is_a_view_unless_it_crosses_the_wrap():
+    ring = _ring()
+    ring.append(_block(0, 6))
+    assert np.shares_memory(ring.tail(4)["index"], ring._columns["index"])
+    ring.append(_block(6, 4))
+    assert not np.shares_memory(ring.tail(6)["index"], ring._columns["index"])
+
+
+@pytest.mark.parametrize("written", [5, 8, 13, 21])
+def test_search_matches_searchsorted_across_the_wrap(written):
+    ring = _ring()
+    for start in range(0, written, 3):
+        ring.append(_block(start, min(3, written - start)))
+    retained = ring.tail(len(ring))["index"]
+    oldest = ring.total_written - len(ring)
+
+    for value in range(-1, written + 2):
+        for side in ("left", "right"):
+            expected = oldest + int(np.searchsorted(retained, value, side))
+            assert ring.search("index", value, side) == expected
+
+
+def test_partial_append_and_assign():
+    ring = _ring()
+    ring.append(_block(0, 4))
+    ring.append({"index": np.arange(4, 6)}, n_rows=2)
+    assert ring.tail(2)["index"].tolist() == [4, 5]
+
+    ring.assign(4, {"value": np.full((2, 2), 7.0, dtype=np.float32)})
+    assert ring.tail(2)["value"].tolist() == [[7.0, 7.0], [7.0, 7.0]]
+    with pytest.raises(KeyError):
+        ring.append({"index": np.arange(2)})
+
+
+def test_engine_history_stays_under_40_bytes_per_sample():
+    ring = ColumnarRingBuffer(16, history_columns())
+    assert ring.bytes_per_row < 40
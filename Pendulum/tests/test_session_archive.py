@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import os
+import time
+
+import numpy as np
+
+from pendulum_eeg.session_archive import ARCHIVE_DTYPE, SessionArchive
+
+
+def _records(n: int) -> np.ndarray:
+    records = np.zeros(n, dtype=ARCHIVE_DTYPE)
+    records["sample_index"] = np.arange(n)
+    return records
+
+
+def test_close_keeps_file_unless_deleted(tmp_path):
+    archive = SessionArchive(tmp_path, chunk_records=8)
+    archive.append(_records(20))
+    archive.close()
+    path = archive.path
+    assert path is not None and path.exists()
+    assert list(archive.read()["sample_index"]) == list(range(20))
+
+    archive.close(delete=True)
+    assert not path.exists()
+    assert archive.path is None
+
+
+def test_first_file_prunes_stale_sessions(tmp_path):
+    stale = tmp_path / "session_20200101_000000_1_old.bin"
+    fresh = tmp_path / "session_20200101_000000_2_new.bin"
+    other = tmp_path / "notes.bin"
+    for path in (stale, fresh, other):
+        path.write_bytes(b"x")
+    old = time.time() - 3 * 24 * 3600
+    os.utime(stale, (old, old))
+    os.utime(other, (old, old))
+
+    archive = SessionArchive(tmp_path, chunk_records=8)
+    archive.append(_records(1))
+
+    assert not stale.exists()
+    assert fresh.exists() and other.exists()
+    archive.close(delete=True)
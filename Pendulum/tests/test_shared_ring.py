@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from pendulum_eeg.shared_ring import _H_RESERVED, SharedSampleRing
+
+
+@pytest.fixture
+def rings():
+    writer = SharedSampleRing.create(8)
+    reader = SharedSampleRing.attach(writer.name)
+    yield writer, reader
+    reader.close()
+    writer.close()
+
+
+def _block(start: int, n: int) -> dict[str, np.ndarray]:
+    index = np.arange(start, start + n, dtype=np.int64)
+    return {"sample_index": index, "raw": np.repeat(index[:, None], 4, axis=1).astype(np.float32)}
+
+
+def test_reader_sees_committed_rows_across_the_wrap(rings):
+    writer, reader = rings
+    writer.write(_block(0, 6))
+    writer.write(_block(6, 4))
+
+    rows = reader.read(2, 10, ("sample_index", "raw"))
+
+    assert rows is not None
+    assert list(rows["sample_index"]) == list(range(2, 10))
+    assert rows["raw"][:, 3].tolist() == list(range(2, 10))
+    committed, tail = reader.tail(3, ("sample_index",))
+    assert committed == 10 and list(tail["sample_index"]) == [7, 8, 9]
+
+
+def test_read_returns_none_once_rows_are_overwritten(rings):
+    writer, reader = rings
+    writer.write(_block(0, 6))
+    assert reader.read(0, 6) is not None
+
+    writer.write(_block(6, 4))
+
+    assert reader.read(0, 6) is None
+    assert reader.read(1, 6) is None
+    assert reader.read(2, 6) is not None
+
+
+def test_read_returns_none_for_rows_being_written(rings):
+    writer, reader = rings
+    writer.write(_block(0, 8))
+    # A write of 3 rows has reserved its slots but not committed yet.
+    writer._header[_H_RESERVED] = 11
+
+    assert reader.read(0, 8) is None
+    assert reader.read(3, 8) is not None
+
+
+def test_readonly_reader_and_sessions(rings):
+    writer, reader = rings
+    with pytest.raises(PermissionError):
+        reader.write(_block(0, 1))
+    session = reader.session
+    writer.write(_block(0, 2))
+    writer.clear()
+    assert reader.session == session + 1 and reader.committed == 0
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+scipy_signal = pytest.importorskip("scipy.signal")
+
+from pendulum_eeg.analysis import SlidingWelchPSD
+
+
+def _feed(psd: SlidingWelchPSD, samples: np.ndarray, rng: np.random.Generator) -> None:
+    start = 0
+    while start < len(samples):
+        stop = start + int(rng.integers(1, 40))
+        psd.update(samples[start:stop])
+        start = stop
+
+
+@pytest.mark.parametrize("extra_steps", [0, 3, 11])
+def test_matches_scipy_welch_over_window(extra_steps):
+    rate, nperseg = 250.0, 512
+    window = nperseg + 5 * (nperseg // 2)
+    rng = np.random.default_rng(extra_steps)
+    samples = rng.normal(0.0, 15.0, size=(window + extra_steps * (nperseg // 2), 4)) + 40.0
+    psd = SlidingWelchPSD(rate, 4, window_samples=window, nperseg=nperseg)
+
+    _feed(psd, samples, rng)
+
+    freqs, expected = scipy_signal.welch(
+        samples[-window:], fs=rate, window="hann", nperseg=nperseg, detrend="constant", axis=0
+    )
+    assert psd.step == nperseg // 2
+    assert psd.segment_count == psd.max_segments
+    np.testing.assert_allclose(psd.freqs, freqs)
+    np.testing.assert_allclose(psd.psd(), expected, rtol=1e-10, atol=0)
+
+
+def test_band_powers_cached_until_a_segment_completes():
+    psd = SlidingWelchPSD(250.0, 2, window_samples=1_024, nperseg=256)
+    samples = np.random.default_rng(0).normal(size=(400, 2))
+    psd.update(samples[:256])
+    first = psd.band_powers()
+
+    psd.update(samples[256:300])  # not enough for the next segment
+    assert psd.band_powers() is first
+
+    psd.update(samples[300:400])
+    assert psd.band_powers() is not first
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import pytest
+
+from pendulum_eeg.benchmarks.synthetic import synthetic_frames
+from pendulum_eeg.engine import EEGEngine, EngineConfig
+
+FRAMES = synthetic_frames(600, seed=3)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = EEGEngine(EngineConfig(archive_dir=str(tmp_path)))
+    for start in range(0, 500, 50):
+        engine._consume_rx_bytes(FRAMES[start : start + 50].tobytes())
+    yield engine
+    engine.close()
+
+
+def test_same_arguments_share_one_snapshot(engine):
+    first = engine.get_snapshot(max_points=200, views=("raw",))
+    second = engine.get_snapshot(max_points=200, views=("raw",))
+
+    assert second is first
+    stats = engine.get_snapshot_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_different_arguments_are_cached_separately(engine):
+    raw = engine.get_snapshot(max_points=200, views=("raw",))
+    wider = engine.get_snapshot(max_points=300, views=("raw",))
+
+    assert wider is not raw
+    assert engine.get_snapshot(max_points=200, views=("raw",)) is raw
+    assert engine.get_snapshot_cache_stats()["entries"] == 2
+
+
+def test_new_data_bumps_the_generation_and_invalidates(engine):
+    before = engine.get_snapshot(max_points=200, views=("raw",))
+    generation = engine.get_snapshot_cache_stats()["generation"]
+
+    engine._consume_rx_bytes(FRAMES[500:].tobytes())
+
+    stats = engine.get_snapshot_cache_stats()
+    assert stats["generation"] > generation
+    after = engine.get_snapshot(max_points=200, views=("raw",))
+    assert after is not before
+    assert after["samples_total"] == before["samples_total"] + 100
+    assert engine.get_snapshot_cache_stats()["entries"] == 1
+
+
+def test_events_invalidate_too(engine):
+    before = engine.get_snapshot(max_points=50, views=())
+    engine._push_event_line("marker")
+    after = engine.get_snapshot(max_points=50, views=())
+
+    assert after is not before
+    assert after["events"][-1]["message"] == "marker"
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from pendulum_eeg.spsc_queue import SpscQueue
+
+
+def test_full_queue_drops_and_counts_weight():
+    queue: SpscQueue[int] = SpscQueue(2)
+
+    assert queue.put(1, weight=5)
+    assert queue.put(2, weight=5)
+    assert not queue.put(3, weight=7)
+    assert not queue.put(4)
+
+    assert queue.stats() == {"depth": 2, "capacity": 2, "high_water": 2, "dropped": 2, "dropped_weight": 8}
+    assert queue.get() == 1
+    assert queue.put(5, weight=3)
+    assert [queue.get(), queue.get(), queue.get()] == [2, 5, None]
+    assert queue.dropped == 2
+
+
+def test_drops_counted_exactly_across_threads():
+    queue: SpscQueue[int] = SpscQueue(4)
+    total = 20_000
+    received: list[int] = []
+    done = threading.Event()
+
+    def consume() -> None:
+        while not done.is_set() or len(queue):
+            item = queue.get(timeout=0.01)
+            if item is not None:
+                received.append(item)
+
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+    accepted = sum(queue.put(i, weight=3) for i in range(total))
+    done.set()
+    consumer.join()
+
+    assert len(received) == accepted
+    assert received == sorted(received)
+    assert queue.dropped == total - accepted
+    assert queue.dropped_weight == 3 * queue.dropped
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        SpscQueue(0)
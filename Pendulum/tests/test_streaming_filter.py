@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+scipy_signal = pytest.importorskip("scipy.signal")
+
+from pendulum_eeg import analysis
+from pendulum_eeg.analysis import StreamingFilterBank, bandpass_sos
+
+
+def _one_shot(sos: np.ndarray, samples: np.ndarray) -> np.ndarray:
+    zi = scipy_signal.sosfilt_zi(sos)[:, :, None] * samples[0][None, None, :]
+    filtered, _ = scipy_signal.sosfilt(sos, samples, axis=0, zi=zi)
+    return filtered
+
+
+def _stream(bank: StreamingFilterBank, samples: np.ndarray, block: int, bands=None) -> dict[str, np.ndarray]:
+    parts: dict[str, list[np.ndarray]] = {}
+    for start in range(0, len(samples), block):
+        for name, values in bank.process(samples[start : start + block], bands=bands).items():
+            parts.setdefault(name, []).append(values)
+    return {name: np.concatenate(values) for name, values in parts.items()}
+
+
+@pytest.mark.parametrize("block", [1, 7, 250])
+def test_blocks_match_one_shot_sosfilt(block):
+    rng = np.random.default_rng(0)
+    samples = rng.normal(0.0, 20.0, size=(1_500, 4)) + 300.0
+    bank = StreamingFilterBank(250, 4)
+
+    streamed = _stream(bank, samples, block)
+
+    assert set(streamed) == set(bank.bands)
+    for name, (low, high) in ((name, analysis.BANDS[name]) for name in bank.bands):
+        expected = _one_shot(bandpass_sos(250.0, low, high), samples)
+        np.testing.assert_allclose(streamed[name], expected, rtol=0, atol=1e-9)
+
+
+def test_fallback_without_inplace_kernel(monkeypatch):
+    rng = np.random.default_rng(1)
+    samples = rng.normal(size=(600, 2))
+    fast = _stream(StreamingFilterBank(250, 2), samples, 9)
+    monkeypatch.setattr(analysis, "_sosfilt_inplace", None)
+    slow = _stream(StreamingFilterBank(250, 2), samples, 9)
+
+    for name in fast:
+        np.testing.assert_allclose(slow[name], fast[name], rtol=0, atol=1e-9)
+
+
+def test_unrequested_bands_are_skipped():
+    samples = np.random.default_rng(2).normal(size=(100, 4))
+    bank = StreamingFilterBank(250, 4)
+
+    out = bank.process(samples, bands=("alpha",))
+
+    assert set(out) == {"alpha"}
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from pendulum_eeg.subscription import Subscription
+
+
+def _samples(seq: int, rows: int, session: int = 1) -> dict:
+    index = np.arange(seq, seq + rows, dtype=np.int64)
+    return {
+        "kind": "samples",
+        "session": session,
+        "seq": seq,
+        "sample_index": index,
+        "t_us": index * 4000,
+        "flags": np.zeros(rows, dtype=np.uint32),
+        "uv": np.repeat(index[:, None].astype(np.float64), 4, axis=1),
+    }
+
+
+def _metrics(value: float, session: int = 1) -> dict:
+    return {"kind": "metrics", "session": session, "focus": value}
+
+
+def test_drop_oldest_keeps_newest_and_counts_rows():
+    subscription = Subscription(("samples",), maxsize=2)
+    for block in range(4):
+        subscription.publish(_samples(block * 10, 10))
+
+    assert [message["seq"] for message in subscription.drain()] == [20, 30]
+    assert subscription.dropped == 2
+    assert subscription.samples_dropped == 20
+    assert subscription.delivered == 2
+
+
+def test_coalesce_concatenates_contiguous_samples():
+    subscription = Subscription(("samples",), maxsize=1, overflow="coalesce")
+    for block in range(3):
+        subscription.publish(_samples(block * 5, 5))
+
+    (message,) = subscription.drain()
+    assert message["seq"] == 0
+    np.testing.assert_array_equal(message["sample_index"], np.arange(15))
+    assert message["uv"].shape == (15, 4)
+    assert subscription.coalesced == 2
+    assert subscription.dropped == 0
+
+
+def test_coalesce_keeps_latest_metrics_and_all_events():
+    subscription = Subscription(("metrics", "events"), maxsize=2, overflow="coalesce")
+    subscription.publish(_metrics(0.1))
+    subscription.publish({"kind": "events", "session": 1, "events": ["a"]})
+    subscription.publish(_metrics(0.2))
+    subscription.publish({"kind": "events", "session": 1, "events": ["b", "c"]})
+
+    metrics, events = subscription.drain()
+    assert metrics["focus"] == 0.2
+    assert events["events"] == ["a", "b", "c"]
+    assert subscription.dropped == 0
+
+
+def test_coalesce_falls_back_to_dropping_on_gap_or_new_session():
+    subscription = Subscription(("samples",), maxsize=1, overflow="coalesce")
+    subscription.publish(_samples(0, 5))
+    subscription.publish(_samples(10, 5))
+    subscription.publish(_samples(15, 5, session=2))
+
+    (message,) = subscription.drain()
+    assert (message["seq"], message["session"]) == (15, 2)
+    assert subscription.dropped == 2
+    assert subscription.samples_dropped == 10
+
+
+def test_coalesce_trims_to_max_samples():
+    subscription = Subscription(("samples",), maxsize=1, overflow="coalesce", max_samples=12)
+    for block in range(4):
+        subscription.publish(_samples(block * 5, 5))
+
+    (message,) = subscription.drain()
+    np.testing.assert_array_equal(message["sample_index"], np.arange(10, 20))
+    assert subscription.samples_dropped == 10
+
+
+def test_filters_kinds_and_rejects_bad_arguments():
+    subscription = Subscription(("metrics",))
+    subscription.publish(_samples(0, 3))
+    assert subscription.get_nowait() is None
+
+    with pytest.raises(ValueError):
+        Subscription(("nope",))
+    with pytest.raises(ValueError):
+        Subscription(overflow="block")  # type: ignore[arg-type]
+    with pytest.raises(ValueError):
+        Subscription(maxsize=0)
+
+
+def test_callback_errors_are_counted():
+    seen: list[dict] = []
+
+    def callback(message: dict) -> None:
+        seen.append(message)
+        if len(seen) == 2:
+            raise RuntimeError("boom")
+
+    subscription = Subscription(("metrics",), callback=callback)
+    for value in range(3):
+        subscription.publish(_metrics(value))
+    assert len(seen) == 3
+    assert (subscription.delivered, subscription.callback_errors) == (2, 1)
+
+
+def test_async_iteration_ends_on_close():
+    subscription = Subscription(("metrics",))
+
+    async def consume() -> list[float]:
+        return [message["focus"] async for message in subscription]
+
+    async def main() -> list[float]:
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0)
+        subscription.publish(_metrics(1.0))
+        subscription.publish(_metrics(2.0))
+        await asyncio.sleep(0.01)
+        subscription.close()
+        return await asyncio.wait_for(task, 1.0)
+
+    assert asyncio.run(main()) == [1.0, 2.0]
+    assert subscription.get(timeout=0.01) is None